@@ -6,7 +6,8 @@ a = Analysis(
     pathex=[],
     binaries=[],
     datas=[],
-    hiddenimports=[],
+    # Telas importadas sob demanda (importlib) não são vistas pela análise
+    hiddenimports=['src.interface.galeria', 'src.interface.relatorios', 'PyQt5.QtChart'],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
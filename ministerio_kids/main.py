@@ -1,8 +1,21 @@
 import sys
 import os
+import multiprocessing
+# Importado primeiro: marca o início da contagem dos tempos de inicialização
+from src.utils.profiling import startup_timer
 from PyQt5.QtWidgets import QApplication
 from PyQt5.QtGui import QIcon
+from PyQt5.QtCore import QTimer
 from src.interface.main_window import MainWindow
+from src.utils.logger import setup_logging
+
+startup_timer.mark("Módulos da interface importados")
+
+
+def on_first_show(window):
+    startup_timer.mark("Janela principal visível")
+    startup_timer.report()
+    window.prewarmScreens()
 
 def main():
     # Configurar o ambiente
@@ -13,17 +26,24 @@ def main():
     # Criar o diretório se não existir
     os.makedirs(DATA_DIR, exist_ok=True)
     
+    # Configurar os logs (nível e arquivo via MISSAO_KIDS_LOG_LEVEL / MISSAO_KIDS_LOG_FILE)
+    setup_logging()
+    
     # Iniciar a aplicação
     app = QApplication(sys.argv)
-    
-    
+    startup_timer.mark("QApplication criada")
     
     # Criar e mostrar a janela principal
     window = MainWindow()
+    startup_timer.mark("Janela principal construída")
     window.show()
+    # Executa assim que o laço de eventos processar a primeira exibição
+    QTimer.singleShot(0, lambda: on_first_show(window))
     
     # Executar o loop da aplicação
     sys.exit(app.exec_())
 
 if __name__ == "__main__":
+    # Necessário no executável (PyInstaller) para o pool de processos da importação de fotos
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
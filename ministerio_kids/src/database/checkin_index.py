@@ -0,0 +1,268 @@
+import os
+import csv
+import threading
+from typing import List, Dict, Any, Optional, Tuple
+
+from src.database.child_registry import parse_id
+
+CHECKIN_FIELDS = ['id', 'crianca_id', 'nome', 'data_checkin', 'data_checkout', 'sala']
+
+CHECKOUT_FIELDS = ['checkin_id', 'data_checkout']
+
+
+class OpenCheckinIndex:
+    """Índice das sessões de check-in em aberto, por id da criança.
+
+    O histórico de check-ins (``checkins.csv``) nunca é reescrito para
+    registrar uma saída: cada check-out vira uma linha acrescentada em
+    ``checkouts.csv`` com o id do check-in encerrado. O índice guarda até que
+    posição (em bytes) cada arquivo já foi lido e, a cada consulta, processa
+    apenas as linhas novas. Assim o custo de check-in, check-out e das
+    consultas não cresce com o histórico.
+
+    Linhas antigas de ``checkins.csv`` que já têm ``data_checkout`` preenchida
+    (formato anterior) são tratadas como sessões encerradas.
+    """
+
+    def __init__(self, checkins_file: str, checkouts_file: str):
+        self.checkins_file = checkins_file
+        self.checkouts_file = checkouts_file
+        self._lock = threading.RLock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Descarta o índice; a próxima consulta relê os arquivos do início"""
+        with self._lock:
+            # crianca_id -> {checkin_id: sessão}
+            self._open: Dict[int, Dict[int, Dict[str, Any]]] = {}
+            # checkin_id -> crianca_id (apenas sessões em aberto)
+            self._owner: Dict[int, int] = {}
+            self._max_checkin_id = 0
+            self._positions = {self.checkins_file: 0, self.checkouts_file: 0}
+            self._headers = {self.checkins_file: [], self.checkouts_file: []}
+
+    def _read_new_rows(self, file_path: str) -> List[tuple]:
+        """Lê os registros completos acrescentados desde a última leitura.
+
+        Retorna pares (offset do registro, registro como dicionário).
+        """
+        position = self._positions[file_path]
+        try:
+            size = os.path.getsize(file_path)
+        except OSError:
+            self._positions[file_path] = 0
+            return []
+
+        if size < position:
+            # Arquivo truncado ou substituído por fora: reconstruir o índice
+            raise _IndexOutOfDate()
+        if size == position:
+            return []
+
+        rows = []
+        with open(file_path, 'rb') as f:
+            for offset, end, fields, _ in _read_records(f, position):
+                if offset == 0:
+                    self._headers[file_path] = fields
+                elif fields:
+                    rows.append((offset, dict(zip(self._headers[file_path], fields))))
+                self._positions[file_path] = end
+        return rows
+
+    def _sync(self) -> None:
+        """Incorpora ao índice as linhas novas dos dois arquivos"""
+        try:
+            new_checkins = self._read_new_rows(self.checkins_file)
+            new_checkouts = self._read_new_rows(self.checkouts_file)
+        except _IndexOutOfDate:
+            self.reset()
+            new_checkins = self._read_new_rows(self.checkins_file)
+            new_checkouts = self._read_new_rows(self.checkouts_file)
+
+        for offset, row in new_checkins:
+            checkin_id = parse_id(row.get('id'))
+            child_id = parse_id(row.get('crianca_id'))
+            if checkin_id is None or child_id is None:
+                continue
+            self._max_checkin_id = max(self._max_checkin_id, checkin_id)
+            if not row.get('data_checkout'):
+                self._open.setdefault(child_id, {})[checkin_id] = {
+                    'id': checkin_id,
+                    'crianca_id': child_id,
+                    'nome': row.get('nome', ''),
+                    'data_checkin': row.get('data_checkin', ''),
+                    'sala': row.get('sala', ''),
+                    'offset': offset,
+                }
+                self._owner[checkin_id] = child_id
+
+        for _, row in new_checkouts:
+            checkin_id = parse_id(row.get('checkin_id'))
+            child_id = self._owner.pop(checkin_id, None)
+            if child_id is None:
+                continue
+            sessions = self._open.get(child_id, {})
+            sessions.pop(checkin_id, None)
+            if not sessions:
+                self._open.pop(child_id, None)
+
+    def next_checkin_id(self) -> int:
+        """Retorna o próximo id livre para um check-in"""
+        with self._lock:
+            self._sync()
+            return self._max_checkin_id + 1
+
+    def is_open(self, child_id: int) -> bool:
+        """Verifica se a criança tem alguma sessão de check-in em aberto"""
+        with self._lock:
+            self._sync()
+            return child_id in self._open
+
+    def open_sessions(self, child_id: int) -> List[Dict[str, Any]]:
+        """Retorna as sessões em aberto de uma criança"""
+        with self._lock:
+            self._sync()
+            return [dict(session) for session in self._open.get(child_id, {}).values()]
+
+    def all_open(self) -> List[Dict[str, Any]]:
+        """Retorna todas as sessões em aberto, na ordem do histórico"""
+        with self._lock:
+            self._sync()
+            sessions = [dict(session) for by_id in self._open.values() for session in by_id.values()]
+        sessions.sort(key=lambda session: session['offset'])
+        return sessions
+
+    def start(self, child_id: int, nome: str, sala: str, data_checkin: str) -> int:
+        """Acrescenta uma sessão de check-in ao histórico e retorna o seu id"""
+        with self._lock:
+            checkin_id = self.next_checkin_id()
+            write_header = not os.path.exists(self.checkins_file) or os.path.getsize(self.checkins_file) == 0
+            with open(self.checkins_file, 'a', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f)
+                if write_header:
+                    writer.writerow(CHECKIN_FIELDS)
+                writer.writerow([checkin_id, child_id, nome, data_checkin, '', sala])
+
+            self._sync()
+            return checkin_id
+
+    def close(self, child_id: int, data_checkout: str) -> int:
+        """Registra o check-out de todas as sessões abertas da criança.
+
+        Retorna o número de sessões encerradas.
+        """
+        with self._lock:
+            sessions = self.open_sessions(child_id)
+            if not sessions:
+                return 0
+
+            write_header = not os.path.exists(self.checkouts_file) or os.path.getsize(self.checkouts_file) == 0
+            with open(self.checkouts_file, 'a', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f)
+                if write_header:
+                    writer.writerow(CHECKOUT_FIELDS)
+                for session in sessions:
+                    writer.writerow([session['id'], data_checkout])
+
+            # As linhas recém-escritas são incorporadas pela próxima sincronização
+            self._sync()
+            return len(sessions)
+
+    def checkout_dates(self) -> Dict[int, str]:
+        """Lê o log completo de check-outs (id do check-in -> data de saída)"""
+        checkouts = {}
+        if os.path.exists(self.checkouts_file):
+            with open(self.checkouts_file, 'r', newline='', encoding='utf-8') as f:
+                for row in csv.DictReader(f):
+                    checkin_id = parse_id(row.get('checkin_id'))
+                    if checkin_id is not None:
+                        checkouts[checkin_id] = row.get('data_checkout', '')
+        return checkouts
+
+
+def read_log_since(file_path: str, position: int = 0,
+                   last_line: str = '') -> Optional[Tuple[List[Dict[str, Any]], int, str]]:
+    """Lê os registros completos acrescentados a um CSV depois de ``position`` (bytes).
+
+    ``last_line`` é a última linha lida na chamada anterior: se os bytes que
+    terminam em ``position`` não forem mais essa linha, o arquivo foi
+    reescrito e a função retorna None (é preciso recomeçar do zero). Caso
+    contrário retorna ``(registros, nova posição, última linha lida)``.
+    """
+    try:
+        size = os.path.getsize(file_path)
+    except OSError:
+        return ([], 0, '') if position == 0 else None
+    if size < position:
+        return None
+
+    with open(file_path, 'rb') as f:
+        header_line = f.readline()
+        if not header_line.endswith(b'\n'):
+            return ([], 0, '') if position == 0 else None
+        header = next(csv.reader([header_line.decode('utf-8-sig')]), [])
+
+        if position == 0:
+            position, last_line = len(header_line), header_line.decode('utf-8')
+        else:
+            expected = last_line.encode('utf-8')
+            if not expected or len(expected) > position:
+                return None
+            f.seek(position - len(expected))
+            if f.read(len(expected)) != expected:
+                return None
+
+        rows = []
+        for _, position, fields, last_line in _read_records(f, position):
+            if fields:
+                rows.append(dict(zip(header, fields)))
+    return rows, position, last_line
+
+
+class _LineReader:
+    """Linhas de um arquivo aberto em modo binário, para o ``csv.reader``.
+
+    Conta os bytes consumidos (a posição no arquivo) e para na primeira linha
+    sem quebra de linha, que ainda pode estar sendo escrita.
+    """
+
+    def __init__(self, f, position: int):
+        self.f = f
+        self.position = position
+        self.last_line = ''
+        self.exhausted = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> str:
+        raw_line = self.f.readline()
+        if not raw_line.endswith(b'\n'):
+            self.exhausted = True
+            raise StopIteration
+        self.last_line = raw_line.decode('utf-8')
+        line = self.last_line.lstrip('\ufeff') if self.position == 0 else self.last_line
+        self.position += len(raw_line)
+        return line
+
+
+def _read_records(f, position: int):
+    """Registros completos de um CSV a partir de ``position`` (bytes).
+
+    Gera ``(início, fim, campos, última linha)``. Um registro pode ocupar
+    várias linhas (campo entre aspas com quebra de linha); um registro
+    ainda incompleto no fim do arquivo fica para a próxima leitura.
+    """
+    f.seek(position)
+    lines = _LineReader(f, position)
+    start = position
+    for fields in csv.reader(lines):
+        if lines.exhausted:
+            # Fim do arquivo no meio do registro (aspas ainda abertas)
+            break
+        yield start, lines.position, fields, lines.last_line
+        start = lines.position
+
+
+class _IndexOutOfDate(Exception):
+    """Sinaliza que um dos arquivos encolheu e o índice precisa ser refeito"""
@@ -0,0 +1,166 @@
+# src/database/child_record.py
+
+import datetime
+from collections.abc import Mapping
+from typing import Dict, Any, Optional
+
+from src.database.room_rules import get_room_rules
+from src.utils.dates import parse_birth_date
+
+# Campos do arquivo de crianças, na ordem usada pelo formulário de cadastro
+CHILD_FIELDS = ['nome', 'idade', 'data_nascimento', 'pai', 'mae', 'outro_responsavel',
+                'endereco', 'bairro', 'cidade', 'telefone', 'membro', 'batizado', 'doenca_cronica',
+                'alergia', 'conversa_monitor', 'visita', 'permite_fotos', 'observacoes',
+                'visitante', 'data_cadastro']
+
+# Cabeçalho do arquivo de crianças: o id numérico estável vem primeiro
+CHILD_FILE_FIELDS = ['id'] + CHILD_FIELDS
+
+_FIELD_SET = frozenset(CHILD_FILE_FIELDS)
+# Campos dos quais os valores convertidos dependem
+_PARSED_FROM = frozenset(('idade', 'data_nascimento', 'visitante'))
+
+# Campo ainda não preenchido (diferente de vazio)
+_MISSING = object()
+# Valor convertido ainda não calculado
+_UNSET = object()
+
+
+def sala_by_age(age: Any) -> str:
+    """Sala da criança pela idade, pelas regras configuradas (RoomRules)"""
+    return get_room_rules().room_for_age(age)
+
+
+class Child(Mapping):
+    """Registro de uma criança, com os campos do cadastro em ``__slots__``.
+
+    Ocupa bem menos memória que um dict com as mesmas chaves e guarda os
+    valores já convertidos (``age``, ``birth_date``, ``is_visitor``,
+    ``room``), calculados na primeira consulta. Continua funcionando como
+    dict para quem lê os campos pelo nome: ``child['nome']``,
+    ``child.get('telefone', '')``, ``dict(child)``. Chaves fora do cadastro
+    (ex.: ``sala`` das crianças em check-in) ficam em um dict à parte.
+    """
+
+    __slots__ = tuple(CHILD_FILE_FIELDS) + ('_extra', '_age', '_birth_date', '_room')
+
+    def __init__(self, data=(), **kwargs):
+        for field in CHILD_FILE_FIELDS:
+            setattr(self, field, _MISSING)
+        self._extra = None
+        self._reset_parsed()
+        self.update(data, **kwargs)
+
+    def _reset_parsed(self) -> None:
+        self._age = _UNSET
+        self._birth_date = _UNSET
+        self._room = None
+
+    # Interface de dict
+
+    def __getitem__(self, key):
+        if key in _FIELD_SET:
+            value = getattr(self, key)
+            if value is _MISSING:
+                raise KeyError(key)
+            return value
+        if self._extra is None:
+            raise KeyError(key)
+        return self._extra[key]
+
+    def get(self, key, default=None):
+        if key in _FIELD_SET:
+            value = getattr(self, key)
+            return default if value is _MISSING else value
+        return self._extra.get(key, default) if self._extra else default
+
+    def __contains__(self, key) -> bool:
+        if key in _FIELD_SET:
+            return getattr(self, key) is not _MISSING
+        return bool(self._extra) and key in self._extra
+
+    def __iter__(self):
+        for field in CHILD_FILE_FIELDS:
+            if getattr(self, field) is not _MISSING:
+                yield field
+        if self._extra:
+            yield from self._extra
+
+    def __len__(self) -> int:
+        return (sum(1 for field in CHILD_FILE_FIELDS if getattr(self, field) is not _MISSING)
+                + len(self._extra or ()))
+
+    def __setitem__(self, key, value) -> None:
+        if key in _FIELD_SET:
+            setattr(self, key, value)
+            if key in _PARSED_FROM:
+                self._reset_parsed()
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    def update(self, data=(), **kwargs) -> None:
+        items = data.items() if isinstance(data, Mapping) else data
+        for key, value in items:
+            self[key] = value
+        for key, value in kwargs.items():
+            self[key] = value
+
+    def copy(self) -> 'Child':
+        """Cópia rasa, levando junto os valores já convertidos"""
+        clone = Child.__new__(Child)
+        for slot in Child.__slots__:
+            setattr(clone, slot, getattr(self, slot))
+        if self._extra is not None:
+            clone._extra = dict(self._extra)
+        return clone
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(self)
+
+    def __reduce__(self):
+        return (Child, (dict(self),))
+
+    def __repr__(self) -> str:
+        return f"Child({dict(self)!r})"
+
+    # Valores convertidos
+
+    @property
+    def age(self) -> Optional[int]:
+        """Idade como número (None se vazia ou inválida)"""
+        if self._age is _UNSET:
+            try:
+                self._age = int(self.get('idade'))
+            except (ValueError, TypeError):
+                self._age = None
+        return self._age
+
+    @property
+    def birth_date(self) -> Optional[datetime.date]:
+        if self._birth_date is _UNSET:
+            self._birth_date = parse_birth_date(self.get('data_nascimento'))
+        return self._birth_date
+
+    @property
+    def is_visitor(self) -> bool:
+        value = self.get('visitante')
+        return value is True or str(value or '').lower() == 'sim'
+
+    @property
+    def room(self) -> str:
+        """Sala pelas regras configuradas (idade ou data de corte), calculada uma vez"""
+        if self._room is None:
+            self._room = get_room_rules().room_for_child(self)
+        return self._room
+
+    @property
+    def responsible(self) -> str:
+        """Responsável principal: mãe, pai ou outro responsável, nessa ordem"""
+        return self.get('mae') or self.get('pai') or self.get('outro_responsavel') or ''
+
+
+def as_child(data: Mapping) -> Child:
+    """O próprio registro, se já for um ``Child``; senão, uma cópia convertida"""
+    return data if isinstance(data, Child) else Child(data)
@@ -0,0 +1,335 @@
+import os
+import csv
+import threading
+from typing import List, Dict, Any, Optional
+
+from src.database.child_record import Child
+from src.database.search_index import ChildSearchIndex
+
+
+def normalize_name(name: str) -> str:
+    """Normaliza um nome para comparação (sem espaços extras e sem caixa)"""
+    return ' '.join((name or '').split()).casefold()
+
+
+def parse_id(value) -> Optional[int]:
+    """Converte o id lido do CSV para inteiro (None se vazio ou inválido)"""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+# Alterações acumuladas no log antes de incorporá-las ao arquivo de crianças
+EDITS_SLACK = 64
+
+# Coluna do log de alterações que marca um registro excluído
+DELETED_FIELD = 'excluido'
+
+
+def child_edits_file(criancas_file: str) -> str:
+    """Log de alterações do cadastro (ao lado do arquivo de crianças)"""
+    return os.path.join(os.path.dirname(criancas_file), 'criancas_alteracoes.csv')
+
+
+def merge_child_edits(criancas_file: str) -> None:
+    """Incorpora ao arquivo de crianças o log de alterações pendente, se houver.
+
+    Usado antes das migrações e da importação para SQLite, que leem o
+    arquivo de crianças diretamente.
+    """
+    if os.path.exists(child_edits_file(criancas_file)):
+        ChildRegistry(criancas_file).compact()
+
+
+class ChildRegistry:
+    """Cache em memória do arquivo de crianças, indexado por id e por nome.
+
+    O CSV é lido uma única vez e mantido em memória. A cada acesso é feita
+    apenas uma chamada a ``os.stat`` por arquivo: o cadastro só é relido
+    quando o mtime ou o tamanho mudam (por exemplo, se outro programa editou
+    o arquivo). As escritas passam pelo próprio registro, que atualiza o
+    cache e o índice de busca (``ChildSearchIndex``) sem precisar reler o
+    arquivo. Os registros são ``Child`` (campos em __slots__ e valores
+    convertidos); as consultas devolvem cópias.
+
+    Alterações e exclusões não reescrevem ``criancas.csv``: cada uma vira uma
+    linha acrescentada ao log ``criancas_alteracoes.csv`` (o registro
+    completo, ou o id marcado como excluído), aplicado por cima do arquivo
+    ao carregar. Quando o log acumula ``EDITS_SLACK`` linhas, ele é
+    incorporado ao arquivo de crianças de uma vez e apagado.
+    """
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self.edits_file = child_edits_file(file_path)
+        self.fieldnames: List[str] = []
+        self._rows: Dict[int, Child] = {}
+        self._search_index = ChildSearchIndex()
+        self._by_id: Dict[int, Child] = {}
+        # nome -> [(ordem no arquivo, registro)]; em nomes repetidos vale o primeiro
+        self._children: Dict[str, List[tuple]] = {}
+        self._by_normalized: Dict[str, List[tuple]] = {}
+        self._order: Dict[int, int] = {}
+        self._next_order = 0
+        self._max_id = 0
+        self._edits = 0
+        self._signature = None
+        self._lock = threading.RLock()
+
+    def _file_signature(self):
+        signature = []
+        for path in (self.file_path, self.edits_file):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                if path == self.file_path:
+                    return None
+                signature.append(None)
+            else:
+                signature.append((stat.st_mtime_ns, stat.st_size))
+        return tuple(signature)
+
+    def _ensure_loaded(self) -> None:
+        """Recarrega os arquivos se eles mudaram desde a última leitura"""
+        signature = self._file_signature()
+        if signature is not None and signature == self._signature:
+            return
+        self._load(signature)
+
+    def _load(self, signature) -> None:
+        rows = {}
+        fieldnames = []
+        edits = 0
+        if signature is not None:
+            with open(self.file_path, 'r', newline='', encoding='utf-8') as f:
+                reader = csv.DictReader(f)
+                fieldnames = [name for name in (reader.fieldnames or []) if name]
+                for position, row in enumerate(reader):
+                    # Ignorar colunas extras sem cabeçalho (chave None)
+                    clean_row = Child((key, value) for key, value in row.items() if key is not None)
+                    if 'id' in clean_row:
+                        clean_row['id'] = parse_id(clean_row['id'])
+                    # Registros sem id (arquivo ainda não migrado) ficam com uma chave negativa
+                    key = clean_row.get('id')
+                    rows[key if key is not None else -1 - position] = clean_row
+
+            # Alterações posteriores: vale a última linha de cada id
+            if os.path.exists(self.edits_file):
+                with open(self.edits_file, 'r', newline='', encoding='utf-8') as f:
+                    for edit in csv.DictReader(f):
+                        edits += 1
+                        child_id = parse_id(edit.get('id'))
+                        if child_id is None:
+                            continue
+                        if edit.get(DELETED_FIELD):
+                            rows.pop(child_id, None)
+                        elif child_id in rows:
+                            rows[child_id].update((key, value) for key, value in edit.items()
+                                                  if key in fieldnames and key != 'id')
+
+        self.fieldnames = fieldnames
+        self._rows = rows
+        self._edits = edits
+        self._reindex()
+        self._search_index.rebuild((row['id'], row.get('nome', '')) for row in rows.values()
+                                   if row.get('id') is not None)
+        self._signature = signature
+
+    def _reindex(self) -> None:
+        """Reconstrói os índices por id e por nome a partir dos registros"""
+        self._by_id = {}
+        self._children = {}
+        self._by_normalized = {}
+        self._order = {}
+        self._next_order = 0
+        self._max_id = 0
+        for row in self._rows.values():
+            self._index_row(row)
+
+    def _index_row(self, row: Child) -> None:
+        child_id = row.get('id')
+        if child_id is not None:
+            self._by_id[child_id] = row
+            self._max_id = max(self._max_id, child_id)
+        self._order[id(row)] = self._next_order
+        self._next_order += 1
+        self._index_name(row)
+
+    def _index_name(self, row: Child) -> None:
+        name = row.get('nome', '')
+        if name:
+            entry = (self._order[id(row)], row)
+            _insert_ordered(self._children.setdefault(name, []), entry)
+            _insert_ordered(self._by_normalized.setdefault(normalize_name(name), []), entry)
+
+    def _unindex_name(self, row: Child) -> None:
+        name = row.get('nome', '')
+        if name:
+            _remove_entry(self._children, name, row)
+            _remove_entry(self._by_normalized, normalize_name(name), row)
+
+    def _write_all(self) -> None:
+        """Reescreve o arquivo a partir do cache (ao incorporar o log de alterações)"""
+        temp_file = self.file_path + '.tmp'
+        with open(temp_file, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=self.fieldnames, extrasaction='ignore')
+            writer.writeheader()
+            writer.writerows(self._rows.values())
+        # Substituição atômica: uma falha no meio da escrita não corrompe o cadastro
+        os.replace(temp_file, self.file_path)
+        # Se a remoção falhar, reaplicar o log sobre o arquivo já atualizado não muda nada
+        if os.path.exists(self.edits_file):
+            os.remove(self.edits_file)
+        self._edits = 0
+        self._signature = self._file_signature()
+
+    def _append_edit(self, child_id: int, row: Optional[Child]) -> None:
+        """Acrescenta uma alteração (registro completo) ou exclusão (row=None) ao log"""
+        fieldnames = self.fieldnames + [DELETED_FIELD]
+        write_header = not os.path.exists(self.edits_file) or os.path.getsize(self.edits_file) == 0
+        with open(self.edits_file, 'a', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction='ignore')
+            if write_header:
+                writer.writeheader()
+            if row is None:
+                writer.writerow({'id': child_id, DELETED_FIELD: 'sim'})
+            else:
+                writer.writerow(row)
+        self._edits += 1
+        if self._edits >= EDITS_SLACK:
+            self._write_all()
+        else:
+            self._signature = self._file_signature()
+
+    def compact(self) -> None:
+        """Incorpora o log de alterações ao arquivo de crianças"""
+        with self._lock:
+            self._ensure_loaded()
+            if self._signature is not None and os.path.exists(self.edits_file):
+                self._write_all()
+
+    def refresh(self) -> None:
+        """Marca o cache para ser relido na próxima consulta"""
+        with self._lock:
+            self._signature = None
+
+    def get_fieldnames(self) -> List[str]:
+        """Retorna o cabeçalho atual do arquivo"""
+        with self._lock:
+            self._ensure_loaded()
+            return list(self.fieldnames)
+
+    def append(self, row: Dict[str, Any]) -> Child:
+        """Acrescenta um registro ao final do arquivo e ao cache.
+
+        Se o registro não tiver id, um novo é atribuído. Retorna o registro salvo.
+        """
+        with self._lock:
+            self._ensure_loaded()
+            row = Child((key, row.get(key, '')) for key in self.fieldnames)
+            row['id'] = parse_id(row.get('id'))
+            if row['id'] is None:
+                row['id'] = self._max_id + 1
+
+            with open(self.file_path, 'a', newline='', encoding='utf-8') as f:
+                writer = csv.DictWriter(f, fieldnames=self.fieldnames, extrasaction='ignore')
+                writer.writerow(row)
+
+            self._rows[row['id']] = row
+            self._index_row(row)
+            self._search_index.add(row['id'], row.get('nome', ''))
+            self._signature = self._file_signature()
+            return row.copy()
+
+    def update(self, child_id: int, new_data: Dict[str, Any]) -> bool:
+        """Atualiza os campos de um registro; o id é preservado"""
+        with self._lock:
+            self._ensure_loaded()
+            row = self._by_id.get(child_id)
+            if row is None:
+                return False
+            changes = {key: value for key, value in new_data.items()
+                       if key in self.fieldnames and key != 'id'}
+            # Só o registro alterado muda nos índices
+            self._unindex_name(row)
+            row.update(changes)
+            self._index_name(row)
+            self._search_index.add(child_id, row.get('nome', ''))
+            self._append_edit(child_id, row)
+            return True
+
+    def remove(self, child_id: int) -> bool:
+        """Remove um registro pelo id"""
+        with self._lock:
+            self._ensure_loaded()
+            row = self._by_id.pop(child_id, None)
+            if row is None:
+                return False
+            del self._rows[child_id]
+            self._unindex_name(row)
+            del self._order[id(row)]
+            self._search_index.remove(child_id)
+            self._append_edit(child_id, None)
+            return True
+
+    def get(self, name: str) -> Optional[Child]:
+        """Busca uma criança pelo nome exato"""
+        with self._lock:
+            self._ensure_loaded()
+            entries = self._children.get(name)
+            return entries[0][1].copy() if entries else None
+
+    def get_by_id(self, child_id: int) -> Optional[Child]:
+        """Busca uma criança pelo id"""
+        with self._lock:
+            self._ensure_loaded()
+            child = self._by_id.get(child_id)
+            return child.copy() if child is not None else None
+
+    def find(self, name: str) -> Optional[Child]:
+        """Busca uma criança pelo nome, ignorando caixa e espaços extras"""
+        with self._lock:
+            self._ensure_loaded()
+            entries = self._children.get(name) or self._by_normalized.get(normalize_name(name))
+            return entries[0][1].copy() if entries else None
+
+    def contains(self, name: str) -> bool:
+        with self._lock:
+            self._ensure_loaded()
+            return name in self._children
+
+    def all(self) -> List[Child]:
+        """Retorna cópias de todos os registros, na ordem do arquivo"""
+        with self._lock:
+            self._ensure_loaded()
+            return [row.copy() for row in self._rows.values()]
+
+    def search(self, search_text: str, limit: int = None) -> List[Child]:
+        """Busca crianças pelo nome (sem diferenciar acentos), das mais às menos relevantes"""
+        with self._lock:
+            self._ensure_loaded()
+            return [self._by_id[child_id].copy()
+                    for child_id in self._search_index.search(search_text, limit)]
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._ensure_loaded()
+            return len(self._rows)
+
+
+def _insert_ordered(entries: List[tuple], entry: tuple) -> None:
+    """Insere (ordem, registro) mantendo a ordem do arquivo (listas curtas: nomes repetidos)"""
+    position = len(entries)
+    while position > 0 and entries[position - 1][0] > entry[0]:
+        position -= 1
+    entries.insert(position, entry)
+
+
+def _remove_entry(index: Dict[str, List[tuple]], key: str, row: Child) -> None:
+    entries = index.get(key)
+    if not entries:
+        return
+    entries[:] = [entry for entry in entries if entry[1] is not row]
+    if not entries:
+        del index[key]
@@ -0,0 +1,114 @@
+from typing import Dict, Any, Union
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from src.database.db_manager import create_database_manager
+from src.utils.logger import get_logger
+
+logger = get_logger('database.service')
+
+
+class DataService(QObject):
+    """Ponto único de acesso aos dados, compartilhado por todas as telas.
+
+    Encapsula o gerenciador de dados do mecanismo configurado (CSV ou
+    SQLite) e emite sinais a cada alteração, para que as telas abertas se
+    atualizem sem reler os arquivos. Consultas são repassadas diretamente
+    ao gerenciador.
+    """
+
+    # Registro completo da criança (Child, com id)
+    childAdded = pyqtSignal(object)
+    childUpdated = pyqtSignal(object)
+    # Id da criança excluída
+    childRemoved = pyqtSignal(int)
+    # Id da criança e se ela está (True) ou não (False) em check-in
+    checkinChanged = pyqtSignal(int, bool)
+
+    _instance = None
+
+    @classmethod
+    def get_instance(cls):
+        if cls._instance is None:
+            cls._instance = DataService()
+        return cls._instance
+
+    def __init__(self, db=None, parent=None):
+        super(DataService, self).__init__(parent)
+        self.db = db if db is not None else create_database_manager()
+        self._watchers = {}
+
+    def __getattr__(self, name):
+        # Consultas (get_all_children, search_children, ...) vão direto ao gerenciador
+        if name == 'db':
+            raise AttributeError(name)
+        return getattr(self.db, name)
+
+    def watch(self, view, **handlers) -> None:
+        """Conecta os sinais indicados aos métodos de uma tela.
+
+        Ex.: ``service.watch(self, childAdded=self.onChildAdded)``
+        """
+        for signal_name, handler in handlers.items():
+            getattr(self, signal_name).connect(handler)
+            self._watchers.setdefault(id(view), []).append((signal_name, handler))
+
+    def unwatch(self, view) -> None:
+        """Desconecta todos os sinais ligados a uma tela (ao fechá-la)"""
+        for signal_name, handler in self._watchers.pop(id(view), []):
+            try:
+                getattr(self, signal_name).disconnect(handler)
+            except TypeError:
+                pass
+
+    def _find_child(self, child_ref: Union[int, str]) -> Dict[str, Any]:
+        if isinstance(child_ref, int):
+            return self.db.get_child_by_id(child_ref)
+        return self.db.get_child_by_name(child_ref)
+
+    def add_child(self, child_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Adiciona uma criança e avisa as telas. Retorna o registro salvo ({} em caso de erro)"""
+        child = self.db.add_child(child_data)
+        if child:
+            self.childAdded.emit(child)
+        return child
+
+    def add_visitor(self, visitor_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Adiciona um visitante e avisa as telas. Retorna o registro salvo ({} em caso de erro)"""
+        child = self.db.add_visitor(visitor_data)
+        if child:
+            self.childAdded.emit(child)
+        return child
+
+    def update_child(self, child_ref: Union[int, str], new_data: Dict[str, Any]) -> bool:
+        child = self._find_child(child_ref)
+        if not child or not self.db.update_child(child['id'], new_data):
+            return False
+        self.childUpdated.emit(self.db.get_child_by_id(child['id']))
+        return True
+
+    def delete_child(self, child_ref: Union[int, str]) -> bool:
+        child = self._find_child(child_ref)
+        if not child:
+            return False
+        was_checked_in = self.db.is_child_checked_in(child['id'])
+        if not self.db.delete_child(child['id']):
+            return False
+        if was_checked_in:
+            self.checkinChanged.emit(child['id'], False)
+        self.childRemoved.emit(child['id'])
+        return True
+
+    def do_checkin(self, child_ref: Union[int, str]) -> bool:
+        child = self._find_child(child_ref)
+        if not child or not self.db.do_checkin(child['id']):
+            return False
+        self.checkinChanged.emit(child['id'], True)
+        return True
+
+    def do_checkout(self, child_ref: Union[int, str]) -> bool:
+        child = self._find_child(child_ref)
+        if not child or not self.db.do_checkout(child['id']):
+            return False
+        self.checkinChanged.emit(child['id'], False)
+        return True
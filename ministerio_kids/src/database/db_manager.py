@@ -1,9 +1,177 @@
 import os
 import csv
 import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Union, Optional, Tuple
+from src.database.child_registry import ChildRegistry, parse_id, merge_child_edits, child_edits_file
+from src.database.child_record import CHILD_FILE_FIELDS, sala_by_age
+from src.database.checkin_index import OpenCheckinIndex, read_log_since, CHECKIN_FIELDS, CHECKOUT_FIELDS
+from src.utils.dates import normalize_birth_date
+from src.utils.logger import get_logger
+
+logger = get_logger('database')
+
+def build_visitor_record(visitor_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Completa os dados de um visitante com os campos do cadastro de crianças"""
+    # Data atual para o cadastro
+    current_date = datetime.datetime.now().strftime("%d/%m/%Y")
+    
+    return {
+        'nome': visitor_data.get('nome', ''),
+        'idade': visitor_data.get('idade', ''),
+        'data_nascimento': '',
+        'pai': '',
+        'mae': '',
+        'outro_responsavel': visitor_data.get('outro_responsavel', visitor_data.get('responsavel', '')),
+        'endereco': '',
+        'bairro': '',
+        'cidade': '',
+        'telefone': visitor_data.get('telefone', ''),  # Garantir que o telefone seja armazenado aqui
+        'membro': 'Não',
+        'batizado': 'Não',
+        'doenca_cronica': '',
+        'alergia': '',
+        'conversa_monitor': 'Não',
+        'visita': 'Não',
+        'permite_fotos': 'Não',
+        'observacoes': visitor_data.get('observacoes', 'Visitante'),
+        'visitante': 'Sim',
+        'data_cadastro': current_date  # Adicionar data de cadastro
+    }
+
+
+def normalize_child_record(child_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Cópia dos dados da criança com a data de nascimento em ISO (AAAA-MM-DD)"""
+    child_data = dict(child_data)
+    if child_data.get('data_nascimento'):
+        child_data['data_nascimento'] = normalize_birth_date(child_data['data_nascimento'])
+    return child_data
+
+
+def _rewrite_csv(file_path: str, fieldnames: List[str], rows: List[Dict[str, Any]]) -> None:
+    """Reescreve um arquivo CSV de forma atômica (arquivo temporário + os.replace)"""
+    temp_file = file_path + '.tmp'
+    with open(temp_file, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(rows)
+    os.replace(temp_file, file_path)
+
+
+def _read_csv(file_path: str):
+    """Lê um arquivo CSV e retorna (cabeçalho, registros)"""
+    if not os.path.exists(file_path):
+        return [], []
+    with open(file_path, 'r', newline='', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        rows = [row for row in reader if any(row.values())]
+        return [name for name in (reader.fieldnames or []) if name], rows
+
+
+def files_version(*paths: str) -> str:
+    """Identificação barata do conteúdo de arquivos (tamanho e data de modificação)"""
+    parts = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            parts.append(f"{stat.st_size}:{stat.st_mtime_ns}")
+        except OSError:
+            parts.append('-')
+    return '|'.join(parts)
+
+
+def migrate_csv_to_ids(criancas_file: str, checkins_file: str, checkouts_file: str) -> None:
+    """Atribui ids às crianças e liga check-ins/check-outs pelo id.
+
+    Cada etapa só reescreve o arquivo se ele ainda estiver no formato
+    antigo, então a migração roda uma única vez e pode ser retomada se
+    for interrompida no meio.
+    """
+    # 1. Crianças: coluna 'id' e cabeçalho completo
+    fieldnames, children = _read_csv(criancas_file)
+    missing_ids = any(parse_id(child.get('id')) is None for child in children)
+    if os.path.exists(criancas_file) and (fieldnames[:len(CHILD_FILE_FIELDS)] != CHILD_FILE_FIELDS or missing_ids):
+        extra_fields = [name for name in fieldnames if name not in CHILD_FILE_FIELDS]
+        next_id = max([parse_id(child.get('id')) or 0 for child in children] + [0]) + 1
+        for child in children:
+            if parse_id(child.get('id')) is None:
+                child['id'] = next_id
+                next_id += 1
+        _rewrite_csv(criancas_file, CHILD_FILE_FIELDS + extra_fields, children)
+
+    # Em nomes repetidos vale o primeiro cadastro, como na busca pelo nome
+    ids_by_name = {}
+    for child in children:
+        ids_by_name.setdefault(child.get('nome', ''), child['id'])
+
+    # 2. Check-ins: id próprio e id da criança (o nome fica como registro histórico)
+    fieldnames, checkins = _read_csv(checkins_file)
+    if os.path.exists(checkins_file) and ('id' not in fieldnames or 'crianca_id' not in fieldnames):
+        for checkin_id, checkin in enumerate(checkins, start=1):
+            checkin['id'] = checkin_id
+            checkin['crianca_id'] = ids_by_name.get(checkin.get('nome', ''), '')
+        _rewrite_csv(checkins_file, CHECKIN_FIELDS, checkins)
+
+    # 3. Check-outs: eventos antigos identificavam a sessão por (nome, data_checkin)
+    fieldnames, checkouts = _read_csv(checkouts_file)
+    if os.path.exists(checkouts_file) and 'checkin_id' not in fieldnames:
+        # Sessões em aberto de cada nome, na ordem do histórico: (id, data_checkin)
+        open_sessions = {}
+        for checkin in checkins:
+            if not checkin.get('data_checkout'):
+                open_sessions.setdefault(checkin.get('nome', ''), []).append(
+                    (parse_id(checkin.get('id')), checkin.get('data_checkin', '')))
+
+        events = []
+        for checkout in checkouts:
+            sessions = open_sessions.get(checkout.get('nome', ''), [])
+            if checkout.get('data_checkin'):
+                closed = [session for session in sessions
+                          if session[1] == checkout['data_checkin']][:1]
+            else:
+                closed = list(sessions)
+            for session in closed:
+                sessions.remove(session)
+                events.append({'checkin_id': session[0],
+                               'data_checkout': checkout.get('data_checkout', '')})
+        _rewrite_csv(checkouts_file, CHECKOUT_FIELDS, events)
+
+
+def migrate_birth_dates(criancas_file: str) -> int:
+    """Converte as datas de nascimento do cadastro para ISO. Retorna quantas mudaram.
+
+    O arquivo só é reescrito se alguma data ainda estiver em outro formato.
+    """
+    fieldnames, children = _read_csv(criancas_file)
+    changed = 0
+    for child in children:
+        value = child.get('data_nascimento') or ''
+        normalized = normalize_birth_date(value)
+        if normalized != value:
+            child['data_nascimento'] = normalized
+            changed += 1
+    if changed:
+        _rewrite_csv(criancas_file, fieldnames, children)
+        logger.info("Datas de nascimento convertidas para ISO: %d", changed)
+    return changed
+
+
+def create_database_manager(engine: str = None):
+    """Cria o gerenciador de dados do mecanismo configurado.
+
+    O mecanismo vem do argumento ou da variável de ambiente
+    ``MISSAO_KIDS_DB`` (``csv``, o padrão, ou ``sqlite``).
+    """
+    engine = (engine or os.environ.get('MISSAO_KIDS_DB', 'csv')).strip().lower()
+    if engine == 'sqlite':
+        # Importação local para não carregar o sqlite3 quando não for usado
+        from src.database.sqlite_manager import SQLiteDatabaseManager
+        return SQLiteDatabaseManager()
+    return DatabaseManager()
 
 class DatabaseManager:
+    # Identifica o tipo de posição usada por read_checkin_log (offset em bytes do CSV)
+    CHECKIN_LOG_SOURCE = 'csv'
+
     def __init__(self):
         # Obter o caminho base do projeto
         self.base_dir = self._get_base_dir()
@@ -11,14 +179,28 @@ class DatabaseManager:
         # Definir caminhos para os arquivos CSV com caminho absoluto
         self.criancas_file = os.path.join(self.base_dir, 'data', 'criancas.csv')
         self.checkins_file = os.path.join(self.base_dir, 'data', 'checkins.csv')
+        self.checkouts_file = os.path.join(self.base_dir, 'data', 'checkouts.csv')
         
         # Criar arquivos se não existirem
         self._create_files_if_not_exist()
         
-        # Imprimir informações de debug
-        print(f"Diretório base: {self.base_dir}")
-        print(f"Arquivo de crianças: {self.criancas_file}")
-        print(f"O arquivo existe? {os.path.exists(self.criancas_file)}")
+        # Alterações pendentes do cadastro entram no arquivo antes das migrações
+        self._merge_child_edits()
+        
+        # Converter arquivos do formato antigo (ligados pelo nome) para ids numéricos
+        self._migrate_to_ids()
+        
+        # Datas de nascimento gravadas em ISO (cadastros antigos usavam DD/MM/AAAA)
+        self._migrate_birth_dates()
+        
+        # Cache em memória das crianças (relido apenas quando o arquivo muda)
+        self.children_registry = ChildRegistry(self.criancas_file)
+        
+        # Índice das sessões de check-in em aberto (check-outs são apenas acrescentados)
+        self.open_checkins = OpenCheckinIndex(self.checkins_file, self.checkouts_file)
+        
+        logger.debug("Diretório base: %s", self.base_dir)
+        logger.debug("Arquivo de crianças: %s", self.criancas_file)
     
     def _get_base_dir(self):
         """Determina o diretório base do projeto"""
@@ -33,433 +215,286 @@ class DatabaseManager:
         os.makedirs(os.path.dirname(self.criancas_file), exist_ok=True)
         
         # Criar arquivo de crianças se não existir
-        if not os.path.exists(self.criancas_file):
+        if not os.path.exists(self.criancas_file) or os.path.getsize(self.criancas_file) == 0:
             with open(self.criancas_file, 'w', newline='', encoding='utf-8') as f:
                 writer = csv.writer(f)
-                writer.writerow(['nome', 'idade', 'data_nascimento', 'pai', 'mae', 'outro_responsavel', 
-                                'endereco', 'bairro', 'cidade', 'membro', 'batizado', 'doenca_cronica', 
-                                'alergia', 'conversa_monitor', 'visita', 'permite_fotos', 'observacoes', 'visitante', 'telefone'])
+                writer.writerow(CHILD_FILE_FIELDS)
         
         # Criar arquivo de check-ins se não existir
-        if not os.path.exists(self.checkins_file):
+        if not os.path.exists(self.checkins_file) or os.path.getsize(self.checkins_file) == 0:
             with open(self.checkins_file, 'w', newline='', encoding='utf-8') as f:
                 writer = csv.writer(f)
-                writer.writerow(['nome', 'data_checkin', 'data_checkout', 'sala'])
+                writer.writerow(CHECKIN_FIELDS)
+        
+        # Criar arquivo de check-outs se não existir
+        if not os.path.exists(self.checkouts_file) or os.path.getsize(self.checkouts_file) == 0:
+            with open(self.checkouts_file, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f)
+                writer.writerow(CHECKOUT_FIELDS)
     
-    def add_child(self, child_data: Dict[str, Any]) -> bool:
-        """Adiciona uma nova criança ao banco de dados"""
+    def _merge_child_edits(self) -> None:
+        """Incorpora ao arquivo de crianças o log de alterações (criancas_alteracoes.csv)"""
         try:
-            with open(self.criancas_file, 'a', newline='', encoding='utf-8') as f:
-                writer = csv.DictWriter(f, fieldnames=list(child_data.keys()))
-                writer.writerow(child_data)
-            return True
+            merge_child_edits(self.criancas_file)
         except Exception as e:
-            print(f"Erro ao adicionar criança: {e}")
-            return False
+            logger.error("Erro ao incorporar alterações do cadastro: %s", e)
     
-    def add_visitor(self, visitor_data: Dict[str, Any]) -> bool:
-        """Adiciona um visitante ao banco de dados"""
+    def _migrate_to_ids(self) -> None:
+        """Converte os arquivos do formato antigo (ligados pelo nome) para ids"""
         try:
-            # Imprimir dados recebidos para debug
-            print("Dados do visitante recebidos:")
-            for key, value in visitor_data.items():
-                print(f"  {key}: {value}")
-            
-            # Data atual para o cadastro
-            current_date = datetime.datetime.now().strftime("%d/%m/%Y")
+            migrate_csv_to_ids(self.criancas_file, self.checkins_file, self.checkouts_file)
+        except Exception as e:
+            logger.error("Erro ao migrar arquivos para ids: %s", e)
+    
+    def _migrate_birth_dates(self) -> None:
+        """Converte para ISO as datas de nascimento gravadas em formatos antigos"""
+        try:
+            migrate_birth_dates(self.criancas_file)
+        except Exception as e:
+            logger.error("Erro ao converter datas de nascimento: %s", e)
+    
+    def _resolve_child(self, child: Union[int, str]) -> Dict[str, Any]:
+        """Busca uma criança pelo id (inteiro) ou pelo nome"""
+        if isinstance(child, int):
+            return self.children_registry.get_by_id(child) or {}
+        return self.children_registry.get(child) or {}
+    
+    def add_child(self, child_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Adiciona uma nova criança. Retorna o registro salvo, com id ({} em caso de erro)"""
+        try:
+            # O registro atribui o id e escreve na ordem do cabeçalho do arquivo
+            return self.children_registry.append(normalize_child_record(child_data))
+        except Exception as e:
+            self.children_registry.refresh()
+            logger.error("Erro ao adicionar criança: %s", e)
+            return {}
+    
+    def add_visitor(self, visitor_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Adiciona um visitante. Retorna o registro salvo, com id ({} em caso de erro)"""
+        try:
+            logger.debug("Dados do visitante recebidos: %s", visitor_data)
             
             # Completar dados faltantes para o visitante
-            complete_data = {
-                'nome': visitor_data.get('nome', ''),
-                'idade': visitor_data.get('idade', ''),
-                'data_nascimento': '',
-                'pai': '',
-                'mae': '',
-                'outro_responsavel': visitor_data.get('outro_responsavel', visitor_data.get('responsavel', '')),
-                'endereco': '',
-                'bairro': '',
-                'cidade': '',
-                'telefone': visitor_data.get('telefone', ''),  # Garantir que o telefone seja armazenado aqui
-                'membro': 'Não',
-                'batizado': 'Não',
-                'doenca_cronica': '',
-                'alergia': '',
-                'conversa_monitor': 'Não',
-                'visita': 'Não',
-                'permite_fotos': 'Não',
-                'observacoes': visitor_data.get('observacoes', 'Visitante'),
-                'visitante': 'Sim',
-                'data_cadastro': current_date  # Adicionar data de cadastro
-            }
-            
-            # Imprimir dados completos para debug
-            print("Dados completos do visitante a serem salvos:")
-            for key, value in complete_data.items():
-                print(f"  {key}: {value}")
-            
-            # Verificar se o arquivo existe e tem conteúdo
-            if not os.path.exists(self.criancas_file) or os.path.getsize(self.criancas_file) == 0:
-                # Se o arquivo não existe ou está vazio, criar com cabeçalho
-                with open(self.criancas_file, 'w', newline='', encoding='utf-8') as f:
-                    writer = csv.DictWriter(f, fieldnames=list(complete_data.keys()))
-                    writer.writeheader()
-            else:
-                # Se o arquivo já existe, verificar se precisa atualizar os cabeçalhos
-                with open(self.criancas_file, 'r', newline='', encoding='utf-8') as f:
-                    reader = csv.reader(f)
-                    headers = next(reader, [])
-                
-                # Se os cabeçalhos não incluem os novos campos, reescrever o arquivo
-                if 'telefone' not in headers or 'data_cadastro' not in headers:
-                    # Ler todos os dados existentes
-                    with open(self.criancas_file, 'r', newline='', encoding='utf-8') as f:
-                        reader = csv.DictReader(f)
-                        existing_data = list(reader)
-                    
-                    # Reescrever o arquivo com os novos cabeçalhos
-                    with open(self.criancas_file, 'w', newline='', encoding='utf-8') as f:
-                        writer = csv.DictWriter(f, fieldnames=list(complete_data.keys()))
-                        writer.writeheader()
-                        
-                        # Escrever os dados existentes com os novos campos vazios
-                        for row in existing_data:
-                            # Adicionar campos faltantes
-                            if 'telefone' not in row:
-                                row['telefone'] = ''
-                            if 'data_cadastro' not in row:
-                                row['data_cadastro'] = ''
-                            writer.writerow(row)
-            
-            # Adicionar o visitante
-            with open(self.criancas_file, 'a', newline='', encoding='utf-8') as f:
-                writer = csv.DictWriter(f, fieldnames=list(complete_data.keys()))
-                writer.writerow(complete_data)
+            complete_data = build_visitor_record(visitor_data)
+            logger.debug("Dados completos do visitante a serem salvos: %s", complete_data)
             
-            return True
+            # O cabeçalho já contém todos os campos (ver _migrate_to_ids)
+            return self.children_registry.append(normalize_child_record(complete_data))
         except Exception as e:
-            print(f"Erro ao adicionar visitante: {e}")
-            return False
+            self.children_registry.refresh()
+            logger.error("Erro ao adicionar visitante: %s", e)
+            return {}
     
     def get_all_children(self):
         """Retorna todas as crianças cadastradas"""
-        children = []
-        
         if not os.path.exists(self.criancas_file):
-            print(f"Arquivo de crianças não encontrado: {self.criancas_file}")
-            return children
+            logger.warning("Arquivo de crianças não encontrado: %s", self.criancas_file)
+            return []
         
         try:
-            with open(self.criancas_file, 'r', newline='', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                
-                # Imprimir cabeçalhos para debug
-                print(f"Cabeçalhos do arquivo: {reader.fieldnames}")
-                
-                for row in reader:
-                    # Criar um novo dicionário sem campos None
-                    clean_row = {}
-                    for key, value in row.items():
-                        if key is not None:  # Ignorar campos None
-                            clean_row[key] = value
-                    
-                    children.append(clean_row)
-            
-            # Debug: imprimir número de crianças e campos disponíveis
-            print(f"Total de crianças lidas: {len(children)}")
-            if children:
-                print("Campos disponíveis:")
-                for key in children[0].keys():
-                    print(f"  - {key}")
-            
-            return children
+            return self.children_registry.all()
         except Exception as e:
-            print(f"Erro ao ler arquivo de crianças: {e}")
+            logger.error("Erro ao ler arquivo de crianças: %s", e)
             return []
     
     def search_children(self, search_text: str) -> List[Dict[str, Any]]:
         """Busca crianças pelo nome"""
-        children = []
         try:
-            if not os.path.exists(self.criancas_file):
-                print(f"Arquivo de crianças não encontrado: {self.criancas_file}")
-                return []
-                
-            with open(self.criancas_file, 'r', newline='', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    if search_text.lower() in row['nome'].lower():
-                        children.append(row)
-            return children
+            return self.children_registry.search(search_text)
         except Exception as e:
-            print(f"Erro ao buscar crianças: {e}")
+            logger.error("Erro ao buscar crianças: %s", e)
             return []    
     
-    def do_checkin(self, child_name: str) -> bool:
-        """Realiza o check-in de uma criança"""
+    def do_checkin(self, child_ref: Union[int, str]) -> bool:
+        """Realiza o check-in de uma criança (pelo id ou pelo nome)"""
         try:
             # Buscar a sala da criança com base na idade
-            child = self._get_child_by_name(child_name)
+            child = self._resolve_child(child_ref)
             if not child:
-                print(f"Criança não encontrada: {child_name}")
+                logger.warning("Criança não encontrada: %s", child_ref)
                 return False
             
-            sala = self._get_sala_by_age(child['idade'])
-            
-            # Verificar se o arquivo existe e tem cabeçalho
-            if not os.path.exists(self.checkins_file) or os.path.getsize(self.checkins_file) == 0:
-                with open(self.checkins_file, 'w', newline='', encoding='utf-8') as f:
-                    writer = csv.writer(f)
-                    writer.writerow(['nome', 'data_checkin', 'data_checkout', 'sala'])
+            # Sala já calculada no registro da criança
+            sala = child.room
             
             # Registrar check-in
-            with open(self.checkins_file, 'a', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                now = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                writer.writerow([child_name, now, '', sala])
+            now = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            self.open_checkins.start(child['id'], child['nome'], sala, now)
             return True
         except Exception as e:
-            print(f"Erro ao fazer check-in: {e}")
+            logger.error("Erro ao fazer check-in: %s", e)
             return False
     
-    def do_checkout(self, child_name: str) -> bool:
-        """Realiza o check-out de uma criança"""
+    def do_checkout(self, child_ref: Union[int, str]) -> bool:
+        """Realiza o check-out de uma criança (pelo id ou pelo nome)"""
         try:
             if not os.path.exists(self.checkins_file):
-                print(f"Arquivo de check-ins não encontrado: {self.checkins_file}")
+                logger.warning("Arquivo de check-ins não encontrado: %s", self.checkins_file)
                 return False
-                
-            # Ler todos os check-ins
-            checkins = []
-            with open(self.checkins_file, 'r', newline='', encoding='utf-8') as f:
-                reader = csv.reader(f)
-                header = next(reader)  # Pular o cabeçalho
-                for row in reader:
-                    checkins.append(row)
             
-            # Atualizar o check-out da criança
-            updated = False
-            with open(self.checkins_file, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                writer.writerow(['nome', 'data_checkin', 'data_checkout', 'sala'])
-                
-                for row in checkins:
-                    if row[0] == child_name and row[2] == '':  # Se for a criança e não tiver check-out
-                        now = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                        row[2] = now
-                        updated = True
-                    writer.writerow(row)
+            child = self._resolve_child(child_ref)
+            if not child:
+                return False
             
-            return updated
+            # O check-out é registrado como um evento novo em checkouts.csv,
+            # sem reescrever o histórico de check-ins
+            now = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            return self.open_checkins.close(child['id'], now) > 0
         except Exception as e:
-            print(f"Erro ao fazer check-out: {e}")
+            logger.error("Erro ao fazer check-out: %s", e)
             return False
     
-    def is_child_checked_in(self, child_name: str) -> bool:
+    def is_child_checked_in(self, child_ref: Union[int, str]) -> bool:
         """Verifica se uma criança já está em check-in"""
         try:
-            if not os.path.exists(self.checkins_file):
-                return False
-                
-            with open(self.checkins_file, 'r', newline='', encoding='utf-8') as f:
-                reader = csv.reader(f)
-                next(reader)  # Pular o cabeçalho
-                for row in reader:
-                    if row[0] == child_name and row[2] == '':  # Nome e checkout vazio
-                        return True
-            return False
+            child = self._resolve_child(child_ref)
+            return bool(child) and self.open_checkins.is_open(child['id'])
         except Exception as e:
-            print(f"Erro ao verificar check-in: {e}")
+            logger.error("Erro ao verificar check-in: %s", e)
             return False
     
     def get_checked_in_children(self) -> List[Dict[str, Any]]:
         """Retorna todas as crianças em check-in"""
         children = []
+        try:
+            for session in self.open_checkins.all_open():
+                child = self.children_registry.get_by_id(session['crianca_id'])
+                if child:
+                    child['sala'] = session['sala']
+                    children.append(child)
+            return children
+        except Exception as e:
+            logger.error("Erro ao buscar crianças em check-in: %s", e)
+            return []
+    
+    def get_all_checkins(self) -> List[Dict[str, Any]]:
+        """Retorna o histórico completo de check-ins, com a data de check-out quando houver"""
+        checkins = []
         try:
             if not os.path.exists(self.checkins_file):
                 return []
-                
+            
+            # Datas de check-out registradas no log de eventos
+            checkouts = self.open_checkins.checkout_dates()
+            
             with open(self.checkins_file, 'r', newline='', encoding='utf-8') as f:
-                reader = csv.reader(f)
-                next(reader)  # Pular o cabeçalho
-                for row in reader:
-                    if row[2] == '':  # Checkout vazio
-                        child = self._get_child_by_name(row[0])
-                        if child:
-                            child['sala'] = row[3]
-                            children.append(child)
-            return children
+                for row in csv.DictReader(f):
+                    row['id'] = parse_id(row.get('id'))
+                    row['crianca_id'] = parse_id(row.get('crianca_id'))
+                    if not row.get('data_checkout'):
+                        row['data_checkout'] = checkouts.get(row['id'], '')
+                    
+                    # O nome gravado no check-in é o da época; usar o nome atual do cadastro
+                    child = self.children_registry.get_by_id(row['crianca_id'])
+                    if child:
+                        row['nome'] = child['nome']
+                    checkins.append(row)
+            return checkins
         except Exception as e:
-            print(f"Erro ao buscar crianças em check-in: {e}")
+            logger.error("Erro ao ler histórico de check-ins: %s", e)
             return []
     
+    def read_checkin_log(self, position: int = 0,
+                         check: str = '') -> Optional[Tuple[List[Dict[str, Any]], int, str]]:
+        """Check-ins registrados depois de ``position`` (offset em bytes do arquivo).
+
+        Retorna ``(registros, nova posição, controle)``; o controle deve ser
+        passado na próxima chamada. Retorna None se o histórico foi reescrito
+        antes da posição (ex.: exclusão de uma criança) e precisa ser relido do início.
+        """
+        try:
+            result = read_log_since(self.checkins_file, position, check)
+        except Exception as e:
+            logger.error("Erro ao ler histórico de check-ins: %s", e)
+            return None
+        if result is not None:
+            for row in result[0]:
+                row['id'] = parse_id(row.get('id'))
+                row['crianca_id'] = parse_id(row.get('crianca_id'))
+        return result
+    
+    def data_version(self) -> str:
+        """Muda a cada alteração dos dados (usada para invalidar resultados guardados)"""
+        return 'csv:' + files_version(self.criancas_file, child_edits_file(self.criancas_file),
+                                      self.checkins_file, self.checkouts_file)
+
     def _get_child_by_name(self, name: str) -> Dict[str, Any]:
         """Busca uma criança pelo nome"""
         try:
-            if not os.path.exists(self.criancas_file):
-                return {}
-                
-            with open(self.criancas_file, 'r', newline='', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    if row['nome'] == name:
-                        return row
-            return {}
+            return self.children_registry.get(name) or {}
         except Exception as e:
-            print(f"Erro ao buscar criança por nome: {e}")
+            logger.error("Erro ao buscar criança por nome: %s", e)
             return {}
     
     def _get_sala_by_age(self, age: str) -> str:
         """Retorna a sala com base na idade da criança"""
-        try:
-            age = int(age)
-            if age <= 2:
-                return "Berçário"
-            elif age == 3:
-                return "Infantil 1"
-            elif age <= 5:
-                return "Infantil 2"
-            elif age <= 7:
-                return "Infantil 3"
-            elif age <= 10:
-                return "Infantil 4"
-            else:
-                return "Juniores"
-        except ValueError:
-            # Se não conseguir converter para inteiro, retornar sala padrão
-            print(f"Erro ao converter idade: {age}")
-            return "Infantil 1"
+        return sala_by_age(age)
 
-    def delete_child(self, child_name):
+    def delete_child(self, child_ref):
         """
-        Exclui uma criança do banco de dados pelo nome.
+        Exclui uma criança do banco de dados pelo id ou pelo nome.
         
         Args:
-            child_name (str): Nome da criança a ser excluída
+            child_ref (int | str): Id ou nome da criança a ser excluída
             
         Returns:
             bool: True se a exclusão foi bem-sucedida, False caso contrário
         """
         try:
-            if not os.path.exists(self.criancas_file):
+            child = self._resolve_child(child_ref)
+            if not child or not self.children_registry.remove(child['id']):
                 return False
-                
-            # Carregar os dados atuais
-            children = self.get_all_children()
-            
-            # Filtrar a lista para remover a criança com o nome especificado
-            updated_children = [child for child in children if child['nome'] != child_name]
-            
-            # Se o tamanho das listas for o mesmo, significa que a criança não foi encontrada
-            if len(children) == len(updated_children):
-                return False
-            
-            # Obter os campos do cabeçalho
-            fieldnames = []
-            if updated_children:
-                fieldnames = list(updated_children[0].keys())
-            else:
-                # Se não houver mais crianças, usar campos padrão
-                fieldnames = ['nome', 'idade', 'data_nascimento', 'pai', 'mae', 'outro_responsavel',
-                            'endereco', 'bairro', 'cidade', 'membro', 'batizado', 'doenca_cronica',
-                            'alergia', 'conversa_monitor', 'visita', 'permite_fotos', 'observacoes',
-                            'visitante', 'telefone']
-            
-            # Escrever a lista atualizada de volta ao arquivo
-            with open(self.criancas_file, 'w', newline='', encoding='utf-8') as file:
-                writer = csv.DictWriter(file, fieldnames=fieldnames)
-                writer.writeheader()
-                writer.writerows(updated_children)
             
             # Remover check-ins da criança
-            self._delete_child_checkins(child_name)
+            self._delete_child_checkins(child['id'])
             
             return True
         except Exception as e:
-            print(f"Erro ao excluir criança: {e}")
+            self.children_registry.refresh()
+            logger.error("Erro ao excluir criança: %s", e)
             return False
 
     def get_child_by_name(self, name: str) -> Dict[str, Any]:
         """Busca uma criança pelo nome"""
         return self._get_child_by_name(name)
 
-    def update_child(self, old_name: str, new_data: Dict[str, Any]) -> bool:
-        """Atualiza os dados de uma criança"""
+    def get_child_by_id(self, child_id: int) -> Dict[str, Any]:
+        """Busca uma criança pelo id"""
         try:
-            if not os.path.exists(self.criancas_file):
-                return False
-                
-            # Ler todas as crianças
-            children = []
-            with open(self.criancas_file, 'r', newline='', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                fieldnames = reader.fieldnames
-                for row in reader:
-                    if row['nome'] == old_name:
-                        children.append(new_data)
-                    else:
-                        children.append(row)
-            
-            # Escrever dados atualizados
-            with open(self.criancas_file, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.DictWriter(f, fieldnames=fieldnames)
-                writer.writeheader()
-                for child in children:
-                    writer.writerow(child)
-            
-            # Atualizar nome nos check-ins se necessário
-            if old_name != new_data['nome']:
-                self._update_checkin_name(old_name, new_data['nome'])
-            
-            return True
+            return self.children_registry.get_by_id(child_id) or {}
         except Exception as e:
-            print(f"Erro ao atualizar criança: {e}")
-            return False
+            logger.error("Erro ao buscar criança por id: %s", e)
+            return {}
 
-    def _update_checkin_name(self, old_name: str, new_name: str) -> None:
-        """Atualiza o nome da criança nos check-ins"""
+    def update_child(self, child_ref: Union[int, str], new_data: Dict[str, Any]) -> bool:
+        """Atualiza os dados de uma criança (pelo id ou pelo nome atual)"""
         try:
-            if not os.path.exists(self.checkins_file):
-                return
-                
-            # Ler todos os check-ins
-            checkins = []
-            with open(self.checkins_file, 'r', newline='', encoding='utf-8') as f:
-                reader = csv.reader(f)
-                header = next(reader)
-                for row in reader:
-                    if row[0] == old_name:
-                        row[0] = new_name
-                    checkins.append(row)
+            child = self._resolve_child(child_ref)
+            if not child:
+                return False
             
-            # Escrever dados atualizados
-            with open(self.checkins_file, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                writer.writerow(header)
-                for checkin in checkins:
-                    writer.writerow(checkin)
+            # Os check-ins apontam para o id, então uma troca de nome altera só o cadastro
+            return self.children_registry.update(child['id'], normalize_child_record(new_data))
         except Exception as e:
-            print(f"Erro ao atualizar nome nos check-ins: {e}")
+            self.children_registry.refresh()
+            logger.error("Erro ao atualizar criança: %s", e)
+            return False
 
-    def _delete_child_checkins(self, name: str) -> None:
-        """Remove todos os check-ins da criança excluída"""
+    def _delete_child_checkins(self, child_id: int) -> None:
+        """Remove todos os check-ins e check-outs da criança excluída"""
         try:
-            if not os.path.exists(self.checkins_file):
+            # Manter apenas registros de outras crianças
+            fieldnames, checkins = _read_csv(self.checkins_file)
+            removed_ids = {row.get('id') for row in checkins if parse_id(row.get('crianca_id')) == child_id}
+            if not removed_ids:
                 return
-                
-            # Ler todos os check-ins
-            checkins = []
-            with open(self.checkins_file, 'r', newline='', encoding='utf-8') as f:
-                reader = csv.reader(f)
-                header = next(reader)
-                for row in reader:
-                    if row[0] != name:  # Manter apenas check-ins de outras crianças
-                        checkins.append(row)
+            _rewrite_csv(self.checkins_file, fieldnames,
+                         [row for row in checkins if row.get('id') not in removed_ids])
             
-            # Escrever dados atualizados
-            with open(self.checkins_file, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                writer.writerow(header)
-                for checkin in checkins:
-                    writer.writerow(checkin)
+            fieldnames, checkouts = _read_csv(self.checkouts_file)
+            _rewrite_csv(self.checkouts_file, fieldnames,
+                         [row for row in checkouts if row.get('checkin_id') not in removed_ids])
         except Exception as e:
-            print(f"Erro ao excluir check-ins: {e}")
\ No newline at end of file
+            logger.error("Erro ao excluir check-ins: %s", e)
+        finally:
+            self.open_checkins.reset()
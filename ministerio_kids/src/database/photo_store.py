@@ -0,0 +1,270 @@
+import os
+import shutil
+import sqlite3
+import datetime
+import threading
+from typing import List, Dict, Any, Optional, Tuple, Callable
+
+from src.utils.image_info import read_image_info
+from src.utils.photo_import import file_hash, IMAGE_EXTENSIONS
+from src.utils.logger import get_logger
+
+logger = get_logger('database.photos')
+
+PHOTO_FIELDS = ['hash', 'extensao', 'nome_original', 'data_importacao', 'data_captura',
+                'largura', 'altura', 'tamanho', 'chave_miniatura', 'hash_original']
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS fotos (
+    hash TEXT PRIMARY KEY,
+    extensao TEXT NOT NULL,
+    nome_original TEXT NOT NULL,
+    data_importacao TEXT NOT NULL,
+    data_captura TEXT,
+    largura INTEGER,
+    altura INTEGER,
+    tamanho INTEGER NOT NULL,
+    chave_miniatura TEXT NOT NULL
+);
+-- Ordem da galeria: data da foto, ou da importação quando a câmera não gravou
+CREATE INDEX IF NOT EXISTS idx_fotos_data ON fotos(COALESCE(data_captura, data_importacao));
+CREATE TABLE IF NOT EXISTS meta (
+    chave TEXT PRIMARY KEY,
+    valor TEXT
+);
+"""
+
+# Marca no índice que a pasta antiga (data/images) já foi migrada
+LEGACY_MIGRATED_KEY = 'pasta_antiga_migrada'
+
+# Colunas acrescentadas depois da primeira versão do índice
+EXTRA_COLUMNS = {
+    # Hash do arquivo importado, quando o acervo guarda uma cópia reduzida
+    'hash_original': "ALTER TABLE fotos ADD COLUMN hash_original TEXT",
+}
+
+
+def default_store_dir() -> str:
+    """Pasta padrão das fotos: data/photos na raiz do projeto"""
+    base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    return os.path.join(base_dir, 'data', 'photos')
+
+
+def default_legacy_dir() -> str:
+    """Pasta antiga das fotos (arquivos soltos): data/images na raiz do projeto"""
+    base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    return os.path.join(base_dir, 'data', 'images')
+
+
+class PhotoStore:
+    """Fotos da galeria guardadas pelo conteúdo (SHA-256), com índice em SQLite.
+
+    Cada arquivo fica em ``<pasta>/<2 primeiros caracteres do hash>/<hash>.<ext>``
+    e nunca muda depois de gravado, então o próprio hash serve de chave da
+    miniatura. O índice (``index.db``) guarda nome original, datas e
+    dimensões: listar, ordenar e detectar repetidas são consultas, sem
+    varrer a pasta nem decodificar imagens.
+    """
+
+    def __init__(self, store_dir: str = None):
+        self.store_dir = store_dir or default_store_dir()
+        os.makedirs(self.store_dir, exist_ok=True)
+        self.db_file = os.path.join(self.store_dir, 'index.db')
+
+        # Uma conexão compartilhada, protegida por lock (a importação roda em outra thread)
+        self._lock = threading.RLock()
+        self.conn = sqlite3.connect(self.db_file, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self._migrate_schema()
+
+    def _migrate_schema(self) -> None:
+        columns = {row['name'] for row in self.conn.execute("PRAGMA table_info(fotos)")}
+        with self._lock, self.conn:
+            for column, statement in EXTRA_COLUMNS.items():
+                if column not in columns:
+                    self.conn.execute(statement)
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_fotos_hash_original ON fotos(hash_original) "
+                "WHERE hash_original IS NOT NULL")
+
+    def close(self) -> None:
+        with self._lock:
+            self.conn.close()
+
+    def _record_from_row(self, row: sqlite3.Row) -> Dict[str, Any]:
+        record = {field: row[field] for field in PHOTO_FIELDS}
+        record['caminho'] = self.path_for(record['hash'], record['extensao'])
+        return record
+
+    def path_for(self, content_hash: str, extension: str) -> str:
+        return os.path.join(self.store_dir, content_hash[:2], content_hash + extension)
+
+    def hash_of(self, path: str) -> Optional[str]:
+        """Hash de um arquivo do acervo (é o nome do arquivo); None se estiver fora dele"""
+        if os.path.dirname(os.path.dirname(os.path.abspath(path))) != os.path.abspath(self.store_dir):
+            return None
+        return os.path.splitext(os.path.basename(path))[0]
+
+    def get(self, content_hash: str) -> Dict[str, Any]:
+        with self._lock:
+            row = self.conn.execute("SELECT * FROM fotos WHERE hash = ?", (content_hash,)).fetchone()
+        return self._record_from_row(row) if row else {}
+
+    def contains(self, content_hash: str) -> bool:
+        """Se o conteúdo já está no acervo (como foto guardada ou como original de uma cópia reduzida)"""
+        with self._lock:
+            return self.conn.execute(
+                "SELECT 1 FROM fotos WHERE hash = ? OR hash_original = ? LIMIT 1",
+                (content_hash, content_hash)).fetchone() is not None
+
+    def list_photos(self, newest_first: bool = False) -> List[Dict[str, Any]]:
+        """Todas as fotos, pela data da foto (ou da importação)"""
+        order = 'DESC' if newest_first else 'ASC'
+        with self._lock:
+            rows = self.conn.execute(
+                f"SELECT * FROM fotos ORDER BY COALESCE(data_captura, data_importacao) {order}, nome_original"
+            ).fetchall()
+        return [self._record_from_row(row) for row in rows]
+
+    def count(self) -> int:
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM fotos").fetchone()[0]
+
+    def add_file(self, source: str, content_hash: str = None, move: bool = False,
+                 original_name: str = None, original_hash: str = None) -> Tuple[Dict[str, Any], bool]:
+        """Guarda uma foto no acervo.
+
+        Retorna ``(registro, nova)``; ``nova`` é False quando o mesmo conteúdo
+        já estava guardado (nada é copiado). Com ``move=True`` o arquivo de
+        origem é movido em vez de copiado. Ao guardar uma cópia reduzida,
+        ``original_name``/``original_hash`` identificam o arquivo importado.
+        """
+        content_hash = content_hash or file_hash(source)
+        existing = self.get(content_hash)
+        if existing:
+            return existing, False
+
+        extension = os.path.splitext(source)[1].lower()
+        destination = self.path_for(content_hash, extension)
+        os.makedirs(os.path.dirname(destination), exist_ok=True)
+        tmp_path = destination + '.tmp'
+        try:
+            if move:
+                shutil.move(source, tmp_path)
+            else:
+                shutil.copyfile(source, tmp_path)
+            os.replace(tmp_path, destination)
+        except Exception:
+            # Com move=True o temporário é a própria foto: devolvê-la à origem
+            if os.path.exists(tmp_path):
+                if move:
+                    shutil.move(tmp_path, source)
+                else:
+                    os.remove(tmp_path)
+            raise
+
+        try:
+            info = read_image_info(destination)
+            record = {
+                'hash': content_hash,
+                'extensao': extension,
+                'nome_original': original_name or os.path.basename(source),
+                'data_importacao': datetime.datetime.now().replace(microsecond=0).isoformat(),
+                'data_captura': info['data_captura'],
+                'largura': info['largura'],
+                'altura': info['altura'],
+                'tamanho': os.path.getsize(destination),
+                'chave_miniatura': content_hash,
+                'hash_original': original_hash,
+            }
+            with self._lock, self.conn:
+                self.conn.execute(
+                    f"INSERT OR IGNORE INTO fotos ({', '.join(PHOTO_FIELDS)}) "
+                    f"VALUES ({', '.join('?' for _ in PHOTO_FIELDS)})",
+                    [record[field] for field in PHOTO_FIELDS])
+        except Exception:
+            # Fora do índice a foto ficaria perdida no acervo: desfazer a gravação
+            if move:
+                shutil.move(destination, source)
+            else:
+                os.remove(destination)
+            raise
+        record['caminho'] = destination
+        return record, True
+
+    def remove(self, content_hash: str) -> bool:
+        record = self.get(content_hash)
+        if not record:
+            return False
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM fotos WHERE hash = ?", (content_hash,))
+        try:
+            os.remove(record['caminho'])
+        except FileNotFoundError:
+            pass
+        return True
+
+    def _get_meta(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self.conn.execute("SELECT valor FROM meta WHERE chave = ?", (key,)).fetchone()
+        return row['valor'] if row else None
+
+    def _set_meta(self, key: str, value: str) -> None:
+        with self._lock, self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO meta (chave, valor) VALUES (?, ?)", (key, value))
+
+    def needs_legacy_import(self, folder: str = None) -> bool:
+        """Se a pasta antiga ainda tem fotos a migrar.
+
+        Depois de uma migração completa (ou se a pasta não tinha fotos) a
+        resposta fica gravada no índice e a pasta não é mais consultada.
+        """
+        if self._get_meta(LEGACY_MIGRATED_KEY):
+            return False
+        folder = folder or default_legacy_dir()
+        if os.path.isdir(folder) and any(entry.is_file() and entry.name.lower().endswith(IMAGE_EXTENSIONS)
+                                         for entry in os.scandir(folder)):
+            return True
+        self._set_meta(LEGACY_MIGRATED_KEY, datetime.datetime.now().replace(microsecond=0).isoformat())
+        return False
+
+    def import_legacy_folder(self, folder: str = None, progress: Callable[[int, int], None] = None,
+                             is_cancelled: Callable[[], bool] = None) -> int:
+        """Move para o acervo as fotos da pasta antiga (arquivos soltos em data/images).
+
+        Repetidas são apagadas da pasta antiga, já que o conteúdo está no acervo.
+        ``progress(feitos, total)`` é chamado a cada arquivo e ``is_cancelled()``
+        interrompe a migração (o restante fica para a próxima vez). Quando
+        todas as fotos foram movidas, a migração é marcada como concluída.
+        Retorna quantas fotos novas entraram.
+        """
+        folder = folder or default_legacy_dir()
+        if not os.path.isdir(folder):
+            return 0
+        entries = [entry for entry in os.scandir(folder)
+                   if entry.is_file() and entry.name.lower().endswith(IMAGE_EXTENSIONS)]
+        imported = 0
+        failed = False
+        for done, entry in enumerate(entries, start=1):
+            if is_cancelled and is_cancelled():
+                failed = True
+                break
+            try:
+                _, is_new = self.add_file(entry.path, move=True)
+                if is_new:
+                    imported += 1
+                else:
+                    os.remove(entry.path)
+            except OSError as e:
+                failed = True
+                logger.error("Erro ao mover %s para o acervo: %s", entry.path, e)
+            if progress:
+                progress(done, len(entries))
+        if imported:
+            logger.info("Fotos movidas de %s para o acervo: %d", folder, imported)
+        if not failed:
+            self._set_meta(LEGACY_MIGRATED_KEY, datetime.datetime.now().replace(microsecond=0).isoformat())
+        return imported
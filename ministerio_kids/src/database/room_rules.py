@@ -0,0 +1,208 @@
+# src/database/room_rules.py
+
+import datetime
+from dataclasses import dataclass
+from typing import List, Dict, Any, Optional, Iterable, Tuple
+
+from src.utils.logger import get_logger
+from src.utils.settings import get_settings, DEFAULT_SETTINGS
+
+logger = get_logger('database.rooms')
+
+# Sala usada nos relatórios quando a idade não é um número
+UNDEFINED_ROOM = "Não definida"
+
+
+@dataclass
+class Room:
+    nome: str
+    idade_min: int
+    # None = sem limite
+    idade_max: Optional[int]
+    # Máximo de crianças em check-in ao mesmo tempo (0 = sem limite)
+    capacidade: int = 0
+    # Rótulo da faixa etária nos relatórios
+    rotulo: str = ''
+
+    def __post_init__(self):
+        if not self.rotulo:
+            if self.idade_max is None:
+                ages = f"{self.idade_min}+"
+            elif self.idade_max == self.idade_min:
+                ages = str(self.idade_min)
+            else:
+                ages = f"{self.idade_min}-{self.idade_max}"
+            self.rotulo = f"{self.nome} ({ages})"
+
+
+class RoomRules:
+    """Regras de sala por idade, compiladas em uma tabela idade -> sala.
+
+    As faixas vêm das configurações (``salas`` em data/settings.json).
+    A tabela tem uma posição por idade até a maior idade com limite; idades
+    acima usam a faixa sem limite (se houver) e idades negativas (erro de
+    digitação) ficam na faixa de menor idade, como no Berçário de antes.
+    Assim cada consulta é um acesso a lista, sem percorrer as faixas.
+
+    Com ``data_corte`` ('MM-DD'), a idade usada é a que a criança terá (ou
+    tinha) nessa data do ano corrente, calculada pela data de nascimento;
+    sem data de nascimento vale a idade cadastrada.
+    """
+
+    def __init__(self, rooms: List[Room], default_room: str = '', cutoff: Optional[Tuple[int, int]] = None,
+                 today: datetime.date = None):
+        if not rooms:
+            raise ValueError("Nenhuma sala configurada")
+        self.rooms = list(rooms)
+        self.names = [room.nome for room in self.rooms]
+        self.labels = [room.rotulo for room in self.rooms]
+        self._index_by_name = {room.nome: i for i, room in enumerate(self.rooms)}
+        # Sala do check-in quando a idade não é um número
+        self.default_room = default_room or self.names[0]
+        self.cutoff = cutoff
+        self._cutoff_year = (today or datetime.date.today()).year
+        # Idades inválidas já registradas no log (cada valor aparece uma vez só)
+        self._invalid_ages = set()
+
+        # Tabela idade -> posição da sala (None = nenhuma faixa cobre a idade)
+        limits = [room.idade_max for room in self.rooms if room.idade_max is not None]
+        limits += [room.idade_min for room in self.rooms]
+        self._table: List[Optional[int]] = [None] * (max(limits) + 1)
+        self._above: Optional[int] = None
+        # Faixa de menor idade (em empate, a primeira da lista)
+        self._below = min(range(len(self.rooms)), key=lambda i: self.rooms[i].idade_min)
+        for i, room in reversed(list(enumerate(self.rooms))):
+            # Em faixas sobrepostas vale a primeira da lista
+            last = room.idade_max if room.idade_max is not None else len(self._table) - 1
+            for age in range(max(room.idade_min, 0), last + 1):
+                self._table[age] = i
+            if room.idade_max is None:
+                self._above = i
+
+    def index_for_age(self, age: Any) -> Optional[int]:
+        """Posição da sala para a idade; None se a idade não for um número válido"""
+        if not isinstance(age, int):
+            try:
+                age = int(age)
+            except (ValueError, TypeError):
+                return None
+        if age < 0:
+            return self._below
+        if age < len(self._table):
+            return self._table[age]
+        return self._above
+
+    def indexes_for_ages(self, ages: Iterable[Any]) -> List[Optional[int]]:
+        """``index_for_age`` de várias idades de uma vez (relatórios)"""
+        table, size, above = self._table, len(self._table), self._above
+        result = []
+        for age in ages:
+            if isinstance(age, int) and 0 <= age < size:
+                result.append(table[age])
+            elif isinstance(age, int) and age >= size:
+                result.append(above)
+            else:
+                result.append(self.index_for_age(age))
+        return result
+
+    def age_for_assignment(self, age: Any, birth_date: Optional[datetime.date] = None) -> Any:
+        """Idade usada para escolher a sala (considera a data de corte, se configurada)"""
+        if self.cutoff and birth_date:
+            month, day = self.cutoff
+            years = self._cutoff_year - birth_date.year
+            if (month, day) < (birth_date.month, birth_date.day):
+                years -= 1
+            return years
+        return age
+
+    def index_for_child(self, child) -> Optional[int]:
+        """Posição da sala da criança (``Child`` ou dict com 'idade')"""
+        birth_date = getattr(child, 'birth_date', None) if self.cutoff else None
+        age = getattr(child, 'age', None)
+        if age is None:
+            age = child.get('idade')
+        return self.index_for_age(self.age_for_assignment(age, birth_date))
+
+    def indexes_for_children(self, children: Iterable[Any]) -> List[Optional[int]]:
+        """``index_for_child`` de várias crianças de uma vez (relatórios)"""
+        if self.cutoff:
+            return self.indexes_for_ages(self.age_for_assignment(child.age, child.birth_date)
+                                         for child in children)
+        return self.indexes_for_ages(child.age for child in children)
+
+    def room_for_age(self, age: Any) -> str:
+        """Sala do check-in pela idade (a sala padrão se a idade não for válida)"""
+        index = self.index_for_age(age)
+        if index is None:
+            return self._default_room_for(age)
+        return self.names[index]
+
+    def room_for_child(self, child) -> str:
+        index = self.index_for_child(child)
+        if index is None:
+            return self._default_room_for(child.get('idade'))
+        return self.names[index]
+
+    def _default_room_for(self, age: Any) -> str:
+        # Chamado para cada check-in e cada linha dos relatórios: sem repetir o aviso
+        key = str(age)
+        if key not in self._invalid_ages:
+            self._invalid_ages.add(key)
+            logger.debug("Idade inválida, usando sala padrão: %r", age)
+        return self.default_room
+
+    def report_room(self, index: Optional[int]) -> str:
+        """Nome da sala nos relatórios (UNDEFINED_ROOM se não houver)"""
+        return self.names[index] if index is not None else UNDEFINED_ROOM
+
+    def capacity(self, room_name: str) -> int:
+        index = self._index_by_name.get(room_name)
+        return self.rooms[index].capacidade if index is not None else 0
+
+    def is_full(self, room_name: str, occupied: int) -> bool:
+        capacity = self.capacity(room_name)
+        return capacity > 0 and occupied >= capacity
+
+
+def _parse_cutoff(value: str) -> Optional[Tuple[int, int]]:
+    if not value:
+        return None
+    try:
+        month, day = (int(part) for part in str(value).split('-'))
+        datetime.date(2000, month, day)
+        return month, day
+    except ValueError:
+        logger.error("Data de corte inválida (use MM-DD): %s", value)
+        return None
+
+
+def load_room_rules(options: Dict[str, Any]) -> RoomRules:
+    """Monta as regras a partir das configurações (chave 'salas')"""
+    rooms = []
+    for item in options.get('faixas', []):
+        try:
+            idade_max = item.get('idade_max')
+            rooms.append(Room(
+                nome=str(item['nome']),
+                idade_min=int(item.get('idade_min') or 0),
+                idade_max=int(idade_max) if idade_max not in (None, '') else None,
+                capacidade=int(item.get('capacidade') or 0),
+                rotulo=str(item.get('rotulo') or '')))
+        except (KeyError, ValueError, TypeError) as e:
+            logger.error("Sala inválida nas configurações %s: %s", item, e)
+    return RoomRules(rooms, options.get('sala_padrao', ''), _parse_cutoff(options.get('data_corte', '')))
+
+
+_rules = None
+
+
+def get_room_rules() -> RoomRules:
+    """Regras de sala do aplicativo (lidas das configurações na primeira chamada)"""
+    global _rules
+    if _rules is None:
+        try:
+            _rules = load_room_rules(get_settings()['salas'])
+        except ValueError as e:
+            logger.error("Configuração de salas inválida, usando a padrão: %s", e)
+            _rules = load_room_rules(DEFAULT_SETTINGS['salas'])
+    return _rules
@@ -0,0 +1,152 @@
+import bisect
+import heapq
+import threading
+from typing import List, Dict, Iterable, Set, Tuple
+
+from src.utils.text import normalize_text
+
+# Ordem dos resultados: quanto menor, mais relevante
+RANK_EXACT = 0       # nome igual à busca
+RANK_START = 1       # nome começa com a busca
+RANK_TOKEN = 2       # cada palavra da busca é início de uma palavra do nome
+RANK_CONTAINS = 3    # a busca aparece no meio do nome
+
+
+def _trigrams(text: str) -> Set[str]:
+    # Espaços nas pontas fazem nomes curtos (e buscas de 1-2 letras) também terem trigramas
+    padded = f" {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class ChildSearchIndex:
+    """Índice de busca por nome, insensível a acentos e maiúsculas.
+
+    Mantém dois índices sobre os nomes normalizados (ver ``normalize_text``):
+
+    - um vetor ordenado de pares (palavra, id), para buscar por início de
+      palavra com ``bisect``;
+    - listas invertidas de trigramas, para buscar trechos no meio do nome
+      sem percorrer todos os registros.
+
+    Inclusões, alterações e exclusões atualizam apenas as entradas do
+    registro afetado.
+    """
+
+    def __init__(self, entries: Iterable[Tuple[int, str]] = ()):
+        self._lock = threading.RLock()
+        self._names: Dict[int, str] = {}
+        self._tokens: List[Tuple[str, int]] = []
+        self._postings: Dict[str, Set[int]] = {}
+        self.rebuild(entries)
+
+    def rebuild(self, entries: Iterable[Tuple[int, str]]) -> None:
+        """Reconstrói o índice a partir de pares (id, nome)"""
+        with self._lock:
+            self._names = {}
+            self._postings = {}
+            tokens = []
+            for child_id, name in entries:
+                normalized = normalize_text(name)
+                self._names[child_id] = normalized
+                tokens.extend((token, child_id) for token in set(normalized.split()))
+                for trigram in _trigrams(normalized):
+                    self._postings.setdefault(trigram, set()).add(child_id)
+            tokens.sort()
+            self._tokens = tokens
+
+    def add(self, child_id: int, name: str) -> None:
+        """Inclui (ou substitui) o nome de um registro"""
+        with self._lock:
+            if child_id in self._names:
+                self.remove(child_id)
+            normalized = normalize_text(name)
+            self._names[child_id] = normalized
+            for token in set(normalized.split()):
+                bisect.insort(self._tokens, (token, child_id))
+            for trigram in _trigrams(normalized):
+                self._postings.setdefault(trigram, set()).add(child_id)
+
+    def remove(self, child_id: int) -> None:
+        """Remove um registro do índice"""
+        with self._lock:
+            normalized = self._names.pop(child_id, None)
+            if normalized is None:
+                return
+            for token in set(normalized.split()):
+                position = bisect.bisect_left(self._tokens, (token, child_id))
+                if position < len(self._tokens) and self._tokens[position] == (token, child_id):
+                    del self._tokens[position]
+            for trigram in _trigrams(normalized):
+                postings = self._postings.get(trigram)
+                if postings is not None:
+                    postings.discard(child_id)
+                    if not postings:
+                        del self._postings[trigram]
+
+    def _prefix_ids(self, prefix: str) -> Set[int]:
+        """Ids com alguma palavra começando por ``prefix``"""
+        tokens = self._tokens
+        # Todas as palavras com o prefixo ficam num trecho contíguo do vetor ordenado
+        start = bisect.bisect_left(tokens, (prefix,))
+        end = bisect.bisect_left(tokens, (prefix + '\uffff',), start)
+        return {child_id for _, child_id in tokens[start:end]}
+
+    def _substring_ids(self, query: str) -> Set[int]:
+        """Ids cujo nome contém ``query`` (candidatos pelos trigramas, depois conferidos)"""
+        if len(query) >= 3:
+            candidates = None
+            # Começar pela lista mais curta para a interseção encolher rápido
+            query_trigrams = {query[i:i + 3] for i in range(len(query) - 2)}
+            for trigram in sorted(query_trigrams, key=lambda t: len(self._postings.get(t, ()))):
+                postings = self._postings.get(trigram)
+                if not postings:
+                    return set()
+                candidates = set(postings) if candidates is None else candidates & postings
+                if not candidates:
+                    return set()
+        else:
+            # Buscas de 1 ou 2 letras: juntar os trigramas que contêm o trecho
+            candidates = set()
+            for trigram, postings in self._postings.items():
+                if query in trigram:
+                    candidates |= postings
+        return {child_id for child_id in candidates or () if query in self._names[child_id]}
+
+    def search(self, text: str, limit: int = None) -> List[int]:
+        """Retorna os ids que correspondem à busca, do mais ao menos relevante"""
+        query = normalize_text(text)
+        if not query:
+            return []
+
+        with self._lock:
+            query_tokens = query.split()
+            token_ids = None
+            for token in query_tokens:
+                ids = self._prefix_ids(token)
+                token_ids = ids if token_ids is None else token_ids & ids
+                if not token_ids:
+                    break
+            token_ids = token_ids or set()
+            contains_ids = self._substring_ids(query)
+
+            ranked = []
+            for child_id in token_ids | contains_ids:
+                name = self._names[child_id]
+                if name == query:
+                    rank = RANK_EXACT
+                elif name.startswith(query):
+                    rank = RANK_START
+                elif child_id in token_ids:
+                    rank = RANK_TOKEN
+                else:
+                    rank = RANK_CONTAINS
+                ranked.append((rank, name, child_id))
+
+        if limit is not None:
+            ranked = heapq.nsmallest(limit, ranked)
+        else:
+            ranked.sort()
+        return [child_id for _, _, child_id in ranked]
+
+    def __len__(self) -> int:
+        return len(self._names)
@@ -0,0 +1,414 @@
+import os
+import csv
+import sqlite3
+import datetime
+import threading
+from typing import List, Dict, Any, Union, Optional, Tuple
+
+from src.database.child_registry import parse_id, merge_child_edits
+from src.database.child_record import Child, CHILD_FIELDS, CHILD_FILE_FIELDS
+from src.database.search_index import ChildSearchIndex
+from src.utils.logger import get_logger
+from src.database.db_manager import (DatabaseManager, CHECKIN_FIELDS,
+                                     build_visitor_record, migrate_csv_to_ids, files_version,
+                                     normalize_child_record)
+from src.utils.dates import normalize_birth_date
+
+logger = get_logger('database.sqlite')
+
+# Versão do esquema gravada na tabela meta (1: check-ins ligados pelo nome;
+# 2: check-ins ligados pelo id; 3: datas de nascimento em ISO)
+SCHEMA_VERSION = 3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS criancas (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    {child_columns}
+);
+CREATE INDEX IF NOT EXISTS idx_criancas_nome ON criancas(nome);
+
+CREATE TABLE IF NOT EXISTS checkins (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    crianca_id INTEGER,
+    nome TEXT NOT NULL,
+    data_checkin TEXT NOT NULL,
+    data_checkout TEXT,
+    sala TEXT NOT NULL DEFAULT ''
+);
+
+CREATE TABLE IF NOT EXISTS meta (
+    chave TEXT PRIMARY KEY,
+    valor TEXT
+);
+""".format(child_columns=",\n    ".join(
+    f"{field} TEXT NOT NULL" if field == 'nome' else f"{field} TEXT NOT NULL DEFAULT ''"
+    for field in CHILD_FIELDS))
+
+
+class SQLiteDatabaseManager:
+    """Gerenciador de dados sobre SQLite, com a mesma interface do DatabaseManager.
+
+    As alterações são transações pontuais (sem reescrever arquivos inteiros) e
+    o banco usa WAL, então uma queda no meio do culto não corrompe os dados.
+    Na primeira execução os dados de ``criancas.csv``/``checkins.csv`` são
+    importados automaticamente.
+    """
+
+    def __init__(self, db_file: str = None):
+        self.base_dir = self._get_base_dir()
+
+        # Arquivos CSV mantidos apenas como origem da importação inicial
+        self.criancas_file = os.path.join(self.base_dir, 'data', 'criancas.csv')
+        self.checkins_file = os.path.join(self.base_dir, 'data', 'checkins.csv')
+        self.checkouts_file = os.path.join(self.base_dir, 'data', 'checkouts.csv')
+        self.db_file = db_file or os.path.join(self.base_dir, 'data', 'missao_kids.db')
+        os.makedirs(os.path.dirname(self.db_file), exist_ok=True)
+
+        # Uma conexão compartilhada, protegida por lock (pode ser usada por threads de busca)
+        self._lock = threading.RLock()
+        self.conn = sqlite3.connect(self.db_file, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self._migrate_schema()
+
+        if self._get_meta('csv_importado') is None:
+            self.import_from_csv()
+
+        # Índice de busca por nome em memória (sem acentos), mantido a cada alteração
+        with self._lock:
+            self.search_index = ChildSearchIndex(
+                (row['id'], row['nome']) for row in self.conn.execute("SELECT id, nome FROM criancas"))
+
+    # Posição usada por read_checkin_log: o id (sempre crescente) do último check-in lido
+    CHECKIN_LOG_SOURCE = 'sqlite'
+
+    _get_base_dir = DatabaseManager._get_base_dir
+    _get_sala_by_age = DatabaseManager._get_sala_by_age
+
+    def close(self) -> None:
+        with self._lock:
+            self.conn.close()
+
+    def _get_meta(self, key: str):
+        row = self.conn.execute("SELECT valor FROM meta WHERE chave = ?", (key,)).fetchone()
+        return row['valor'] if row else None
+
+    def _set_meta(self, key: str, value: str) -> None:
+        self.conn.execute("INSERT OR REPLACE INTO meta (chave, valor) VALUES (?, ?)", (key, value))
+
+    def _migrate_schema(self) -> None:
+        """Atualiza bancos criados por versões anteriores do aplicativo"""
+        version = int(self._get_meta('versao_esquema') or 1)
+        if version >= SCHEMA_VERSION:
+            return
+        with self._lock, self.conn:
+            if version < 2:
+                # Versão 2: check-ins apontam para o id da criança, não para o nome
+                columns = [row['name'] for row in self.conn.execute("PRAGMA table_info(checkins)")]
+                if 'crianca_id' not in columns:
+                    self.conn.execute("ALTER TABLE checkins ADD COLUMN crianca_id INTEGER")
+                self.conn.execute(
+                    "UPDATE checkins SET crianca_id = (SELECT MIN(c.id) FROM criancas c WHERE c.nome = checkins.nome) "
+                    "WHERE crianca_id IS NULL")
+                # Índice parcial: só contém as sessões em aberto, que são as consultadas no culto
+                self.conn.execute("DROP INDEX IF EXISTS idx_checkins_abertos")
+                self.conn.execute(
+                    "CREATE INDEX idx_checkins_abertos ON checkins(crianca_id) WHERE data_checkout IS NULL")
+            if version < 3:
+                # Versão 3: datas de nascimento em ISO (AAAA-MM-DD)
+                updates = []
+                for row in self.conn.execute("SELECT id, data_nascimento FROM criancas"):
+                    normalized = normalize_birth_date(row['data_nascimento'])
+                    if normalized != (row['data_nascimento'] or ''):
+                        updates.append((normalized, row['id']))
+                self.conn.executemany("UPDATE criancas SET data_nascimento = ? WHERE id = ?", updates)
+            self._set_meta('versao_esquema', str(SCHEMA_VERSION))
+
+    def _child_from_row(self, row: sqlite3.Row) -> Child:
+        return Child((field, row[field]) for field in CHILD_FILE_FIELDS)
+
+    def _resolve_child(self, child: Union[int, str]) -> Dict[str, Any]:
+        """Busca uma criança pelo id (inteiro) ou pelo nome"""
+        if isinstance(child, int):
+            return self.get_child_by_id(child)
+        return self._get_child_by_name(child)
+
+    def import_from_csv(self, criancas_file: str = None, checkins_file: str = None) -> int:
+        """Importa (uma única vez) os dados dos arquivos CSV.
+
+        Retorna o número de crianças importadas.
+        """
+        criancas_file = criancas_file or self.criancas_file
+        checkins_file = checkins_file or self.checkins_file
+        imported = 0
+        try:
+            # Alterações pendentes do cadastro e arquivos ainda no formato antigo
+            # (ligados pelo nome, sem ids) são acertados antes
+            merge_child_edits(criancas_file)
+            migrate_csv_to_ids(criancas_file, checkins_file, self.checkouts_file)
+
+            with self._lock, self.conn:
+                if os.path.exists(criancas_file):
+                    with open(criancas_file, 'r', newline='', encoding='utf-8') as f:
+                        rows = [[parse_id(row.get('id'))] + [row.get(field) or '' for field in CHILD_FIELDS]
+                                for row in map(normalize_child_record, csv.DictReader(f)) if row.get('nome')]
+                    # Os ids do CSV são preservados para manter o histórico ligado
+                    self.conn.executemany(
+                        f"INSERT INTO criancas (id, {', '.join(CHILD_FIELDS)}) "
+                        f"VALUES (?, {', '.join('?' for _ in CHILD_FIELDS)})", rows)
+                    imported = len(rows)
+
+                if os.path.exists(checkins_file):
+                    # Check-outs registrados no log de eventos do mecanismo CSV
+                    checkouts = {}
+                    if os.path.exists(self.checkouts_file):
+                        with open(self.checkouts_file, 'r', newline='', encoding='utf-8') as f:
+                            for row in csv.DictReader(f):
+                                checkouts[parse_id(row.get('checkin_id'))] = row.get('data_checkout')
+
+                    with open(checkins_file, 'r', newline='', encoding='utf-8') as f:
+                        rows = []
+                        for row in csv.DictReader(f):
+                            if not row.get('nome'):
+                                continue
+                            checkin_id = parse_id(row.get('id'))
+                            data_checkout = row.get('data_checkout') or checkouts.get(checkin_id) or None
+                            rows.append((checkin_id, parse_id(row.get('crianca_id')), row['nome'],
+                                         row.get('data_checkin') or '', data_checkout, row.get('sala') or ''))
+                    self.conn.executemany(
+                        "INSERT INTO checkins (id, crianca_id, nome, data_checkin, data_checkout, sala) "
+                        "VALUES (?, ?, ?, ?, ?, ?)", rows)
+
+                self._set_meta('csv_importado', datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+            return imported
+        except Exception as e:
+            logger.error("Erro ao importar dados dos arquivos CSV: %s", e)
+            return 0
+
+    def add_child(self, child_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Adiciona uma nova criança. Retorna o registro salvo, com id ({} em caso de erro)"""
+        try:
+            child_data = normalize_child_record(child_data)
+            with self._lock, self.conn:
+                cursor = self.conn.execute(
+                    f"INSERT INTO criancas ({', '.join(CHILD_FIELDS)}) "
+                    f"VALUES ({', '.join('?' for _ in CHILD_FIELDS)})",
+                    [child_data.get(field) or '' for field in CHILD_FIELDS])
+                self.search_index.add(cursor.lastrowid, child_data.get('nome') or '')
+            return self.get_child_by_id(cursor.lastrowid)
+        except Exception as e:
+            logger.error("Erro ao adicionar criança: %s", e)
+            return {}
+
+    def add_visitor(self, visitor_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Adiciona um visitante. Retorna o registro salvo, com id ({} em caso de erro)"""
+        return self.add_child(build_visitor_record(visitor_data))
+
+    def get_all_children(self) -> List[Dict[str, Any]]:
+        """Retorna todas as crianças cadastradas"""
+        try:
+            with self._lock:
+                rows = self.conn.execute("SELECT * FROM criancas ORDER BY id").fetchall()
+            return [self._child_from_row(row) for row in rows]
+        except Exception as e:
+            logger.error("Erro ao ler crianças: %s", e)
+            return []
+
+    def search_children(self, search_text: str) -> List[Dict[str, Any]]:
+        """Busca crianças pelo nome (sem diferenciar acentos), das mais às menos relevantes"""
+        try:
+            with self._lock:
+                ids = self.search_index.search(search_text)
+                children = {}
+                # Buscar os registros em lotes (limite de parâmetros por consulta do SQLite)
+                for start in range(0, len(ids), 500):
+                    chunk = ids[start:start + 500]
+                    rows = self.conn.execute(
+                        f"SELECT * FROM criancas WHERE id IN ({', '.join('?' for _ in chunk)})",
+                        chunk).fetchall()
+                    children.update((row['id'], self._child_from_row(row)) for row in rows)
+            return [children[child_id] for child_id in ids if child_id in children]
+        except Exception as e:
+            logger.error("Erro ao buscar crianças: %s", e)
+            return []
+
+    def do_checkin(self, child_ref: Union[int, str]) -> bool:
+        """Realiza o check-in de uma criança (pelo id ou pelo nome)"""
+        try:
+            child = self._resolve_child(child_ref)
+            if not child:
+                logger.warning("Criança não encontrada: %s", child_ref)
+                return False
+
+            sala = child.room
+            now = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            with self._lock, self.conn:
+                self.conn.execute(
+                    "INSERT INTO checkins (crianca_id, nome, data_checkin, data_checkout, sala) "
+                    "VALUES (?, ?, ?, NULL, ?)",
+                    (child['id'], child['nome'], now, sala))
+            return True
+        except Exception as e:
+            logger.error("Erro ao fazer check-in: %s", e)
+            return False
+
+    def do_checkout(self, child_ref: Union[int, str]) -> bool:
+        """Realiza o check-out de uma criança (pelo id ou pelo nome)"""
+        try:
+            child = self._resolve_child(child_ref)
+            if not child:
+                return False
+
+            now = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            with self._lock, self.conn:
+                cursor = self.conn.execute(
+                    "UPDATE checkins SET data_checkout = ? WHERE crianca_id = ? AND data_checkout IS NULL",
+                    (now, child['id']))
+            return cursor.rowcount > 0
+        except Exception as e:
+            logger.error("Erro ao fazer check-out: %s", e)
+            return False
+
+    def is_child_checked_in(self, child_ref: Union[int, str]) -> bool:
+        """Verifica se uma criança já está em check-in"""
+        try:
+            child = self._resolve_child(child_ref)
+            if not child:
+                return False
+
+            with self._lock:
+                row = self.conn.execute(
+                    "SELECT 1 FROM checkins WHERE crianca_id = ? AND data_checkout IS NULL LIMIT 1",
+                    (child['id'],)).fetchone()
+            return row is not None
+        except Exception as e:
+            logger.error("Erro ao verificar check-in: %s", e)
+            return False
+
+    def get_checked_in_children(self) -> List[Dict[str, Any]]:
+        """Retorna todas as crianças em check-in"""
+        try:
+            with self._lock:
+                rows = self.conn.execute(
+                    "SELECT c.*, k.sala AS sala_checkin FROM checkins k "
+                    "JOIN criancas c ON c.id = k.crianca_id "
+                    "WHERE k.data_checkout IS NULL ORDER BY k.id").fetchall()
+            children = []
+            for row in rows:
+                child = self._child_from_row(row)
+                child['sala'] = row['sala_checkin']
+                children.append(child)
+            return children
+        except Exception as e:
+            logger.error("Erro ao buscar crianças em check-in: %s", e)
+            return []
+
+    def get_all_checkins(self) -> List[Dict[str, Any]]:
+        """Retorna o histórico completo de check-ins"""
+        try:
+            with self._lock:
+                # O nome gravado no check-in é o da época; usar o nome atual do cadastro
+                rows = self.conn.execute(
+                    "SELECT k.id, k.crianca_id, COALESCE(c.nome, k.nome) AS nome, k.data_checkin, "
+                    "k.data_checkout, k.sala FROM checkins k "
+                    "LEFT JOIN criancas c ON c.id = k.crianca_id ORDER BY k.id").fetchall()
+            return [{field: row[field] if field in ('id', 'crianca_id') else row[field] or ''
+                     for field in CHECKIN_FIELDS} for row in rows]
+        except Exception as e:
+            logger.error("Erro ao ler histórico de check-ins: %s", e)
+            return []
+
+    def read_checkin_log(self, position: int = 0,
+                         check: str = '') -> Optional[Tuple[List[Dict[str, Any]], int, str]]:
+        """Check-ins com id maior que ``position``.
+
+        Retorna ``(registros, nova posição, controle)``. O controle é a
+        quantidade de check-ins até a posição: se mudar (exclusão de uma
+        criança), retorna None e o histórico precisa ser relido do início.
+        """
+        try:
+            with self._lock:
+                count = self.conn.execute(
+                    "SELECT COUNT(*) FROM checkins WHERE id <= ?", (position,)).fetchone()[0]
+                if position and str(count) != check:
+                    return None
+                rows = self.conn.execute(
+                    "SELECT id, crianca_id, data_checkin, data_checkout, sala FROM checkins "
+                    "WHERE id > ? ORDER BY id", (position,)).fetchall()
+        except Exception as e:
+            logger.error("Erro ao ler histórico de check-ins: %s", e)
+            return None
+        records = [{key: row[key] if key in ('id', 'crianca_id') else row[key] or ''
+                    for key in row.keys()} for row in rows]
+        if records:
+            position = records[-1]['id']
+        return records, position, str(count + len(records))
+
+    def data_version(self) -> str:
+        """Muda a cada alteração dos dados (usada para invalidar resultados guardados)"""
+        # Com WAL, cada transação confirmada altera o arquivo -wal
+        return 'sqlite:' + files_version(self.db_file, self.db_file + '-wal')
+
+    def _get_child_by_name(self, name: str) -> Dict[str, Any]:
+        """Busca uma criança pelo nome"""
+        try:
+            with self._lock:
+                row = self.conn.execute(
+                    "SELECT * FROM criancas WHERE nome = ? ORDER BY id LIMIT 1", (name,)).fetchone()
+            return self._child_from_row(row) if row else {}
+        except Exception as e:
+            logger.error("Erro ao buscar criança por nome: %s", e)
+            return {}
+
+    def get_child_by_name(self, name: str) -> Dict[str, Any]:
+        """Busca uma criança pelo nome"""
+        return self._get_child_by_name(name)
+
+    def get_child_by_id(self, child_id: int) -> Dict[str, Any]:
+        """Busca uma criança pelo id"""
+        try:
+            with self._lock:
+                row = self.conn.execute("SELECT * FROM criancas WHERE id = ?", (child_id,)).fetchone()
+            return self._child_from_row(row) if row else {}
+        except Exception as e:
+            logger.error("Erro ao buscar criança por id: %s", e)
+            return {}
+
+    def update_child(self, child_ref: Union[int, str], new_data: Dict[str, Any]) -> bool:
+        """Atualiza os dados de uma criança (pelo id ou pelo nome atual)"""
+        try:
+            child = self._resolve_child(child_ref)
+            new_data = normalize_child_record(new_data)
+            fields = [field for field in CHILD_FIELDS if field in new_data]
+            if not child or not fields:
+                return bool(child)
+
+            # Os check-ins apontam para o id, então uma troca de nome altera só o cadastro
+            with self._lock, self.conn:
+                cursor = self.conn.execute(
+                    f"UPDATE criancas SET {', '.join(f'{field} = ?' for field in fields)} WHERE id = ?",
+                    [new_data[field] or '' for field in fields] + [child['id']])
+                if 'nome' in fields:
+                    self.search_index.add(child['id'], new_data['nome'] or '')
+            return cursor.rowcount > 0
+        except Exception as e:
+            logger.error("Erro ao atualizar criança: %s", e)
+            return False
+
+    def delete_child(self, child_ref: Union[int, str]) -> bool:
+        """Exclui uma criança (e seus check-ins) pelo id ou pelo nome"""
+        try:
+            child = self._resolve_child(child_ref)
+            if not child:
+                return False
+
+            with self._lock, self.conn:
+                self.conn.execute("DELETE FROM criancas WHERE id = ?", (child['id'],))
+                self.conn.execute("DELETE FROM checkins WHERE crianca_id = ?", (child['id'],))
+                self.search_index.remove(child['id'])
+            return True
+        except Exception as e:
+            logger.error("Erro ao excluir criança: %s", e)
+            return False
@@ -3,6 +3,8 @@ import os
 from PyQt5.QtWidgets import QMainWindow, QPushButton
 from PyQt5.QtCore import Qt
 
+from src.interface.navigation import NavigationController
+
 class BaseSecondaryWindow(QMainWindow):
     """Classe base para todas as janelas secundárias"""
     
@@ -47,10 +49,5 @@ class BaseSecondaryWindow(QMainWindow):
         back_button.clicked.connect(self.goBack)
     
     def goBack(self):
-        """Volta para a janela principal"""
-        # Importação local para evitar importação circular
-        from src.interface.main_window import MainWindow
-        
-        self.main_window = MainWindow()
-        self.main_window.show()
-        self.close()
\ No newline at end of file
+        """Volta para a tela inicial da janela principal"""
+        NavigationController.get_instance().go_home()
\ No newline at end of file
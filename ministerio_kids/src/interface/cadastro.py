@@ -1,20 +1,34 @@
 from PyQt5.QtWidgets import (QMainWindow, QPushButton, QLineEdit, QLabel, 
                             QVBoxLayout, QHBoxLayout, QWidget, QFormLayout, 
                             QDateEdit, QComboBox, QCheckBox, QTextEdit, 
-                            QListWidget, QMessageBox, QDialog, QGroupBox,
+                            QListWidget, QListWidgetItem, QMessageBox, QDialog, QGroupBox,
                             QRadioButton, QScrollArea)
 from PyQt5.QtCore import Qt, QDate, QSize
 from PyQt5.QtGui import QIcon
-import os
 import datetime
-from src.database.db_manager import DatabaseManager
+from src.database.data_service import DataService
+from src.utils.dates import parse_birth_date
+from src.utils.logger import get_logger
+from src.interface.navigation import NavigationController
+
+logger = get_logger('cadastro')
 
 class CadastroWindow(QMainWindow):
     def __init__(self):
         super(CadastroWindow, self).__init__()
-        self.db = DatabaseManager()
+        self.db = DataService.get_instance()
         self.initUI()
         
+        # Atualizar a lista quando o cadastro mudar (aqui ou em outra tela)
+        self.db.watch(self,
+                      childAdded=self.onChildAdded,
+                      childUpdated=self.onChildUpdated,
+                      childRemoved=self.onChildRemoved)
+        
+    def closeEvent(self, event):
+        self.db.unwatch(self)
+        super(CadastroWindow, self).closeEvent(event)
+        
     def initUI(self):
         # Configurar a janela
         self.setWindowTitle("Cadastro - Ministério Kids")
@@ -532,17 +546,8 @@ class CadastroWindow(QMainWindow):
         self.alergia_input.setVisible(index == 1)  # Mostrar se "Sim" estiver selecionado
     
     def voltarMainWindow(self):
-        # Salvar o estado atual da janela
-        from src.utils.helpers import WindowStateManager
-        window_manager = WindowStateManager.get_instance()
-        window_manager.save_state(self)
-        
-        from src.interface.main_window import MainWindow
-        self.main_window = MainWindow()
-        # Restaurar o estado da janela
-        window_manager.restore_state(self.main_window)
-        self.main_window.show()
-        self.close()
+        # A tela continua construída; apenas volta para a inicial
+        NavigationController.get_instance().go_home()
     
     def limparFormulario(self):
         self.nome_input.clear()
@@ -585,7 +590,7 @@ class CadastroWindow(QMainWindow):
         child_data = {
             'nome': self.nome_input.text(),
             'idade': self.idade_input.text(),
-            'data_nascimento': self.data_nascimento.date().toString("dd/MM/yyyy"),
+            'data_nascimento': self.data_nascimento.date().toString("yyyy-MM-dd"),
             'pai': self.pai_input.text(),
             'mae': self.mae_input.text(),
             'outro_responsavel': self.outro_resp_input.text(),
@@ -606,96 +611,55 @@ class CadastroWindow(QMainWindow):
         }
         
         try:
-            import csv
-            import os
-            
-            # Determinar o caminho absoluto do arquivo
-            base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-            criancas_file = os.path.join(base_dir, 'data', 'criancas.csv')
-            
-            print(f"Salvando criança no arquivo: {criancas_file}")
-            
-            # Verificar se o diretório existe
-            os.makedirs(os.path.dirname(criancas_file), exist_ok=True)
-            
-            # Verificar se o arquivo existe e tem conteúdo
-            file_exists = os.path.exists(criancas_file) and os.path.getsize(criancas_file) > 0
-            
-            # Definir os campos padrão na ordem correta
-            default_fields = [
-                'nome', 'idade', 'data_nascimento', 'pai', 'mae', 'outro_responsavel', 
-                'endereco', 'bairro', 'cidade', 'telefone', 'membro', 'batizado', 'doenca_cronica',
-                'alergia', 'conversa_monitor', 'visita', 'permite_fotos', 'observacoes',
-                'visitante', 'data_cadastro'
-            ]
-            
-            # Abrir o arquivo no modo apropriado
-            with open(criancas_file, 'a', newline='', encoding='utf-8') as f:
-                writer = csv.DictWriter(f, fieldnames=default_fields)
-                
-                # Escrever o cabeçalho se o arquivo não existir ou estiver vazio
-                if not file_exists:
-                    writer.writeheader()
-                    print("Escrevendo cabeçalho no arquivo")
-                
-                # Escrever a linha de dados
-                writer.writerow(child_data)
-                print(f"Criança {child_data['nome']} adicionada ao arquivo")
-            
-            # Verificar se o arquivo foi atualizado
-            if os.path.exists(criancas_file):
-                file_size = os.path.getsize(criancas_file)
-                print(f"Tamanho do arquivo após salvamento: {file_size} bytes")
-                
-                # Ler o conteúdo do arquivo para verificar
-                with open(criancas_file, 'r', encoding='utf-8') as f:
-                    content = f.read(200)  # Ler apenas os primeiros 200 caracteres
-                    print(f"Primeiros caracteres do arquivo: {content}")
+            # O gerenciador de dados atribui o id e grava na ordem do cabeçalho do arquivo
+            if not self.db.add_child(child_data):
+                QMessageBox.critical(self, "Erro", "Erro ao cadastrar criança. Tente novamente.")
+                return
             
+            # A lista é atualizada pelo sinal childAdded
             QMessageBox.information(self, "Sucesso", f"Criança {child_data['nome']} cadastrada com sucesso!")
             self.limparFormulario()
-            self.carregarListaCriancas()
         except Exception as e:
+            logger.exception("Erro ao cadastrar criança")
             QMessageBox.critical(self, "Erro", f"Erro ao cadastrar criança: {str(e)}")
-            import traceback
-            traceback.print_exc()
     
     def carregarListaCriancas(self):
         # Limpar a lista atual
         self.children_list.clear()
         
         try:
-            import os
-            import csv
-            
-            # Determinar o caminho absoluto do arquivo
-            base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-            criancas_file = os.path.join(base_dir, 'data', 'criancas.csv')
+            children = self.db.get_all_children()
+            logger.debug("Lidas %d crianças do arquivo", len(children))
             
-            print(f"Carregando crianças do arquivo: {criancas_file}")
-            
-            # Verificar se o arquivo existe
-            if not os.path.exists(criancas_file):
-                print(f"Arquivo {criancas_file} não encontrado")
-                return
-            
-            # Ler diretamente do arquivo
-            with open(criancas_file, 'r', newline='', encoding='utf-8') as file:
-                reader = csv.DictReader(file)
-                children = list(reader)
-                
-                print(f"Lidas {len(children)} crianças do arquivo")
-                
-                # Adicionar crianças à lista
-                for child in children:
-                    nome = child.get('nome', '')
-                    idade = child.get('idade', '')
-                    item_text = f"{nome} ({idade} anos)"
-                    self.children_list.addItem(item_text)
+            # Adicionar crianças à lista
+            for child in children:
+                self.onChildAdded(child)
         except Exception as e:
-            print(f"Erro ao carregar lista de crianças: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Erro ao carregar lista de crianças: %s", e)
+    
+    def _childItemText(self, child):
+        return f"{child.get('nome', '')} ({child.get('idade', '')} anos)"
+    
+    def _findChildRow(self, child_id):
+        for row in range(self.children_list.count()):
+            if self.children_list.item(row).data(Qt.UserRole) == child_id:
+                return row
+        return -1
+    
+    def onChildAdded(self, child):
+        item = QListWidgetItem(self._childItemText(child))
+        item.setData(Qt.UserRole, child['id'])
+        self.children_list.addItem(item)
+    
+    def onChildUpdated(self, child):
+        row = self._findChildRow(child['id'])
+        if row >= 0:
+            self.children_list.item(row).setText(self._childItemText(child))
+    
+    def onChildRemoved(self, child_id):
+        row = self._findChildRow(child_id)
+        if row >= 0:
+            self.children_list.takeItem(row)
 
     def editarCrianca(self):
         selected_items = self.children_list.selectedItems()
@@ -708,13 +672,10 @@ class CadastroWindow(QMainWindow):
             QMessageBox.warning(self, "Aviso", "Selecione uma criança para excluir")
             return
 
-        selected_child = selected_items[0].text()
-        # Extrair o nome da criança do texto completo
-        child_name = selected_child.split(" (")[0]
-        
-        # Buscar dados da criança
-        child_data = self.db.get_child_by_name(child_name)
+        # Buscar dados da criança pelo id guardado no item
+        child_data = self.db.get_child_by_id(selected_items[0].data(Qt.UserRole))
         if not child_data:
+            child_name = selected_items[0].text().split(" (")[0]
             QMessageBox.warning(self, "Aviso", f"Não foi possível encontrar os dados de {child_name}")
             return
         
@@ -722,9 +683,8 @@ class CadastroWindow(QMainWindow):
         dialog = EditChildDialog(child_data, self)
         if dialog.exec_():
             updated_data = dialog.getChildData()
-            if self.db.update_child(child_name, updated_data):
+            if self.db.update_child(child_data['id'], updated_data):
                 QMessageBox.information(self, "Sucesso", f"Dados de {updated_data['nome']} atualizados com sucesso!")
-                self.carregarListaCriancas()
             else:
                 QMessageBox.critical(self, "Erro", "Erro ao atualizar dados. Tente novamente.")
     
@@ -738,7 +698,7 @@ class CadastroWindow(QMainWindow):
         # Extrair o nome da criança do texto completo
         child_name = selected_child.split(" (")[0].strip()
         
-        print(f"Tentando excluir criança: '{child_name}'")
+        logger.debug("Tentando excluir criança: '%s'", child_name)
         
         # Confirmar exclusão
         reply = QMessageBox.question(self, "Confirmar Exclusão", 
@@ -747,88 +707,22 @@ class CadastroWindow(QMainWindow):
         
         if reply == QMessageBox.Yes:
             try:
-                import csv
-                import os
-                
-                # Determinar o caminho absoluto do arquivo
-                base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-                criancas_file = os.path.join(base_dir, 'data', 'criancas.csv')
-                
-                print(f"Excluindo criança do arquivo: {criancas_file}")
-                
-                # Verificar se o arquivo existe
-                if not os.path.exists(criancas_file):
-                    QMessageBox.critical(self, "Erro", f"Arquivo não encontrado: {criancas_file}")
-                    return
-                
-                # Ler diretamente do arquivo
-                children = []
-                updated_children = []
-                found = False
-                
-                with open(criancas_file, 'r', newline='', encoding='utf-8') as file:
-                    reader = csv.DictReader(file)
-                    fieldnames = reader.fieldnames
-                    
-                    # Imprimir cabeçalhos para depuração
-                    print(f"Cabeçalhos do CSV: {fieldnames}")
-                    
-                    for row in reader:
-                        # Imprimir cada linha para depuração
-                        print(f"Linha do CSV: {row}")
-                        
-                        children.append(row)
-                        nome_csv = row.get('nome', '').strip()
-                        
-                        print(f"Comparando '{nome_csv}' com '{child_name}'")
-                        
-                        # Comparação case-insensitive
-                        if nome_csv.lower() != child_name.lower():
-                            updated_children.append(row)
-                        else:
-                            found = True
-                            print(f"Criança encontrada: {nome_csv}")
-                
-                if not found:
-                    # Tentar uma abordagem mais flexível
-                    print("Criança não encontrada, tentando busca flexível...")
-                    updated_children = []
-                    found = False
-                    
-                    for child in children:
-                        nome_csv = child.get('nome', '').strip()
-                        
-                        # Verificar se o nome da criança está contido no nome do CSV ou vice-versa
-                        if child_name.lower() in nome_csv.lower() or nome_csv.lower() in child_name.lower():
-                            found = True
-                            print(f"Correspondência parcial encontrada: '{nome_csv}'")
-                        else:
-                            updated_children.append(child)
-                
-                if not found:
+                child = self.db.get_child_by_id(selected_items[0].data(Qt.UserRole))
+                if not child:
                     QMessageBox.warning(self, "Aviso", f"Não foi possível encontrar {child_name}")
                     return
                 
-                print(f"Lidas {len(children)} crianças, {len(updated_children)} após exclusão")
-                
-                # Escrever a lista atualizada de volta ao arquivo
-                with open(criancas_file, 'w', newline='', encoding='utf-8') as file:
-                    writer = csv.DictWriter(file, fieldnames=fieldnames)
-                    writer.writeheader()
-                    writer.writerows(updated_children)
-                    print(f"Arquivo salvo com {len(updated_children)} crianças")
+                # Excluir pelo id, que identifica o cadastro mesmo com nomes repetidos
+                if not self.db.delete_child(child['id']):
+                    QMessageBox.critical(self, "Erro", f"Erro ao excluir {child_name}. Tente novamente.")
+                    return
                 
-                # Atualizar a interface
+                # A lista é atualizada pelo sinal childRemoved
                 QMessageBox.information(self, "Sucesso", f"{child_name} excluído com sucesso!")
                 
-                # Forçar atualização da lista
-                self.children_list.clear()
-                self.carregarListaCriancas()
-                
             except Exception as e:
+                logger.exception("Erro ao excluir criança")
                 QMessageBox.critical(self, "Erro", f"Erro ao excluir criança: {str(e)}")
-                import traceback
-                traceback.print_exc()
 
 class EditChildDialog(QDialog):
     def __init__(self, child_data, parent=None):
@@ -849,8 +743,9 @@ class EditChildDialog(QDialog):
         
         self.data_nascimento = QDateEdit()
         self.data_nascimento.setDisplayFormat("dd/MM/yyyy")
-        if self.child_data['data_nascimento']:
-            self.data_nascimento.setDate(QDate.fromString(self.child_data['data_nascimento'], "dd/MM/yyyy"))
+        birth_date = parse_birth_date(self.child_data['data_nascimento'])
+        if birth_date:
+            self.data_nascimento.setDate(QDate(birth_date.year, birth_date.month, birth_date.day))
         else:
             self.data_nascimento.setDate(QDate.currentDate())
         self.data_nascimento.setCalendarPopup(True)
@@ -973,7 +868,7 @@ class EditChildDialog(QDialog):
         return {
             'nome': self.nome_input.text(),
             'idade': self.idade_input.text(),
-            'data_nascimento': self.data_nascimento.date().toString("dd/MM/yyyy"),
+            'data_nascimento': self.data_nascimento.date().toString("yyyy-MM-dd"),
             'pai': self.pai_input.text(),
             'mae': self.mae_input.text(),
             'outro_responsavel': self.outro_resp_input.text(),
@@ -1,20 +1,48 @@
-import os
 from PyQt5.QtWidgets import (QMainWindow, QPushButton, QLineEdit, 
-                            QListWidget, QVBoxLayout, QHBoxLayout, 
+                            QListView, QVBoxLayout, QHBoxLayout, 
                             QWidget, QLabel, QDialog, QFormLayout,
                             QComboBox, QMessageBox)
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QTimer, QThreadPool
 from PyQt5.QtGui import QIcon
-from src.database.db_manager import DatabaseManager
+from src.database.data_service import DataService
+from src.database.room_rules import get_room_rules
 import datetime
-from src.utils.helpers import WindowStateManager  # Importar o gerenciador
+from src.utils.workers import Worker
+from src.utils.logger import get_logger
+from src.interface.navigation import NavigationController
+from src.interface.models import ChildListModel, IdRole, NameRole
+
+logger = get_logger('checkin')
 
 class CheckinWindow(QMainWindow):
-    def __init__(self):
+    # Tempo de espera após a última tecla antes de disparar a busca
+    SEARCH_DEBOUNCE_MS = 120
+
+    def __init__(self, search_debounce_ms=None):
         super(CheckinWindow, self).__init__()
-        self.db = DatabaseManager()
+        self.db = DataService.get_instance()
+        
+        # Busca: temporizador de espera + contador de geração para descartar respostas antigas
+        self.search_generation = 0
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(search_debounce_ms if search_debounce_ms is not None
+                                      else self.SEARCH_DEBOUNCE_MS)
+        self.search_timer.timeout.connect(self.startSearch)
+        
         self.initUI()
         
+        # Atualizar as listas quando os dados mudarem (aqui ou em outra tela)
+        self.db.watch(self,
+                      childAdded=self.onChildrenChanged,
+                      childUpdated=self.onChildUpdated,
+                      childRemoved=self.onChildRemoved,
+                      checkinChanged=self.onCheckinChanged)
+        
+    def closeEvent(self, event):
+        self.db.unwatch(self)
+        super(CheckinWindow, self).closeEvent(event)
+        
     def initUI(self):
         # Configurar a janela
         self.setWindowTitle("Check-in - Ministério Kids")
@@ -85,31 +113,32 @@ class CheckinWindow(QMainWindow):
         """)
         main_layout.addWidget(results_label)
         
-        self.children_list = QListWidget()
+        self.children_model = ChildListModel(self)
+        self.children_list = self._createListView(self.children_model)
         self.children_list.setMaximumHeight(200)
         self.children_list.setStyleSheet("""
-            QListWidget {
+            QListView {
                 border: 1px solid #D5E8D4;
                 border-radius: 6px;
                 background-color: white;
                 padding: 5px;
             }
-            QListWidget::item {
+            QListView::item {
                 padding: 8px;
                 border-bottom: 1px solid #F0F0F0;
                 margin: 2px 0;
             }
-            QListWidget::item:selected {
+            QListView::item:selected {
                 background-color: #FFE6CC;
                 color: #333333;
                 border-radius: 4px;
             }
-            QListWidget::item:hover {
+            QListView::item:hover {
                 background-color: #F5F5F5;
             }
         """)
         # Conectar o evento de clique duplo para fazer check-in rápido
-        self.children_list.itemDoubleClicked.connect(self.onChildDoubleClicked)
+        self.children_list.doubleClicked.connect(self.onChildDoubleClicked)
         main_layout.addWidget(self.children_list)
         
         # Botões de ação em um container estilizado
@@ -211,30 +240,31 @@ class CheckinWindow(QMainWindow):
         """)
         checkin_container_layout.addWidget(checkin_label)
         
-        self.checkin_list = QListWidget()
+        self.checkin_model = ChildListModel(self)
+        self.checkin_list = self._createListView(self.checkin_model)
         self.checkin_list.setStyleSheet("""
-            QListWidget {
+            QListView {
                 border: 1px solid #D5E8D4;
                 border-radius: 6px;
                 background-color: white;
                 padding: 5px;
             }
-            QListWidget::item {
+            QListView::item {
                 padding: 8px;
                 border-bottom: 1px solid #F0F0F0;
                 margin: 2px 0;
             }
-            QListWidget::item:selected {
+            QListView::item:selected {
                 background-color: #FFE6CC;
                 color: #333333;
                 border-radius: 4px;
             }
-            QListWidget::item:hover {
+            QListView::item:hover {
                 background-color: #F5F5F5;
             }
         """)
         # Conectar o evento de clique duplo para fazer check-out rápido
-        self.checkin_list.itemDoubleClicked.connect(self.onCheckinDoubleClicked)
+        self.checkin_list.doubleClicked.connect(self.onCheckinDoubleClicked)
         checkin_container_layout.addWidget(self.checkin_list)
         
         main_layout.addWidget(checkin_container)
@@ -267,57 +297,103 @@ class CheckinWindow(QMainWindow):
         # Garantir que o botão fique visível
         self.btn_voltar_float.raise_()
 
+    def _createListView(self, model):
+        """Lista virtualizada: só as linhas visíveis são desenhadas"""
+        view = QListView()
+        view.setModel(model)
+        view.setUniformItemSizes(True)
+        view.setSelectionMode(QListView.SingleSelection)
+        view.setEditTriggers(QListView.NoEditTriggers)
+        return view
+    
+    def _selectedId(self, view):
+        indexes = view.selectionModel().selectedIndexes()
+        return indexes[0].data(IdRole) if indexes else None
+    
     def voltarMainWindow(self):
-        # Salvar o estado atual da janela
-        from src.utils.helpers import WindowStateManager
-        window_manager = WindowStateManager.get_instance()
-        window_manager.save_state(self)
-        
-        from src.interface.main_window import MainWindow
-        self.main_window = MainWindow()
-        # Restaurar o estado da janela
-        window_manager.restore_state(self.main_window)
-        self.main_window.show()
-        self.close()
+        # A tela continua construída; apenas volta para a inicial
+        NavigationController.get_instance().go_home()
     
     def searchChildRealTime(self):
-        """Busca crianças em tempo real enquanto o usuário digita"""
-        # Verificar se o arquivo existe
-        print(f"Procurando arquivo em: {self.db.criancas_file}")
-        print(f"O arquivo existe? {os.path.exists(self.db.criancas_file)}")
-        if os.path.exists(self.db.criancas_file):
-            print(f"Tamanho do arquivo: {os.path.getsize(self.db.criancas_file)} bytes")
-        
-        search_text = self.search_input.text()
-        if search_text:  # Buscar com qualquer texto (mesmo com 1 caractere)
-            children = self.db.search_children(search_text)
-            print(f"Resultados encontrados: {len(children)}")
-            self.children_list.clear()
-            for child in children:
-                self.children_list.addItem(f"{child['nome']} ({child['idade']} anos) - Sala: {self.getSalaByAge(child['idade'])}")
+        """Reinicia a espera da busca a cada tecla digitada"""
+        if self.search_input.text():  # Buscar com qualquer texto (mesmo com 1 caractere)
+            self.search_timer.start()
         else:
-            # Se o campo estiver vazio, limpar a lista
-            self.children_list.clear()
+            # Se o campo estiver vazio, limpar a lista e descartar buscas em andamento
+            self.search_timer.stop()
+            self.search_generation += 1
+            self.children_model.clear()
     
-    def onChildDoubleClicked(self, item):
-        """Faz check-in rápido quando o usuário dá duplo clique em uma criança"""
-        # Extrair o nome da criança do texto completo
-        child_name = item.text().split(" (")[0]
+    def startSearch(self):
+        """Dispara a busca em uma thread do pool, fora da thread da interface"""
+        search_text = self.search_input.text()
+        if not search_text:
+            return
+        
+        self.search_generation += 1
+        worker = Worker(self._searchEntries, search_text, tag=self.search_generation)
+        worker.signals.result.connect(self.onSearchResults)
+        worker.signals.error.connect(self.onSearchError)
+        QThreadPool.globalInstance().start(worker)
+    
+    def _searchEntries(self, search_text):
+        """Executada na thread do pool: busca e monta as linhas da lista"""
+        return [ChildListModel.entry(child, child.room)
+                for child in self.db.search_children(search_text)]
+    
+    def onSearchResults(self, generation, results):
+        """Troca o conteúdo da lista de uma vez, ignorando resultados de buscas substituídas"""
+        if generation != self.search_generation:
+            return
+        self.children_model.set_children(results)
+    
+    def onSearchError(self, generation, message):
+        if generation == self.search_generation:
+            logger.error("Erro ao buscar crianças: %s", message)
+    
+    def _checkinChild(self, child_id):
+        """Faz o check-in da criança do item selecionado"""
+        child = self.db.get_child_by_id(child_id)
+        if not child:
+            QMessageBox.warning(self, "Aviso", "Criança não encontrada")
+            return
         
         # Verificar se a criança já está em check-in
-        if self.db.is_child_checked_in(child_name):
-            QMessageBox.information(self, "Info", f"{child_name} já está em check-in")
+        if self.db.is_child_checked_in(child_id):
+            QMessageBox.information(self, "Info", f"{child['nome']} já está em check-in")
             return
         
-        # Fazer check-in
-        self.db.do_checkin(child_name)
-        self.loadCheckinList()
-        QMessageBox.information(self, "Sucesso", f"Check-in de {child_name} realizado com sucesso!")
+        # Sala cheia (capacidade configurada): confirmar antes
+        rules = get_room_rules()
+        sala = child.room
+        if rules.is_full(sala, self.checkin_model.count_in_room(sala)):
+            reply = QMessageBox.question(
+                self, "Sala cheia",
+                f"A sala {sala} já está com {rules.capacity(sala)} crianças (capacidade máxima).\n"
+                f"Deseja fazer o check-in de {child['nome']} mesmo assim?",
+                QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
+            if reply != QMessageBox.Yes:
+                return
+        
+        # Fazer check-in (a lista de check-in é atualizada pelo sinal checkinChanged)
+        self.db.do_checkin(child_id)
+        QMessageBox.information(self, "Sucesso", f"Check-in de {child['nome']} realizado com sucesso!")
     
-    def onCheckinDoubleClicked(self, item):
+    def _checkoutChild(self, child_id):
+        child = self.db.get_child_by_id(child_id)
+        child_name = child.get('nome', '')
+        
+        # Fazer check-out
+        self.db.do_checkout(child_id)
+        QMessageBox.information(self, "Sucesso", f"Check-out de {child_name} realizado com sucesso!")
+    
+    def onChildDoubleClicked(self, index):
+        """Faz check-in rápido quando o usuário dá duplo clique em uma criança"""
+        self._checkinChild(index.data(IdRole))
+    
+    def onCheckinDoubleClicked(self, index):
         """Faz check-out rápido quando o usuário dá duplo clique em uma criança na lista de check-in"""
-        # Extrair o nome da criança do texto completo
-        child_name = item.text().split(" (")[0]
+        child_name = index.data(NameRole)
         
         # Perguntar se realmente deseja fazer check-out
         reply = QMessageBox.question(self, "Confirmar Check-out", 
@@ -325,75 +401,64 @@ class CheckinWindow(QMainWindow):
                                     QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
         
         if reply == QMessageBox.Yes:
-            # Fazer check-out
-            self.db.do_checkout(child_name)
-            self.loadCheckinList()
-            QMessageBox.information(self, "Sucesso", f"Check-out de {child_name} realizado com sucesso!")
+            self._checkoutChild(index.data(IdRole))
     
     def getSalaByAge(self, age):
-        age = int(age)
-        if age <= 2:
-            return "Berçário"
-        elif age == 3:
-            return "Infantil 1"
-        elif age <= 5:
-            return "Infantil 2"
-        elif age <= 7:
-            return "Infantil 3"
-        elif age <= 10:
-            return "Infantil 4"
-        else:
-            return "Juniores"
+        # Idades inválidas vão para a sala padrão configurada
+        return get_room_rules().room_for_age(age)
     
     def doCheckin(self):
-        selected_items = self.children_list.selectedItems()
-        if not selected_items:
+        child_id = self._selectedId(self.children_list)
+        if child_id is None:
             QMessageBox.warning(self, "Aviso", "Selecione uma criança para fazer check-in")
             return
         
-        selected_child = selected_items[0].text()
-        # Extrair o nome da criança do texto completo
-        child_name = selected_child.split(" (")[0]
-        
-        # Verificar se a criança já está em check-in
-        if self.db.is_child_checked_in(child_name):
-            QMessageBox.information(self, "Info", f"{child_name} já está em check-in")
-            return
-        
-        # Fazer check-in
-        self.db.do_checkin(child_name)
-        self.loadCheckinList()
-        QMessageBox.information(self, "Sucesso", f"Check-in de {child_name} realizado com sucesso!")
+        self._checkinChild(child_id)
     
     def doCheckout(self):
-        selected_items = self.checkin_list.selectedItems()
-        if not selected_items:
+        child_id = self._selectedId(self.checkin_list)
+        if child_id is None:
             QMessageBox.warning(self, "Aviso", "Selecione uma criança para fazer check-out")
             return
         
-        selected_child = selected_items[0].text()
-        # Extrair o nome da criança do texto completo
-        child_name = selected_child.split(" (")[0]
-        
-        # Fazer check-out
-        self.db.do_checkout(child_name)
-        self.loadCheckinList()
-        QMessageBox.information(self, "Sucesso", f"Check-out de {child_name} realizado com sucesso!")
+        self._checkoutChild(child_id)
     
     def addVisitor(self):
         dialog = VisitorDialog(self)
         if dialog.exec_():
             visitor_data = dialog.getVisitorData()
-            self.db.add_visitor(visitor_data)
-            self.db.do_checkin(visitor_data['nome'])
-            self.loadCheckinList()
+            visitor = self.db.add_visitor(visitor_data)
+            if not visitor:
+                QMessageBox.critical(self, "Erro", "Erro ao adicionar visitante. Tente novamente.")
+                return
+            self.db.do_checkin(visitor['id'])
             QMessageBox.information(self, "Sucesso", f"Visitante {visitor_data['nome']} adicionado com sucesso!")
     
     def loadCheckinList(self):
-        self.checkin_list.clear()
-        checked_in_children = self.db.get_checked_in_children()
-        for child in checked_in_children:
-            self.checkin_list.addItem(f"{child['nome']} ({child['idade']} anos) - Sala: {child['sala']}")
+        self.checkin_model.set_children(
+            [ChildListModel.entry(child, child['sala']) for child in self.db.get_checked_in_children()])
+    
+    def onCheckinChanged(self, child_id, checked_in):
+        """Insere ou remove só a linha afetada da lista de check-in"""
+        if checked_in:
+            child = self.db.get_child_by_id(child_id)
+            if child:
+                self.checkin_model.add_child(child, child.room)
+        else:
+            self.checkin_model.remove_child(child_id)
+    
+    def onChildUpdated(self, child):
+        self.checkin_model.update_child(child)
+        self.onChildrenChanged()
+    
+    def onChildRemoved(self, child_id):
+        self.checkin_model.remove_child(child_id)
+        self.onChildrenChanged()
+    
+    def onChildrenChanged(self, *args):
+        """Refaz a busca atual (com a mesma espera) para refletir o cadastro alterado"""
+        if self.search_input.text():
+            self.search_timer.start()
 
 
 class VisitorDialog(QDialog):
@@ -412,7 +477,7 @@ class VisitorDialog(QDialog):
         self.telefone_input = QLineEdit()
         
         self.sala_combo = QComboBox()
-        self.sala_combo.addItems(["Berçário", "Infantil 1", "Infantil 2", "Infantil 3", "Infantil 4", "Juniores"])
+        self.sala_combo.addItems(get_room_rules().names)
         
         layout.addRow("Nome:", self.nome_input)
         layout.addRow("Idade:", self.idade_input)
@@ -1,25 +1,51 @@
 import os
+import threading
 from PyQt5.QtWidgets import (QMainWindow, QPushButton, QLabel, QVBoxLayout, 
-                            QHBoxLayout, QWidget, QFileDialog, QListWidget, 
-                            QListWidgetItem, QMessageBox, QScrollArea, QGridLayout)
-from PyQt5.QtCore import Qt, QSize
-from PyQt5.QtGui import QIcon, QPixmap
+                            QHBoxLayout, QWidget, QFileDialog, QListView, 
+                            QMessageBox, QStyledItemDelegate, QStyle, QProgressDialog)
+from PyQt5.QtCore import Qt, QSize, QRect, QThreadPool
+from PyQt5.QtGui import QIcon, QPixmap, QColor, QPen
+
+from src.interface.navigation import NavigationController
+from src.interface.models import PhotoListModel, PathRole
+from src.utils.thumbnails import ThumbnailCache, ThumbnailLoader, THUMB_WIDTH, THUMB_HEIGHT
+from src.utils.photo_import import import_photos
+from src.utils.settings import get_settings
+from src.database.photo_store import PhotoStore
+from src.utils.workers import Worker
+
+# Tamanho de cada quadro da galeria (miniatura + nome)
+TILE_WIDTH = 220
+TILE_HEIGHT = 200
+TILE_SPACING = 10
 
 class GaleriaWindow(QMainWindow):
     def __init__(self):
         super(GaleriaWindow, self).__init__()
-        self.image_folder = "data/images"
+        # Fotos guardadas pelo conteúdo em data/photos, com índice (nome, datas, dimensões)
+        self.store = PhotoStore()
+        # Miniaturas guardadas em data/thumbnails, pelo hash da foto
+        self.thumbnails = ThumbnailCache(key_func=self.store.hash_of)
+        # Miniaturas carregadas em segundo plano; a janela abre só com os espaços reservados
+        self.thumbnail_loader = ThumbnailLoader(self.thumbnails, parent=self)
+        self.thumbnail_loader.thumbnailReady.connect(self.onThumbnailReady)
+        
+        # As fotos que a view pede para desenhar (visíveis) passam na frente da fila
+        self.photo_model = PhotoListModel(self)
+        self.photo_model.thumbnailsNeeded.connect(self.thumbnail_loader.prioritize)
+        
         self.initUI()
         
+        # Pasta antiga (arquivos soltos em data/images): o conteúdo passa para o acervo em
+        # segundo plano; a janela abre com o que o índice já tem
+        self.migrateLegacyPhotos()
+        
     def initUI(self):
         # Configurar a janela
         self.setWindowTitle("Galeria - Ministério Kids")
         self.setMinimumSize(900, 600)
         self.setObjectName("galeriaWindow")
         
-        # Criar pasta de imagens se não existir
-        os.makedirs(self.image_folder, exist_ok=True)
-        
         # Widget central
         central_widget = QWidget()
         central_widget.setStyleSheet("background-color: white;")
@@ -136,12 +162,25 @@ class GaleriaWindow(QMainWindow):
         """)
         scroll_container_layout.addWidget(gallery_label)
         
-        scroll_area = QScrollArea()
-        scroll_area.setWidgetResizable(True)
-        scroll_area.setStyleSheet("""
-            QScrollArea {
+        # Só os quadros visíveis são desenhados; as colunas se ajustam à largura da janela
+        self.photo_view = QListView()
+        self.photo_view.setModel(self.photo_model)
+        self.photo_view.setItemDelegate(ThumbnailDelegate(self.photo_view))
+        self.photo_view.setViewMode(QListView.IconMode)
+        self.photo_view.setResizeMode(QListView.Adjust)
+        self.photo_view.setMovement(QListView.Static)
+        self.photo_view.setUniformItemSizes(True)
+        self.photo_view.setLayoutMode(QListView.Batched)
+        self.photo_view.setBatchSize(200)
+        self.photo_view.setSpacing(TILE_SPACING)
+        # Clique marca/desmarca a foto, como antes
+        self.photo_view.setSelectionMode(QListView.MultiSelection)
+        self.photo_view.setEditTriggers(QListView.NoEditTriggers)
+        self.photo_view.setStyleSheet("""
+            QListView {
                 border: none;
-                background-color: transparent;
+                background-color: white;
+                border-radius: 5px;
             }
             QScrollBar:vertical {
                 border: none;
@@ -158,15 +197,7 @@ class GaleriaWindow(QMainWindow):
                 background-color: #A8D5BA;
             }
         """)
-        
-        self.image_grid_widget = QWidget()
-        self.image_grid_widget.setStyleSheet("background-color: white; border-radius: 5px;")
-        self.image_grid = QGridLayout(self.image_grid_widget)
-        self.image_grid.setContentsMargins(10, 10, 10, 10)
-        self.image_grid.setSpacing(10)
-        
-        scroll_area.setWidget(self.image_grid_widget)
-        scroll_container_layout.addWidget(scroll_area)
+        scroll_container_layout.addWidget(self.photo_view)
         
         main_layout.addWidget(scroll_container)
         
@@ -199,92 +230,132 @@ class GaleriaWindow(QMainWindow):
         self.btn_voltar_float.raise_()
 
     def voltarMainWindow(self):
-        # Salvar o estado atual da janela
-        from src.utils.helpers import WindowStateManager
-        window_manager = WindowStateManager.get_instance()
-        window_manager.save_state(self)
-        
-        from src.interface.main_window import MainWindow
-        self.main_window = MainWindow()
-        # Restaurar o estado da janela
-        window_manager.restore_state(self.main_window)
-        self.main_window.show()
-        self.close()
+        # A tela continua construída; apenas volta para a inicial
+        NavigationController.get_instance().go_home()
     
     def addImages(self):
         file_dialog = QFileDialog()
         file_dialog.setFileMode(QFileDialog.ExistingFiles)
         file_dialog.setNameFilter("Imagens (*.png *.jpg *.jpeg *.bmp *.gif)")
         
-        if file_dialog.exec_():
-            selected_files = file_dialog.selectedFiles()
-            
-            for file_path in selected_files:
-                file_name = os.path.basename(file_path)
-                destination = os.path.join(self.image_folder, file_name)
-                
-                # Verificar se o arquivo já existe
-                if os.path.exists(destination):
-                    reply = QMessageBox.question(self, "Arquivo Existente", 
-                                                f"O arquivo {file_name} já existe. Deseja substituí-lo?",
-                                                QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
-                    
-                    if reply == QMessageBox.No:
-                        continue
-                
-                # Copiar o arquivo
-                try:
-                    with open(file_path, 'rb') as src_file:
-                        with open(destination, 'wb') as dst_file:
-                            dst_file.write(src_file.read())
-                    
-                    QMessageBox.information(self, "Sucesso", f"Imagem {file_name} adicionada com sucesso!")
-                except Exception as e:
-                    QMessageBox.critical(self, "Erro", f"Erro ao adicionar imagem: {e}")
-            
-            # Recarregar imagens
-            self.loadImages()
-    
-    def loadImages(self):
-        # Limpar grid existente
-        for i in reversed(range(self.image_grid.count())):
-            self.image_grid.itemAt(i).widget().setParent(None)
+        if not file_dialog.exec_():
+            return
+        selected_files = file_dialog.selectedFiles()
+        if not selected_files:
+            return
         
-        # Verificar se a pasta existe
-        if not os.path.exists(self.image_folder):
+        # Uma única janela de progresso para todo o lote; a cópia roda fora da thread da interface
+        self.import_cancel = threading.Event()
+        self.import_progress = QProgressDialog("Importando fotos...", "Cancelar", 0, len(selected_files), self)
+        self.import_progress.setWindowTitle("Adicionar Imagens")
+        self.import_progress.setWindowModality(Qt.WindowModal)
+        self.import_progress.setMinimumDuration(300)
+        self.import_progress.setAutoClose(False)
+        self.import_progress.setAutoReset(False)
+        self.import_progress.canceled.connect(self.import_cancel.set)
+        self.btn_add.setEnabled(False)
+        
+        # Redução das fotos (data/settings.json, seção importacao_fotos)
+        options = get_settings()['importacao_fotos']
+        worker = Worker(import_photos, selected_files, self.store,
+                        is_cancelled=self.import_cancel.is_set, options=options, with_progress=True)
+        worker.signals.progress.connect(self.onImportProgress)
+        worker.signals.result.connect(self.onImportFinished)
+        worker.signals.error.connect(self.onImportError)
+        QThreadPool.globalInstance().start(worker)
+    
+    def onImportProgress(self, tag, done, total):
+        self.import_progress.setValue(done)
+        self.import_progress.setLabelText(f"Importando fotos... {done} de {total}")
+    
+    def onImportFinished(self, tag, result):
+        self.import_progress.close()
+        self.btn_add.setEnabled(True)
+        
+        # Só as fotos novas entram na lista
+        for record in result['importadas']:
+            self.photo_model.add_photo(record['caminho'], record['nome_original'])
+        self.thumbnail_loader.request(record['caminho'] for record in result['importadas'])
+        
+        # Um único resumo no lugar de uma mensagem por arquivo
+        summary = [f"{len(result['importadas'])} foto(s) importada(s)."]
+        if result['duplicadas']:
+            summary.append(f"{len(result['duplicadas'])} já estavam na galeria e foram ignoradas.")
+        if result['cancelado']:
+            summary.append("Importação cancelada antes do fim.")
+        if result['erros']:
+            summary.append(f"{len(result['erros'])} não puderam ser copiadas:")
+            summary.extend(f"  {os.path.basename(path)}: {message}" for path, message in result['erros'][:10])
+            QMessageBox.warning(self, "Importação", "\n".join(summary))
+        else:
+            QMessageBox.information(self, "Importação", "\n".join(summary))
+    
+    def onImportError(self, tag, message):
+        self.import_progress.close()
+        self.btn_add.setEnabled(True)
+        QMessageBox.critical(self, "Erro", f"Erro ao adicionar imagens: {message}")
+    
+    def migrateLegacyPhotos(self):
+        # Depois da primeira migração completa o índice já responde, sem olhar a pasta
+        if not self.store.needs_legacy_import():
             return
         
-        # Listar arquivos de imagem
-        image_files = [f for f in os.listdir(self.image_folder) 
-                      if f.lower().endswith(('.png', '.jpg', '.jpeg', '.bmp', '.gif'))]
+        # Mesma janela de progresso da importação em lote
+        self.legacy_cancel = threading.Event()
+        self.legacy_progress = QProgressDialog("Movendo fotos antigas para a galeria...", "Cancelar", 0, 0, self)
+        self.legacy_progress.setWindowTitle("Galeria")
+        self.legacy_progress.setWindowModality(Qt.WindowModal)
+        self.legacy_progress.setMinimumDuration(300)
+        self.legacy_progress.setAutoClose(False)
+        self.legacy_progress.setAutoReset(False)
+        self.legacy_progress.canceled.connect(self.legacy_cancel.set)
+        self.btn_add.setEnabled(False)
+        self.btn_delete.setEnabled(False)
+        
+        worker = Worker(self.store.import_legacy_folder,
+                        is_cancelled=self.legacy_cancel.is_set, with_progress=True)
+        worker.signals.progress.connect(self.onLegacyProgress)
+        worker.signals.result.connect(self.onLegacyFinished)
+        worker.signals.error.connect(self.onLegacyError)
+        QThreadPool.globalInstance().start(worker)
+    
+    def onLegacyProgress(self, tag, done, total):
+        self.legacy_progress.setMaximum(total)
+        self.legacy_progress.setValue(done)
+        self.legacy_progress.setLabelText(f"Movendo fotos antigas para a galeria... {done} de {total}")
+    
+    def onLegacyFinished(self, tag, imported):
+        self.legacy_progress.close()
+        self.btn_add.setEnabled(True)
+        self.btn_delete.setEnabled(True)
+        if imported:
+            self.loadImages()
+    
+    def onLegacyError(self, tag, message):
+        self.legacy_progress.close()
+        self.btn_add.setEnabled(True)
+        self.btn_delete.setEnabled(True)
+        QMessageBox.critical(self, "Erro", f"Erro ao mover as fotos antigas: {message}")
+    
+    def loadImages(self):
+        # Descartar miniaturas ainda na fila de uma carga anterior
+        self.thumbnail_loader.clear()
         
-        # Adicionar imagens ao grid
-        row, col = 0, 0
-        max_cols = 4  # Número de colunas no grid
+        # Consulta ao índice, já na ordem da data das fotos (sem varrer a pasta)
+        photos = self.store.list_photos()
+        image_paths = [photo['caminho'] for photo in photos]
         
-        for image_file in image_files:
-            image_path = os.path.join(self.image_folder, image_file)
-            
-            # Criar widget de imagem
-            image_widget = ImageWidget(image_path, image_file)
-            
-            # Adicionar ao grid
-            self.image_grid.addWidget(image_widget, row, col)
-            
-            # Atualizar posição
-            col += 1
-            if col >= max_cols:
-                col = 0
-                row += 1
+        self.photo_model.set_photos((photo['caminho'], photo['nome_original']) for photo in photos)
+        # Todas entram na fila; as que a view desenhar primeiro são priorizadas
+        self.thumbnail_loader.request(image_paths)
+    
+    def onThumbnailReady(self, image_path, image):
+        self.photo_model.set_thumbnail(image_path, QPixmap.fromImage(image))
     
     def deleteImages(self):
         # Coletar imagens selecionadas
-        selected_images = []
-        
-        for i in range(self.image_grid.count()):
-            widget = self.image_grid.itemAt(i).widget()
-            if isinstance(widget, ImageWidget) and widget.isSelected():
-                selected_images.append(widget.image_path)
+        selected_images = [index.data(PathRole)
+                           for index in self.photo_view.selectionModel().selectedIndexes()]
         
         if not selected_images:
             QMessageBox.warning(self, "Aviso", "Nenhuma imagem selecionada")
@@ -299,76 +370,51 @@ class GaleriaWindow(QMainWindow):
             # Excluir imagens
             for image_path in selected_images:
                 try:
-                    os.remove(image_path)
+                    self.thumbnails.discard(image_path)
+                    self.store.remove(self.store.hash_of(image_path))
+                    self.photo_model.remove_photo(image_path)
                 except Exception as e:
                     QMessageBox.critical(self, "Erro", f"Erro ao excluir imagem: {e}")
             
-            # Recarregar imagens
-            self.loadImages()
             QMessageBox.information(self, "Sucesso", "Imagens excluídas com sucesso!")
 
-class ImageWidget(QWidget):
-    def __init__(self, image_path, image_name):
-        super(ImageWidget, self).__init__()
-        self.image_path = image_path
-        self.image_name = image_name
-        self.selected = False
-        self.initUI()
-    
-    def initUI(self):
-        layout = QVBoxLayout(self)
-        layout.setContentsMargins(5, 5, 5, 5)
-        
-        # Imagem
-        self.image_label = QLabel()
-        pixmap = QPixmap(self.image_path)
-        scaled_pixmap = pixmap.scaled(200, 150, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-        self.image_label.setPixmap(scaled_pixmap)
-        self.image_label.setAlignment(Qt.AlignCenter)
-        
-        # Nome da imagem
-        name_label = QLabel(self.image_name)
-        name_label.setAlignment(Qt.AlignCenter)
-        name_label.setWordWrap(True)
-        name_label.setMaximumWidth(200)
-        
-        # Adicionar ao layout
-        layout.addWidget(self.image_label)
-        layout.addWidget(name_label)
-        
-        # Estilo
-        self.setStyleSheet("""
-            QWidget {
-                background-color: #f8f9fa;
-                border: 1px solid #ced4da;
-                border-radius: 4px;
-            }
-        """)
-        
-        # Tamanho fixo
-        self.setFixedSize(220, 200)
+class ThumbnailDelegate(QStyledItemDelegate):
+    """Desenha o quadro de uma foto: miniatura centralizada e nome embaixo"""
     
-    def mousePressEvent(self, event):
-        self.selected = not self.selected
-        self.updateStyle()
+    def sizeHint(self, option, index):
+        return QSize(TILE_WIDTH, TILE_HEIGHT)
     
-    def updateStyle(self):
-        if self.selected:
-            self.setStyleSheet("""
-                QWidget {
-                    background-color: #f8d7da;
-                    border: 2px solid #721c24;
-                    border-radius: 4px;
-                }
-            """)
+    def paint(self, painter, option, index):
+        painter.save()
+        rect = option.rect.adjusted(1, 1, -1, -1)
+        
+        # Fundo e borda (vermelho quando selecionada, como antes)
+        if option.state & QStyle.State_Selected:
+            painter.setPen(QPen(QColor("#721c24"), 2))
+            painter.setBrush(QColor("#f8d7da"))
         else:
-            self.setStyleSheet("""
-                QWidget {
-                    background-color: #f8f9fa;
-                    border: 1px solid #ced4da;
-                    border-radius: 4px;
-                }
-            """)
-    
-    def isSelected(self):
-        return self.selected
\ No newline at end of file
+            painter.setPen(QPen(QColor("#ced4da"), 1))
+            painter.setBrush(QColor("#f8f9fa"))
+        painter.drawRoundedRect(rect, 4, 4)
+        
+        # Miniatura (ou aviso enquanto não chega)
+        image_rect = QRect(rect.left() + (rect.width() - THUMB_WIDTH) // 2, rect.top() + 5,
+                           THUMB_WIDTH, THUMB_HEIGHT)
+        pixmap = index.data(Qt.DecorationRole)
+        painter.setPen(QColor("#6c757d"))
+        if pixmap is None:
+            painter.drawText(image_rect, Qt.AlignCenter, "Carregando...")
+        elif pixmap.isNull():
+            painter.drawText(image_rect, Qt.AlignCenter, "Sem prévia")
+        else:
+            x = image_rect.left() + (image_rect.width() - pixmap.width()) // 2
+            y = image_rect.top() + (image_rect.height() - pixmap.height()) // 2
+            painter.drawPixmap(x, y, pixmap)
+        
+        # Nome do arquivo, cortado com "..." se não couber
+        text_rect = QRect(rect.left() + 5, image_rect.bottom() + 5,
+                          rect.width() - 10, rect.bottom() - image_rect.bottom() - 5)
+        name = option.fontMetrics.elidedText(index.data(Qt.DisplayRole), Qt.ElideMiddle, text_rect.width())
+        painter.setPen(QColor("#333333"))
+        painter.drawText(text_rect, Qt.AlignHCenter | Qt.AlignTop, name)
+        painter.restore()
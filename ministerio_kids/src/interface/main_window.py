@@ -1,29 +1,65 @@
 import os
 from PyQt5.QtWidgets import (
-    QMainWindow, QPushButton, QLabel, QVBoxLayout, 
-    QWidget, QHBoxLayout, QSizePolicy, QSpacerItem
+    QMainWindow, QPushButton, QVBoxLayout, 
+    QWidget, QHBoxLayout, QSizePolicy, QSpacerItem, QStackedWidget
 )
-from PyQt5.QtGui import QPixmap, QFont
+from PyQt5.QtGui import QPixmap, QFont, QPainter, QColor
 from PyQt5.QtCore import Qt
 
 from src.interface.checkin import CheckinWindow
 from src.interface.cadastro import CadastroWindow
-from src.interface.galeria import GaleriaWindow
-from src.interface.relatorios import RelatoriosWindow
-from src.utils.helpers import WindowStateManager  # Importar o gerenciador
+# Galeria e relatórios (PyQt5.QtChart) só são importados quando usados
+from src.interface.navigation import NavigationController, LazyScreen
+from src.utils.logger import get_logger
+
+logger = get_logger('interface')
+
+# Espera após a primeira exibição antes de pré-carregar as telas pesadas
+PREWARM_DELAY_MS = 500
+
+
+class HomePage(QWidget):
+    """Tela inicial: desenha a imagem de fundo, carregada uma única vez"""
+
+    def __init__(self, background_path, parent=None):
+        super(HomePage, self).__init__(parent)
+        self._background = None
+        self._scaled_background = None
+
+        if os.path.exists(background_path):
+            self._background = QPixmap(background_path)
+        else:
+            logger.warning("Imagem de fundo não encontrada: %s", background_path)
+            os.makedirs(os.path.dirname(background_path), exist_ok=True)
+            logger.debug("Diretório de imagens criado em: %s", os.path.dirname(background_path))
+
+    def resizeEvent(self, event):
+        # A imagem é redimensionada só quando o tamanho muda, não a cada pintura
+        self._scaled_background = None
+        super(HomePage, self).resizeEvent(event)
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        if self._background is None or self._background.isNull():
+            painter.fillRect(self.rect(), QColor("#f8f9fa"))
+            return
+        if self._scaled_background is None:
+            self._scaled_background = self._background.scaled(
+                self.size(), Qt.IgnoreAspectRatio, Qt.SmoothTransformation)
+        painter.drawPixmap(0, 0, self._scaled_background)
+
 
 class MainWindow(QMainWindow):
     def __init__(self):
         super(MainWindow, self).__init__()
 
         self.base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-        self.window_manager = WindowStateManager.get_instance()
 
         self.setWindowTitle("Missão Kids App")
         self.setMinimumSize(800, 600)
 
         self.setupUI()
-        self.setBackground()
+        self.setupNavigation()
         
     def atualizarFonteBotoes(self):
         largura = self.width()
@@ -51,10 +87,13 @@ class MainWindow(QMainWindow):
             return int(8 + (altura - 600) * (38 - 8) / (900 - 600))         
 
     def setupUI(self):
-        central_widget = QWidget()
-        self.setCentralWidget(central_widget)
+        # Todas as telas ficam empilhadas na janela principal; a inicial é a primeira
+        self.stack = QStackedWidget()
+        self.setCentralWidget(self.stack)
+
+        self.home_page = HomePage(os.path.join(self.base_dir, 'assets', 'images', 'background.jpg'))
 
-        main_layout = QVBoxLayout(central_widget)
+        main_layout = QVBoxLayout(self.home_page)
         main_layout.setContentsMargins(10, 10, 10, 10)
         
         # Espaçador dinâmico no topo
@@ -154,20 +193,23 @@ class MainWindow(QMainWindow):
         # Ajusta fonte ao iniciar
         self.atualizarFonteBotoes()
 
-    def setBackground(self):
-        background_path = os.path.join(self.base_dir, 'assets', 'images', 'background.jpg')
-        if os.path.exists(background_path):
-            pixmap = QPixmap(background_path)
-            background_label = QLabel(self)
-            background_label.setPixmap(pixmap)
-            background_label.setScaledContents(True)
-            background_label.setGeometry(0, 0, self.width(), self.height())
-            background_label.lower()
-        else:
-            print(f"Imagem de fundo não encontrada: {background_path}")
-            os.makedirs(os.path.join(self.base_dir, 'assets', 'images'), exist_ok=True)
-            print(f"Diretório de imagens criado em: {os.path.join(self.base_dir, 'assets', 'images')}")
-            self.setStyleSheet("background-color: #f8f9fa;")
+    def setupNavigation(self):
+        """Registra as telas; cada uma é construída na primeira visita e reaproveitada"""
+        self.navigation = NavigationController.get_instance()
+        self.navigation.attach(self, self.stack, 'inicio', self.home_page)
+        self.navigation.register('checkin', CheckinWindow)
+        self.navigation.register('cadastro', CadastroWindow)
+        self.navigation.register('galeria', LazyScreen('src.interface.galeria', 'GaleriaWindow'))
+        self.navigation.register('relatorios', LazyScreen('src.interface.relatorios', 'RelatoriosWindow'))
+
+    def prewarmScreens(self):
+        """Importa as telas pesadas depois que a janela já está visível.
+
+        Desligado com ``MISSAO_KIDS_PREWARM=0``.
+        """
+        if os.environ.get('MISSAO_KIDS_PREWARM', '1').strip() in ('0', 'false', 'no'):
+            return
+        self.navigation.prewarm(['relatorios', 'galeria'], delay_ms=PREWARM_DELAY_MS)
 
     def resizeEvent(self, event):
         super().resizeEvent(event)
@@ -182,38 +224,17 @@ class MainWindow(QMainWindow):
                 QSizePolicy.Fixed
             )
             # Força o layout a recalcular
-            self.centralWidget().layout().invalidate()
-            self.centralWidget().layout().update()
-
-        # Redimensionar o background
-        for child in self.children():
-            if isinstance(child, QLabel) and not child.text():
-                child.setGeometry(0, 0, self.width(), self.height())
+            self.home_page.layout().invalidate()
+            self.home_page.layout().update()
                 
     def openCheckin(self):
-        self.window_manager.save_state(self)
-        self.checkin_window = CheckinWindow()
-        self.window_manager.restore_state(self.checkin_window)
-        self.checkin_window.show()
-        self.hide()
+        self.navigation.show('checkin')
         
     def openCadastro(self):
-        self.window_manager.save_state(self)
-        self.cadastro_window = CadastroWindow()
-        self.window_manager.restore_state(self.cadastro_window)
-        self.cadastro_window.show()
-        self.hide()
+        self.navigation.show('cadastro')
         
     def openGaleria(self):
-        self.window_manager.save_state(self)
-        self.galeria_window = GaleriaWindow()
-        self.window_manager.restore_state(self.galeria_window)
-        self.galeria_window.show()
-        self.hide()
+        self.navigation.show('galeria')
         
     def openRelatorios(self):
-        self.window_manager.save_state(self)
-        self.relatorios_window = RelatoriosWindow()
-        self.window_manager.restore_state(self.relatorios_window)
-        self.relatorios_window.show()
-        self.hide()
\ No newline at end of file
+        self.navigation.show('relatorios')
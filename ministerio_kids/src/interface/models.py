@@ -0,0 +1,244 @@
+# src/interface/models.py
+
+import os
+from typing import List, Dict, Any, Iterable, Tuple
+
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex, QTimer, pyqtSignal
+from PyQt5.QtGui import QPixmap
+
+# Papéis extras dos itens (além do texto exibido)
+IdRole = Qt.UserRole
+SalaRole = Qt.UserRole + 1
+NameRole = Qt.UserRole + 2
+# Caminho da foto (galeria)
+PathRole = Qt.UserRole + 3
+
+
+class ChildListModel(QAbstractListModel):
+    """Lista de crianças para um QListView.
+
+    Guarda só o necessário para exibir cada linha (id, nome, idade e sala);
+    o id fica no papel ``IdRole``, sem precisar ler de volta o texto do item.
+    Inclusões e remoções avisam a view linha a linha (rowsInserted /
+    rowsRemoved), e a view só desenha as linhas visíveis.
+    """
+
+    def __init__(self, parent=None):
+        super(ChildListModel, self).__init__(parent)
+        self._rows: List[Dict[str, Any]] = []
+        # id da criança -> linha
+        self._row_of: Dict[int, int] = {}
+
+    @staticmethod
+    def entry(child: Dict[str, Any], sala: str) -> Dict[str, Any]:
+        return {'id': child['id'], 'nome': child['nome'], 'idade': child['idade'], 'sala': sala}
+
+    @staticmethod
+    def label(entry: Dict[str, Any]) -> str:
+        return f"{entry['nome']} ({entry['idade']} anos) - Sala: {entry['sala']}"
+
+    def _reindex(self, start: int = 0) -> None:
+        for row in range(start, len(self._rows)):
+            self._row_of[self._rows[row]['id']] = row
+
+    # --- QAbstractListModel ---
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self._rows):
+            return None
+        entry = self._rows[index.row()]
+        if role == Qt.DisplayRole:
+            return self.label(entry)
+        if role == IdRole:
+            return entry['id']
+        if role == SalaRole:
+            return entry['sala']
+        if role == NameRole:
+            return entry['nome']
+        return None
+
+    # --- Alterações ---
+
+    def set_children(self, entries: List[Dict[str, Any]]) -> None:
+        """Troca todo o conteúdo (ex.: novo resultado de busca).
+
+        Uma criança aparece uma única vez, como em ``add_child``: se ela vier
+        repetida (duas sessões de check-in em aberto), vale a primeira.
+        """
+        self.beginResetModel()
+        self._rows = []
+        self._row_of = {}
+        for entry in entries:
+            if entry['id'] not in self._row_of:
+                self._row_of[entry['id']] = len(self._rows)
+                self._rows.append(dict(entry))
+        self.endResetModel()
+
+    def clear(self) -> None:
+        self.set_children([])
+
+    def add_child(self, child: Dict[str, Any], sala: str) -> bool:
+        """Acrescenta uma criança no fim da lista; ignora se ela já estiver"""
+        if child['id'] in self._row_of:
+            return False
+        row = len(self._rows)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._rows.append(self.entry(child, sala))
+        self._row_of[child['id']] = row
+        self.endInsertRows()
+        return True
+
+    def remove_child(self, child_id: int) -> bool:
+        row = self._row_of.get(child_id)
+        if row is None:
+            return False
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._rows[row]
+        del self._row_of[child_id]
+        self._reindex(row)
+        self.endRemoveRows()
+        return True
+
+    def update_child(self, child: Dict[str, Any]) -> bool:
+        """Atualiza nome e idade da criança, mantendo a sala exibida"""
+        row = self._row_of.get(child['id'])
+        if row is None:
+            return False
+        entry = self._rows[row]
+        entry['nome'] = child['nome']
+        entry['idade'] = child['idade']
+        index = self.index(row)
+        self.dataChanged.emit(index, index, [Qt.DisplayRole, NameRole])
+        return True
+
+    # --- Consultas ---
+
+    def contains(self, child_id: int) -> bool:
+        return child_id in self._row_of
+
+    def child_id(self, index) -> int:
+        return self.data(index, IdRole)
+
+    def count_in_room(self, sala: str) -> int:
+        return sum(1 for entry in self._rows if entry['sala'] == sala)
+
+
+class PhotoListModel(QAbstractListModel):
+    """Fotos da galeria para um QListView em modo ícone.
+
+    A miniatura (``Qt.DecorationRole``) fica vazia até ser entregue por
+    ``set_thumbnail``. Como a view só pede os dados das linhas visíveis, as
+    fotos pedidas sem miniatura são avisadas em lote por
+    ``thumbnailsNeeded`` — é assim que as visíveis furam a fila.
+    """
+
+    # Caminhos das fotos visíveis que ainda não têm miniatura
+    thumbnailsNeeded = pyqtSignal(list)
+
+    def __init__(self, parent=None):
+        super(PhotoListModel, self).__init__(parent)
+        self._paths: List[str] = []
+        self._names: Dict[str, str] = {}
+        self._row_of: Dict[str, int] = {}
+        self._thumbnails: Dict[str, QPixmap] = {}
+        self._wanted: List[str] = []
+        self._wanted_set = set()
+        self._wanted_timer = QTimer(self)
+        self._wanted_timer.setSingleShot(True)
+        self._wanted_timer.setInterval(0)
+        self._wanted_timer.timeout.connect(self._flushWanted)
+
+    def _reindex(self, start: int = 0) -> None:
+        for row in range(start, len(self._paths)):
+            self._row_of[self._paths[row]] = row
+
+    # --- QAbstractListModel ---
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._paths)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self._paths):
+            return None
+        path = self._paths[index.row()]
+        if role == Qt.DisplayRole:
+            return self._names.get(path) or os.path.basename(path)
+        if role == Qt.DecorationRole:
+            pixmap = self._thumbnails.get(path)
+            if pixmap is None and path not in self._wanted_set:
+                self._wanted.append(path)
+                self._wanted_set.add(path)
+                self._wanted_timer.start()
+            return pixmap
+        if role == PathRole:
+            return path
+        return None
+
+    def _flushWanted(self):
+        wanted = [path for path in self._wanted if path in self._row_of and path not in self._thumbnails]
+        self._wanted = []
+        self._wanted_set = set()
+        if wanted:
+            self.thumbnailsNeeded.emit(wanted)
+
+    # --- Alterações ---
+
+    def set_photos(self, photos: Iterable[Tuple[str, str]]) -> None:
+        """Troca todo o conteúdo por pares (caminho, nome exibido)"""
+        self.beginResetModel()
+        self._names = dict(photos)
+        self._paths = list(self._names)
+        self._row_of = {}
+        self._reindex()
+        self._thumbnails = {}
+        self._wanted = []
+        self._wanted_set = set()
+        self.endResetModel()
+
+    def add_photo(self, path: str, name: str = None) -> bool:
+        """Acrescenta uma foto no fim; se ela já estiver, só descarta a miniatura antiga"""
+        if name:
+            self._names[path] = name
+        if path in self._row_of:
+            self._thumbnails.pop(path, None)
+            index = self.index(self._row_of[path])
+            self.dataChanged.emit(index, index, [Qt.DecorationRole])
+            return False
+        row = len(self._paths)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._paths.append(path)
+        self._row_of[path] = row
+        self.endInsertRows()
+        return True
+
+    def remove_photo(self, path: str) -> bool:
+        row = self._row_of.get(path)
+        if row is None:
+            return False
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._paths[row]
+        del self._row_of[path]
+        self._names.pop(path, None)
+        self._thumbnails.pop(path, None)
+        self._reindex(row)
+        self.endRemoveRows()
+        return True
+
+    def set_thumbnail(self, path: str, pixmap: QPixmap) -> None:
+        row = self._row_of.get(path)
+        if row is None:
+            return
+        self._thumbnails[path] = pixmap
+        index = self.index(row)
+        self.dataChanged.emit(index, index, [Qt.DecorationRole])
+
+    # --- Consultas ---
+
+    def paths(self) -> List[str]:
+        return list(self._paths)
+
+    def has_thumbnail(self, path: str) -> bool:
+        return path in self._thumbnails
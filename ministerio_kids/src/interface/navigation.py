@@ -0,0 +1,129 @@
+# src/interface/navigation.py
+
+import importlib
+
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+from src.utils.logger import get_logger
+from src.utils.profiling import timed
+
+logger = get_logger('interface.navigation')
+
+# Intervalo entre as etapas do pré-carregamento, para não travar a interface
+PREWARM_STEP_MS = 50
+
+
+class LazyScreen:
+    """Fábrica de tela cujo módulo só é importado quando necessário.
+
+    Telas pesadas (relatórios puxa o PyQt5.QtChart) não precisam ser
+    importadas antes da janela principal aparecer.
+    """
+
+    def __init__(self, module_name: str, class_name: str):
+        self.module_name = module_name
+        self.class_name = class_name
+        self._cls = None
+
+    def load(self):
+        """Importa o módulo da tela (uma única vez) e retorna a classe"""
+        if self._cls is None:
+            with timed(f"Importar {self.module_name}"):
+                module = importlib.import_module(self.module_name)
+            self._cls = getattr(module, self.class_name)
+        return self._cls
+
+    def __call__(self):
+        return self.load()()
+
+
+class NavigationController(QObject):
+    """Controla a troca de telas dentro da janela principal.
+
+    Cada tela é construída uma única vez, na primeira visita, e fica no
+    QStackedWidget da janela principal; as visitas seguintes apenas trocam
+    a página visível.
+    """
+
+    # Nome da tela que ficou visível
+    pageChanged = pyqtSignal(str)
+
+    _instance = None
+
+    @classmethod
+    def get_instance(cls):
+        if cls._instance is None:
+            cls._instance = NavigationController()
+        return cls._instance
+
+    def __init__(self, parent=None):
+        super(NavigationController, self).__init__(parent)
+        self.window = None
+        self.stack = None
+        self.home_name = None
+        self.default_title = ''
+        self._factories = {}
+        self._pages = {}
+
+    def attach(self, window, stack, home_name: str, home_page) -> None:
+        """Liga o controlador à janela principal e registra a tela inicial"""
+        self.window = window
+        self.stack = stack
+        self.home_name = home_name
+        self.default_title = window.windowTitle()
+        self._pages[home_name] = home_page
+        if stack.indexOf(home_page) < 0:
+            stack.addWidget(home_page)
+
+    def register(self, name: str, factory) -> None:
+        """Registra a função que constrói a tela ``name`` (chamada uma única vez)"""
+        self._factories[name] = factory
+
+    def is_built(self, name: str) -> bool:
+        return name in self._pages
+
+    def page(self, name: str):
+        """Retorna a tela, construindo-a na primeira vez"""
+        page = self._pages.get(name)
+        if page is None:
+            with timed(f"Construir tela '{name}'"):
+                page = self._factories[name]()
+                self._pages[name] = page
+                self.stack.addWidget(page)
+        return page
+
+    def prewarm(self, names, build: bool = False, delay_ms: int = 0) -> None:
+        """Carrega telas em segundo plano quando a interface estiver ociosa.
+
+        Cada tela é uma etapa separada do laço de eventos. Por padrão só o
+        módulo é importado; com ``build=True`` a tela também é construída.
+        """
+        pending = [name for name in names if not self.is_built(name)]
+
+        def step():
+            if not pending:
+                return
+            name = pending.pop(0)
+            try:
+                factory = self._factories[name]
+                if build:
+                    self.page(name)
+                elif isinstance(factory, LazyScreen):
+                    factory.load()
+            except Exception:
+                logger.exception("Erro ao pré-carregar a tela '%s'", name)
+            if pending:
+                QTimer.singleShot(PREWARM_STEP_MS, step)
+
+        QTimer.singleShot(delay_ms, step)
+
+    def show(self, name: str):
+        """Torna a tela ``name`` visível na janela principal"""
+        page = self.page(name)
+        self.stack.setCurrentWidget(page)
+        self.window.setWindowTitle(page.windowTitle() or self.default_title)
+        self.pageChanged.emit(name)
+        return page
+
+    def go_home(self):
+        return self.show(self.home_name)
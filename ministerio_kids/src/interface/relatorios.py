@@ -7,12 +7,20 @@ from PyQt5.QtChart import QAbstractBarSeries  # Import QAbstractBarSeries
 from PyQt5.QtWidgets import (QMainWindow, QPushButton, QLabel, QVBoxLayout, 
                             QHBoxLayout, QWidget, QComboBox, QFileDialog, 
                             QMessageBox, QTabWidget, QTableWidget, QTableWidgetItem,
-                            QHeaderView, QDialog, QCalendarWidget, QDateEdit)
-from PyQt5.QtCore import Qt, QSize, QDate
+                            QHeaderView, QDialog, QCalendarWidget, QDateEdit, QProgressBar, QApplication)
+from PyQt5.QtCore import Qt, QSize, QDate, QTimer, QThreadPool
 from PyQt5.QtGui import QIcon, QColor, QFont, QBrush, QPen, QPainter, QLinearGradient, QGradient
 from PyQt5.QtChart import QChart, QChartView, QBarSeries, QBarSet, QBarCategoryAxis, QValueAxis, QPieSeries, QPieSlice, QLineSeries, QScatterSeries, QHorizontalBarSeries, QAreaSeries
-from src.database.db_manager import DatabaseManager
-from src.utils.helpers import WindowStateManager
+from src.database.data_service import DataService
+from src.reports import (ReportData, build_report_data, AttendanceAggregates, HistoryStore, ReportCache,
+                         UNDEFINED_ROOM)
+from src.database.room_rules import get_room_rules
+from src.utils.logger import get_logger
+from src.utils.workers import Worker
+from src.utils.settings import get_settings
+from src.interface.navigation import NavigationController
+
+logger = get_logger('relatorios')
 
 class KidsTheme:
     """Tema personalizado para gráficos do ministério infantil"""
@@ -175,14 +183,101 @@ class RelatoriosWindow(QMainWindow):
 
     def __init__(self):
         super(RelatoriosWindow, self).__init__()
-        self.db = DatabaseManager()
+        self.db = DataService.get_instance()
         
         # Diretório para armazenar relatórios
         self.reports_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'data', 'reports')
         os.makedirs(self.reports_dir, exist_ok=True)
         
+        # Alterações em sequência (ex.: vários check-ins) geram uma única atualização
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setSingleShot(True)
+        self.refresh_timer.setInterval(300)
+        self.refresh_timer.timeout.connect(self.refreshReport)
+        self.report_stale = False
+
+        # Presenças por dia, sala e criança, atualizadas só com os check-ins novos
+        self.attendance = AttendanceAggregates(os.path.join(self.reports_dir, 'attendance.json'))
+
+        # Resumos históricos: acréscimo de uma linha por alteração, sem reescrever os arquivos
+        self.history = HistoryStore(self.reports_dir)
+
+        # O histórico é gravado quando os dados mudam, nunca ao apenas abrir um relatório.
+        # Um único thread grava (gravações em ordem); a geração descarta gravações pendentes
+        self.history_timer = QTimer(self)
+        self.history_timer.setSingleShot(True)
+        self.history_timer.setInterval(2000)
+        self.history_timer.timeout.connect(self.saveHistory)
+        self.history_pool = QThreadPool(self)
+        self.history_pool.setMaxThreadCount(1)
+        self.history_generation = 0
+
+        # Relatórios já calculados, por (tipo, data, versão dos dados); opcionalmente gravados em disco
+        cache_options = get_settings()['relatorios']
+        self.report_cache = ReportCache(
+            cache_options['cache_resultados'],
+            os.path.join(self.reports_dir, 'report_cache.json') if cache_options['cache_persistente'] else None,
+            encode=ReportData.to_json, decode=ReportData.from_json)
+        # Gravação do cache em disco agrupada: alguns segundos depois do último resultado,
+        # ao fechar a tela e ao sair do aplicativo
+        self.cache_save_timer = QTimer(self)
+        self.cache_save_timer.setSingleShot(True)
+        self.cache_save_timer.setInterval(5000)
+        self.cache_save_timer.timeout.connect(self.saveReportCache)
+        if self.report_cache.file_path:
+            QApplication.instance().aboutToQuit.connect(self.report_cache.save)
+        
+        # Dados de todos os relatórios, calculados uma vez e descartados quando algo muda
+        self.report_data = None
+
+        # Cálculo em segundo plano: cada pedido ganha um número; respostas antigas são descartadas
+        self.report_generation = 0
+
         self.initUI()
         
+        self.db.watch(self,
+                      childAdded=self.onDataChanged,
+                      childUpdated=self.onDataChanged,
+                      childRemoved=self.onDataChanged,
+                      checkinChanged=self.onDataChanged)
+    
+    def closeEvent(self, event):
+        self.report_generation += 1
+        self.db.unwatch(self)
+        # Alterações que ainda aguardavam para entrar no histórico
+        if self.history_timer.isActive():
+            self.history_timer.stop()
+            self.saveHistory()
+        self.cache_save_timer.stop()
+        self.report_cache.save()
+        super(RelatoriosWindow, self).closeEvent(event)
+    
+    def onDataChanged(self, *args):
+        """Agenda a atualização do relatório aberto quando os dados mudam"""
+        # O cálculo em andamento usa dados antigos: cancelar
+        self.report_generation += 1
+        self.report_data = None
+        self.report_cache.invalidate()
+        self.refresh_timer.start()
+        self.history_timer.start()
+    
+    def saveReportCache(self):
+        """Grava o cache de relatórios em disco fora da thread da interface"""
+        QThreadPool.globalInstance().start(Worker(self.report_cache.save))
+    
+    def refreshReport(self):
+        # Tela fora de vista (outra página da navegação): atualiza ao voltar a ela
+        if self.isVisible():
+            self.report_stale = False
+            self.loadReport(self.report_combo.currentIndex())
+        else:
+            self.report_stale = True
+    
+    def showEvent(self, event):
+        super(RelatoriosWindow, self).showEvent(event)
+        if self.report_stale:
+            self.refreshReport()
+        
     def initUI(self):
         # Configurar a janela
         self.setWindowTitle("Relatórios - Ministério Kids")
@@ -360,7 +455,28 @@ class RelatoriosWindow(QMainWindow):
         # Data selecionada (padrão: hoje)
         self.selected_date = datetime.datetime.now().date()
         
+        # Indicador de cálculo em andamento (barra sem fim definido)
+        self.busy_indicator = QProgressBar()
+        self.busy_indicator.setRange(0, 0)
+        self.busy_indicator.setFormat("Calculando...")
+        self.busy_indicator.setTextVisible(True)
+        self.busy_indicator.setMaximumWidth(200)
+        self.busy_indicator.setStyleSheet("""
+            QProgressBar {
+                border: 1px solid #D5E8D4;
+                border-radius: 5px;
+                background-color: white;
+                color: #333333;
+                text-align: center;
+            }
+            QProgressBar::chunk {
+                background-color: #A8D5BA;
+            }
+        """)
+        self.busy_indicator.hide()
+
         buttons_row.addWidget(self.btn_date)
+        buttons_row.addWidget(self.busy_indicator)
         buttons_row.addStretch(1)  # Espaço flexível entre os botões
         buttons_row.addWidget(self.btn_clear)
         buttons_row.addWidget(self.btn_export)
@@ -486,16 +602,8 @@ class RelatoriosWindow(QMainWindow):
         self.loadReport(0)
    
     def voltarMainWindow(self):
-        # Salvar o estado atual da janela
-        window_manager = WindowStateManager.get_instance()
-        window_manager.save_state(self)
-        
-        from src.interface.main_window import MainWindow
-        self.main_window = MainWindow()
-        # Restaurar o estado da janela
-        window_manager.restore_state(self.main_window)
-        self.main_window.show()
-        self.close()
+        # A tela continua construída; apenas volta para a inicial
+        NavigationController.get_instance().go_home()
     
     def selectDate(self):
         """Abre um diálogo para selecionar uma data para o relatório"""
@@ -541,76 +649,151 @@ class RelatoriosWindow(QMainWindow):
             # Recarregar o relatório com a nova data
             self.loadReport(self.report_combo.currentIndex())
     
-    def loadReport(self, index):
-        # Obter tipo de relatório
+    def loadReport(self, index=None):
+        """Calcula o relatório escolhido em segundo plano; o resultado chega em onReportReady"""
         report_type = self.report_combo.currentText()
-        
-        # Carregar o relatório adequado
+
+        # Um novo pedido cancela o que estiver em andamento
+        self.report_generation += 1
+        generation = self.report_generation
+
+        # Mesmo relatório, mesma data e dados inalterados: exibir o resultado guardado
+        cache_key = (report_type, self.selected_date.isoformat(), self.db.data_version())
+        cached = self.report_cache.get(cache_key)
+        if cached is not None:
+            self.setBusy(False)
+            self.report_data = cached
+            self.renderReport(report_type, cached)
+            return
+
+        worker = Worker(self.computeReport, cache_key, self.report_data,
+                        lambda: generation != self.report_generation, tag=generation)
+        worker.signals.result.connect(self.onReportReady)
+        worker.signals.error.connect(self.onReportError)
+        self.setBusy(True)
+        QThreadPool.globalInstance().start(worker)
+
+    def computeReport(self, cache_key, data, is_cancelled):
+        """Executado no QThreadPool: calcula os dados, se preciso (não grava nada).
+
+        Retorna (tipo, dados, check-ins novos) ou None se o pedido foi cancelado no meio.
+        """
+        report_type = cache_key[0]
+        new_checkins = 0
+        if data is None:
+            start = datetime.datetime.now()
+            new_checkins = self.attendance.sync(self.db)
+            if is_cancelled():
+                return None
+            data = build_report_data(self.db.get_all_children(), self.attendance,
+                                     self.db.get_checked_in_children(), is_cancelled=is_cancelled)
+            if data is None:
+                return None
+            logger.debug("Dados dos relatórios calculados em %s", datetime.datetime.now() - start)
+        if is_cancelled():
+            return None
+        self.report_cache.put(cache_key, data)
+        return report_type, data, new_checkins
+
+    def onReportReady(self, generation, result):
+        # Resposta de um pedido já substituído (outro relatório, outra data ou dados novos)
+        if generation != self.report_generation or result is None:
+            return
+        self.setBusy(False)
+        report_type, data, new_checkins = result
+        self.report_data = data
+        self.renderReport(report_type, data)
+        # Check-ins feitos com esta tela fechada ainda não estão no histórico
+        if new_checkins:
+            self.history_timer.start()
+        if self.report_cache.file_path:
+            self.cache_save_timer.start()
+
+    def onReportError(self, generation, message):
+        if generation != self.report_generation:
+            return
+        self.setBusy(False)
+        QMessageBox.critical(
+            self,
+            "Erro",
+            f"Erro ao gerar o relatório: {message}",
+            QMessageBox.Ok
+        )
+
+    def setBusy(self, busy):
+        self.busy_indicator.setVisible(busy)
+        if busy:
+            self.setCursor(Qt.BusyCursor)
+        else:
+            self.unsetCursor()
+
+    def renderReport(self, report_type, data):
+        """Exibe na tabela e no gráfico o relatório já calculado"""
         if report_type == "Número total de crianças no culto":
-            self.loadTotalChildrenReport()
+            self.loadTotalChildrenReport(data)
         elif report_type == "Número por faixa etária":
-            self.loadAgeGroupReport()
+            self.loadAgeGroupReport(data)
         elif report_type == "Frequência":
-            self.loadFrequencyReport()
-        elif report_type == "Crianças Cadastradas":  # Nova condição
-            self.loadRegisteredChildrenReport()
+            self.loadFrequencyReport(data)
+        elif report_type == "Crianças Cadastradas":
+            self.loadRegisteredChildrenReport(data)
         elif report_type == "Visitantes":
-            self.loadVisitorsReport()
+            self.loadVisitorsReport(data)
         elif report_type == "Aniversariantes do mês":
-            self.loadBirthdayReport()
+            self.loadBirthdayReport(data)
         elif report_type == "Crianças com alergias ou restrições":
-            self.loadAllergiesReport()
+            self.loadAllergiesReport(data)
         elif report_type == "Famílias que pediram visitas ou conversas":
-            self.loadVisitRequestsReport()
+            self.loadVisitRequestsReport(data)
+
+    def saveHistory(self):
+        """Grava em segundo plano os resumos históricos com os dados atuais"""
+        generation = self.history_generation
+        worker = Worker(self.recordHistory, self.report_data, datetime.date.today(),
+                        lambda: generation != self.history_generation, tag=generation)
+        worker.signals.error.connect(self.onHistoryError)
+        self.history_pool.start(worker)
+
+    def recordHistory(self, data, day, is_cancelled):
+        """Executado no history_pool: grava os resumos e relatórios detalhados do dia.
+
+        Só o que mudou é escrito (ver ``HistoryStore``).
+        """
+        if data is None:
+            self.attendance.sync(self.db)
+            data = build_report_data(self.db.get_all_children(), self.attendance,
+                                     self.db.get_checked_in_children(), is_cancelled=is_cancelled)
+            if data is None:
+                return
+        if is_cancelled():
+            return
+        date_str = day.strftime("%Y-%m-%d")
+        self.saveAgeGroupHistoricalData(data.age_groups, date_str)
+        self.saveFrequencyHistoricalData(data.frequency)
+        self.saveRegisteredChildrenHistoricalData(data.registered, data.registered_by_room)
+        self.saveVisitorsHistoricalData(data.visitors, data.member_count, date_str)
+        self.saveBirthdayHistoricalData(data.birthdays_in(day.month), day.month, day.strftime("%B"))
+        self.saveAllergiesHistoricalData(data.health_counts, date_str)
+        self.saveVisitRequestsHistoricalData(data.visit_request_counts, date_str)
+
+    def onHistoryError(self, generation, message):
+        logger.error("Erro ao gravar o histórico dos relatórios: %s", message)
     
-    def loadTotalChildrenReport(self):
+    def loadTotalChildrenReport(self, data):
         # Obter dados do dia atual
         date_str = self.selected_date.strftime("%Y-%m-%d")
         
-        # Verificar se há dados de check-in para a data selecionada
-        # Primeiro, vamos tentar obter diretamente do banco de dados
-        checked_in_children = []
-        
-        # Tentar obter check-ins do dia atual
-        try:
-            # Verificar se o arquivo de check-ins existe
-            if os.path.exists(self.db.checkins_file):
-                with open(self.db.checkins_file, 'r', newline='', encoding='utf-8') as f:
-                    reader = csv.DictReader(f)
-                    for row in reader:
-                        # Verificar se a data do check-in corresponde à data selecionada
-                        checkin_date = datetime.datetime.strptime(row['data_checkin'], "%Y-%m-%d %H:%M:%S").date()
-                        selected_date = self.selected_date
-                        
-                        if checkin_date == selected_date:
-                            checked_in_children.append(row)
-                            print(f"Encontrado check-in para a data {selected_date}: {row['nome']}")
-        except Exception as e:
-            print(f"Erro ao ler check-ins: {e}")
-        
-        total_children = len(checked_in_children)
-        print(f"Total de crianças encontradas para a data {date_str}: {total_children}")
-        
-        # Carregar dados históricos se disponíveis
-        report_file = os.path.join(self.reports_dir, 'total_children.csv')
-        historical_data = self.loadHistoricalData(report_file)
-        
-        # Adicionar dados atuais se ainda não existirem para a data selecionada
-        date_exists = False
-        for entry in historical_data:
-            if entry[0] == date_str:
-                date_exists = True
-                break
+        # Check-ins da data selecionada
+        total_children = data.checkins_on(self.selected_date)
+        logger.debug("Total de crianças encontradas para a data %s: %s", date_str, total_children)
         
-        if not date_exists and total_children > 0:
-            historical_data.append([date_str, str(total_children)])
-            self.saveHistoricalData(report_file, historical_data)
+        # Histórico: todos os dias com check-in, dos totais materializados
+        historical_data = [[date.strftime("%Y-%m-%d"), str(count)]
+                           for date, count in data.checkins_by_date.items()]
         
-        # Se não houver dados históricos e não houver check-ins para hoje,
-        # adicionar uma entrada com zero para mostrar algo na tabela
+        # Sem nenhum check-in registrado, mostrar a data selecionada com zero
         if not historical_data:
             historical_data.append([date_str, "0"])
-            self.saveHistoricalData(report_file, historical_data)
         
         # Configurar tabela
         self.table.setRowCount(len(historical_data))
@@ -713,64 +896,10 @@ class RelatoriosWindow(QMainWindow):
 
         self.chart_view.setChart(chart)
     
-    def loadAgeGroupReport(self):
-        # Obter dados
-        checked_in_children = self.db.get_checked_in_children()
-        
-        # Adicionar mensagens de debug
-        print(f"Total de crianças encontradas: {len(checked_in_children)}")
-        
-        # Contar por faixa etária
-        age_groups = {
-            "Berçário (0-2)": 0,
-            "Infantil 1 (3)": 0,
-            "Infantil 2 (4-5)": 0,
-            "Infantil 3 (6-7)": 0,
-            "Infantil 4 (8-10)": 0,
-            "Juniores (11+)": 0
-        }
-        
-        # Verificar se há crianças
-        if not checked_in_children:
-            print("Nenhuma criança encontrada em check-in.")
-            
-            # Se não houver crianças em check-in, tentar obter todas as crianças cadastradas
-            all_children = self.db.get_all_children()
-            print(f"Total de crianças cadastradas: {len(all_children)}")
-            
-            # Usar todas as crianças cadastradas se não houver check-ins
-            if all_children:
-                checked_in_children = all_children
-        
-        # Contar crianças por faixa etária
-        for child in checked_in_children:
-            try:
-                # Tentar converter idade para inteiro
-                age = int(child.get('idade', 0))
-                print(f"Processando criança: {child.get('nome', 'Sem nome')} - Idade: {age}")
-                
-                if age <= 2:
-                    age_groups["Berçário (0-2)"] += 1
-                elif age == 3:
-                    age_groups["Infantil 1 (3)"] += 1
-                elif age <= 5:
-                    age_groups["Infantil 2 (4-5)"] += 1
-                elif age <= 7:
-                    age_groups["Infantil 3 (6-7)"] += 1
-                elif age <= 10:
-                    age_groups["Infantil 4 (8-10)"] += 1
-                else:
-                    age_groups["Juniores (11+)"] += 1
-            except (ValueError, TypeError) as e:
-                # Se a idade não for um número válido, imprimir mensagem de erro
-                print(f"Erro ao processar idade da criança {child.get('nome', 'Sem nome')}: {e}")
-                print(f"Valor da idade: {child.get('idade', 'Não definido')} - Tipo: {type(child.get('idade', None))}")
-                continue
-        
-        # Imprimir contagem por faixa etária
-        for group, count in age_groups.items():
-            print(f"{group}: {count}")
-        
+    def loadAgeGroupReport(self, data):
+        # Crianças em check-in por faixa etária (ou todas as cadastradas, se ninguém estiver em check-in)
+        age_groups = dict(data.age_groups)
+
         # Configurar tabela
         self.table.setRowCount(len(age_groups))
         self.table.setColumnCount(2)
@@ -878,29 +1007,12 @@ class RelatoriosWindow(QMainWindow):
         # Definir o gráfico no QChartView
         self.chart_view.setChart(chart)
 
-        # Salvar dados históricos
-        report_file = os.path.join(self.reports_dir, 'age_groups.csv')
-        date_str = self.selected_date.strftime("%Y-%m-%d")
+    def saveAgeGroupHistoricalData(self, age_groups, date_str):
+        """Salva a contagem por faixa etária da data no histórico (se ainda não houver)"""
+        if any(count > 0 for count in age_groups.values()):
+            self.history.add('age_groups.csv', ["Data"] + list(age_groups.keys()),
+                             date_str, list(age_groups.values()))
 
-        # Verificar se já existe um relatório para esta data
-        historical_data = self.loadHistoricalData(report_file)
-
-        # Procurar por dados da data selecionada
-        data_for_date = None
-        for i, row in enumerate(historical_data):
-            if row[0] == date_str:
-                data_for_date = row
-                break
-
-        # Se não existir, adicionar os dados atuais
-        if not data_for_date and has_data:
-            new_row = [date_str]
-            for group, count in age_groups.items():
-                new_row.append(str(count))
-            historical_data.append(new_row)
-            self.saveHistoricalData(report_file, historical_data, 
-                                headers=["Data"] + list(age_groups.keys()))
-            
     def highlightPieSlice(self, state, slice):
         """Destaca ou remove o destaque de um slice quando o mouse passa sobre ele"""
         if state:
@@ -912,98 +1024,24 @@ class RelatoriosWindow(QMainWindow):
             slice.setExplodeDistanceFactor(0.08)  # Volta ao normal
             slice.setLabelFont(QFont("Arial", 9, QFont.Bold))  # Volta ao normal
     
-    def loadFrequencyReport(self):
+    def loadFrequencyReport(self, data):
         """Carrega o relatório de frequência das crianças"""
-        print("Carregando relatório de frequência...")
-        
-        # Obter todas as crianças cadastradas
-        all_children = self.db.get_all_children()
-        print(f"Total de crianças cadastradas: {len(all_children)}")
-        
-        # Criar um dicionário para armazenar as frequências por criança
-        frequency_data = {}
-        
-        # Verificar se o arquivo de check-ins existe
-        if os.path.exists(self.db.checkins_file):
-            try:
-                # Ler todos os check-ins
-                with open(self.db.checkins_file, 'r', newline='', encoding='utf-8') as f:
-                    reader = csv.DictReader(f)
-                    for row in reader:
-                        child_name = row.get('nome', '')
-                        if child_name:
-                            # Inicializar o registro se ainda não existir
-                            if child_name not in frequency_data:
-                                frequency_data[child_name] = {
-                                    'count': 0,
-                                    'dates': set(),  # Conjunto para evitar contar dias duplicados
-                                    'sala': row.get('sala', '')
-                                }
-                            
-                            # Extrair a data do check-in (ignorando a hora)
-                            try:
-                                checkin_date = datetime.datetime.strptime(
-                                    row.get('data_checkin', ''), 
-                                    "%Y-%m-%d %H:%M:%S"
-                                ).strftime("%Y-%m-%d")
-                                
-                                # Adicionar a data ao conjunto de datas
-                                frequency_data[child_name]['dates'].add(checkin_date)
-                                
-                                # Atualizar a sala (usar a mais recente)
-                                frequency_data[child_name]['sala'] = row.get('sala', '')
-                            except Exception as e:
-                                print(f"Erro ao processar data de check-in: {e}")
-                
-                # Calcular o total de frequências (número de dias diferentes)
-                for name in frequency_data:
-                    frequency_data[name]['count'] = len(frequency_data[name]['dates'])
-                
-                print(f"Dados de frequência processados para {len(frequency_data)} crianças")
-            except Exception as e:
-                print(f"Erro ao ler arquivo de check-ins: {e}")
-        
-        # Preparar dados para a tabela
-        table_data = []
-        for child in all_children:
-            name = child.get('nome', '')
-            # Obter dados de frequência se disponíveis
-            frequency = frequency_data.get(name, {'count': 0, 'sala': ''})
-            
-            # Determinar status (membro ou visitante)
-            status = "Visitante" if child.get('visitante', 'Não') == 'Sim' else "Membro"
-            
-            # Determinar sala com base nos dados de frequência ou na idade
-            sala = frequency.get('sala', '')
-            if not sala:
-                try:
-                    age = int(child.get('idade', 0))
-                    sala = self.db._get_sala_by_age(age)
-                except:
-                    sala = "Não definida"
-            
-            # Adicionar à lista de dados
-            table_data.append({
-                'nome': name,
-                'frequencia': frequency.get('count', 0),
-                'status': status,
-                'sala': sala
-            })
-        
-        # Ordenar por frequência (decrescente) e depois por nome
-        table_data.sort(key=lambda x: (-x['frequencia'], x['nome']))
+        logger.debug("Carregando relatório de frequência...")
         
+        # Dias diferentes com check-in de cada criança, da maior para a menor frequência
+        table_data = data.frequency
+
         # Configurar tabela
         self.table.setRowCount(len(table_data))
         self.table.setColumnCount(4)
         self.table.setHorizontalHeaderLabels(["Nome", "Frequência", "Status", "Sala"])
         
         # Adicionar dados à tabela
-        for i, data in enumerate(table_data):
-            name_item = QTableWidgetItem(data['nome'])
-            freq_item = QTableWidgetItem(str(data['frequencia']))
-            status_item = QTableWidgetItem(data['status'])
-            sala_item = QTableWidgetItem(data['sala'])
+        for i, row in enumerate(table_data):
+            name_item = QTableWidgetItem(row.nome)
+            freq_item = QTableWidgetItem(str(row.frequencia))
+            status_item = QTableWidgetItem(row.status)
+            sala_item = QTableWidgetItem(row.sala)
             
             # Alinhar ao centro
             freq_item.setTextAlignment(Qt.AlignCenter)
@@ -1011,11 +1049,11 @@ class RelatoriosWindow(QMainWindow):
             sala_item.setTextAlignment(Qt.AlignCenter)
             
             # Destacar visitantes
-            if data['status'] == "Visitante":
+            if row.status == "Visitante":
                 status_item.setBackground(QBrush(QColor("#FFE6CC")))
             
             # Destacar crianças com alta frequência (mais de 3 presenças)
-            if data['frequencia'] > 3:
+            if row.frequencia > 3:
                 freq_item.setBackground(QBrush(QColor("#E5F0EA")))
             
             self.table.setItem(i, 0, name_item)
@@ -1023,262 +1061,163 @@ class RelatoriosWindow(QMainWindow):
             self.table.setItem(i, 2, status_item)
             self.table.setItem(i, 3, sala_item)
 
-            # Ajustar colunas
-            self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        # Ajustar colunas
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
 
-            # Criar gráfico
-            chart = QChart()
-            chart.setTitle("Frequência por Criança")
-            chart.setAnimationOptions(QChart.SeriesAnimations)
-            chart.setAnimationDuration(1200)  # Animação mais longa para efeito visual
-
-            # Definir estilo do título
-            title_font = QFont("Arial", 12, QFont.Bold)
-            chart.setTitleFont(title_font)
-            chart.setTitleBrush(QBrush(QColor("#5D9B7C")))  # Verde escuro
-
-            # Definir fundo do gráfico com gradiente
-            background_gradient = QLinearGradient()
-            background_gradient.setStart(0, 0)
-            background_gradient.setFinalStop(0, 1)
-            background_gradient.setColorAt(0.0, QColor(255, 255, 255))
-            background_gradient.setColorAt(1.0, QColor(240, 249, 245))
-            chart.setBackgroundBrush(QBrush(background_gradient))
-
-            # Adicionar borda ao gráfico
-            chart.setBackgroundPen(QPen(QColor("#D5E8D4"), 2))
-
-            # Verificar se há dados para exibir
-            if table_data:
-                # Selecionar as 10 crianças com maior frequência para o gráfico
-                top_children = sorted(table_data, key=lambda x: -x['frequencia'])[:10]
-                
-                # Criar série de barras
-                categories = []
-                
-                # Definir uma paleta de cores para as barras
-                colors = [
-                    QColor("#A8D5BA"),  # Verde claro
-                    QColor("#FFB7B2"),  # Salmão
-                    QColor("#FFDAC1"),  # Pêssego
-                    QColor("#E2F0CB"),  # Verde claro
-                    QColor("#B5EAD7"),  # Menta
-                    QColor("#C7CEEA"),  # Lavanda
-                    QColor("#F2D5F8"),  # Lilás
-                    QColor("#FCF6BD"),  # Amarelo claro
-                    QColor("#A2D2FF"),  # Azul claro
-                    QColor("#BDE0FE")   # Azul bebê
-                ]
-                
-                # Criar múltiplos barsets para usar cores diferentes
-                bar_sets = []
-                
-                for i, child in enumerate(top_children):
-                    if child['frequencia'] > 0:  # Incluir apenas crianças com frequência
-                        # Criar um barset individual para cada criança para usar cores diferentes
-                        bar_set = QBarSet(child['nome'])
-                        bar_set.append(child['frequencia'])
-                        
-                        # Definir cor personalizada
-                        bar_set.setColor(colors[i % len(colors)])
-                        bar_set.setBorderColor(Qt.white)  # Borda branca para destacar
-                        bar_set.setLabelColor(QColor("#333333"))
-                        
-                        bar_sets.append(bar_set)
-                        categories.append(child['nome'])
-                
-                # Se não houver crianças com frequência, mostrar mensagem
-                if not categories:
-                    no_data_series = QPieSeries()
-                    slice = no_data_series.append("Sem dados", 1)
-                    slice.setLabelVisible(True)
-                    slice.setLabelColor(QColor("#333333"))
-                    slice.setBrush(QBrush(QColor("#E0E0E0")))  # Cinza claro
-                    chart.addSeries(no_data_series)
-                    chart.setTitle("Não há dados de frequência disponíveis")
-                else:
-                    # Criar série de barras horizontais
-                    bar_series = QHorizontalBarSeries()
-                    
-                    # Adicionar todos os barsets
-                    for bar_set in bar_sets:
-                        bar_series.append(bar_set)
-                    
-                    # Configurar a série
-                    bar_series.setLabelsVisible(True)  # Mostrar rótulos
-                    bar_series.setLabelsPosition(QAbstractBarSeries.LabelsInsideEnd)  # Posição dos rótulos
-                    bar_series.setLabelsFormat("@value")  # Formato dos rótulos
-                    
-                    chart.addSeries(bar_series)
-                    
-                    # Configurar eixos
-                    axis_y = QBarCategoryAxis()
-                    axis_y.append(categories)
-                    axis_y.setLabelsColor(QColor("#333333"))  # Cor do texto
-                    axis_y.setGridLineVisible(False)  # Remover linhas de grade
-                    chart.addAxis(axis_y, Qt.AlignLeft)
-                    bar_series.attachAxis(axis_y)
-                    
-                    axis_x = QValueAxis()
-                    max_freq = max([child['frequencia'] for child in top_children]) if top_children else 1
-                    axis_x.setRange(0, max_freq + 1)
-                    axis_x.setTickCount(max_freq + 2)
-                    axis_x.setLabelFormat("%d")  # Formato dos números
-                    axis_x.setLabelsColor(QColor("#333333"))  # Cor do texto
-                    axis_x.setTitleText("Número de Presenças")  # Título do eixo
-                    axis_x.setTitleFont(QFont("Arial", 10, QFont.Bold))
-                    axis_x.setTitleBrush(QBrush(QColor("#5D9B7C")))  # Verde escuro
-                    chart.addAxis(axis_x, Qt.AlignBottom)
-                    bar_series.attachAxis(axis_x)
+        # Criar gráfico
+        chart = QChart()
+        chart.setTitle("Frequência por Criança")
+        chart.setAnimationOptions(QChart.SeriesAnimations)
+        chart.setAnimationDuration(1200)  # Animação mais longa para efeito visual
+
+        # Definir estilo do título
+        title_font = QFont("Arial", 12, QFont.Bold)
+        chart.setTitleFont(title_font)
+        chart.setTitleBrush(QBrush(QColor("#5D9B7C")))  # Verde escuro
+
+        # Definir fundo do gráfico com gradiente
+        background_gradient = QLinearGradient()
+        background_gradient.setStart(0, 0)
+        background_gradient.setFinalStop(0, 1)
+        background_gradient.setColorAt(0.0, QColor(255, 255, 255))
+        background_gradient.setColorAt(1.0, QColor(240, 249, 245))
+        chart.setBackgroundBrush(QBrush(background_gradient))
+
+        # Adicionar borda ao gráfico
+        chart.setBackgroundPen(QPen(QColor("#D5E8D4"), 2))
+
+        # Verificar se há dados para exibir
+        if table_data:
+            # Selecionar as 10 crianças com maior frequência para o gráfico
+            top_children = table_data[:10]
+            
+            # Criar série de barras
+            categories = []
+            
+            # Definir uma paleta de cores para as barras
+            colors = [
+                QColor("#A8D5BA"),  # Verde claro
+                QColor("#FFB7B2"),  # Salmão
+                QColor("#FFDAC1"),  # Pêssego
+                QColor("#E2F0CB"),  # Verde claro
+                QColor("#B5EAD7"),  # Menta
+                QColor("#C7CEEA"),  # Lavanda
+                QColor("#F2D5F8"),  # Lilás
+                QColor("#FCF6BD"),  # Amarelo claro
+                QColor("#A2D2FF"),  # Azul claro
+                QColor("#BDE0FE")   # Azul bebê
+            ]
+            
+            # Criar múltiplos barsets para usar cores diferentes
+            bar_sets = []
+            
+            for i, child in enumerate(top_children):
+                if child.frequencia > 0:  # Incluir apenas crianças com frequência
+                    # Criar um barset individual para cada criança para usar cores diferentes
+                    bar_set = QBarSet(child.nome)
+                    bar_set.append(child.frequencia)
                     
-                    # Configurar legenda
-                    chart.legend().setVisible(True)
-                    chart.legend().setAlignment(Qt.AlignBottom)
-                    chart.legend().setFont(QFont("Arial", 9))
-                    chart.legend().setLabelColor(QColor("#333333"))
+                    # Definir cor personalizada
+                    bar_set.setColor(colors[i % len(colors)])
+                    bar_set.setBorderColor(Qt.white)  # Borda branca para destacar
+                    bar_set.setLabelColor(QColor("#333333"))
                     
-                    # Se houver muitas crianças, ajustar o layout da legenda
-                    if len(categories) > 5:
-                        chart.legend().setMarkerShape(QLegend.MarkerShapeCircle)
-                        chart.legend().setAlignment(Qt.AlignRight)
-            else:
-                # Se não houver dados, mostrar mensagem
+                    bar_sets.append(bar_set)
+                    categories.append(child.nome)
+            
+            # Se não houver crianças com frequência, mostrar mensagem
+            if not categories:
                 no_data_series = QPieSeries()
                 slice = no_data_series.append("Sem dados", 1)
                 slice.setLabelVisible(True)
                 slice.setLabelColor(QColor("#333333"))
                 slice.setBrush(QBrush(QColor("#E0E0E0")))  # Cinza claro
                 chart.addSeries(no_data_series)
-                chart.setTitle("Não há dados disponíveis para exibição")
-
-            # Definir o gráfico no QChartView
-            self.chart_view.setChart(chart)
+                chart.setTitle("Não há dados de frequência disponíveis")
+            else:
+                # Criar série de barras horizontais
+                bar_series = QHorizontalBarSeries()
+                
+                # Adicionar todos os barsets
+                for bar_set in bar_sets:
+                    bar_series.append(bar_set)
+                
+                # Configurar a série
+                bar_series.setLabelsVisible(True)  # Mostrar rótulos
+                bar_series.setLabelsPosition(QAbstractBarSeries.LabelsInsideEnd)  # Posição dos rótulos
+                bar_series.setLabelsFormat("@value")  # Formato dos rótulos
+                
+                chart.addSeries(bar_series)
+                
+                # Configurar eixos
+                axis_y = QBarCategoryAxis()
+                axis_y.append(categories)
+                axis_y.setLabelsColor(QColor("#333333"))  # Cor do texto
+                axis_y.setGridLineVisible(False)  # Remover linhas de grade
+                chart.addAxis(axis_y, Qt.AlignLeft)
+                bar_series.attachAxis(axis_y)
+                
+                axis_x = QValueAxis()
+                max_freq = max(child.frequencia for child in top_children) if top_children else 1
+                axis_x.setRange(0, max_freq + 1)
+                axis_x.setTickCount(max_freq + 2)
+                axis_x.setLabelFormat("%d")  # Formato dos números
+                axis_x.setLabelsColor(QColor("#333333"))  # Cor do texto
+                axis_x.setTitleText("Número de Presenças")  # Título do eixo
+                axis_x.setTitleFont(QFont("Arial", 10, QFont.Bold))
+                axis_x.setTitleBrush(QBrush(QColor("#5D9B7C")))  # Verde escuro
+                chart.addAxis(axis_x, Qt.AlignBottom)
+                bar_series.attachAxis(axis_x)
+                
+                # Configurar legenda
+                chart.legend().setVisible(True)
+                chart.legend().setAlignment(Qt.AlignBottom)
+                chart.legend().setFont(QFont("Arial", 9))
+                chart.legend().setLabelColor(QColor("#333333"))
+                
+                # Se houver muitas crianças, ajustar o layout da legenda
+                if len(categories) > 5:
+                    chart.legend().setMarkerShape(QLegend.MarkerShapeCircle)
+                    chart.legend().setAlignment(Qt.AlignRight)
+        else:
+            # Se não houver dados, mostrar mensagem
+            no_data_series = QPieSeries()
+            slice = no_data_series.append("Sem dados", 1)
+            slice.setLabelVisible(True)
+            slice.setLabelColor(QColor("#333333"))
+            slice.setBrush(QBrush(QColor("#E0E0E0")))  # Cinza claro
+            chart.addSeries(no_data_series)
+            chart.setTitle("Não há dados disponíveis para exibição")
 
-            # Salvar dados históricos
-            self.saveFrequencyHistoricalData(table_data)
+        # Definir o gráfico no QChartView
+        self.chart_view.setChart(chart)
 
     def saveFrequencyHistoricalData(self, table_data):
         """Salva dados históricos de frequência"""
         try:
-            # Criar diretório para relatórios detalhados
-            detailed_reports_dir = os.path.join(self.reports_dir, 'detailed')
-            os.makedirs(detailed_reports_dir, exist_ok=True)
-            
-            # Nome do arquivo baseado na data atual
             date_str = datetime.datetime.now().strftime("%Y-%m-%d")
-            report_file = os.path.join(detailed_reports_dir, f'frequency_{date_str}.csv')
-            
-            # Salvar dados detalhados
-            with open(report_file, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.DictWriter(f, fieldnames=['nome', 'frequencia', 'status', 'sala'])
-                writer.writeheader()
-                writer.writerows(table_data)
-            
-            print(f"Dados de frequência salvos em {report_file}")
-            
-            # Também salvar um resumo para o gráfico de tendência
-            summary_file = os.path.join(self.reports_dir, 'frequency_summary.csv')
-            
-            # Calcular totais
-            total_members = sum(1 for item in table_data if item['status'] == "Membro")
-            total_visitors = sum(1 for item in table_data if item['status'] == "Visitante")
-            total_attendance = sum(item['frequencia'] for item in table_data)
-            
-            # Carregar dados históricos existentes
-            historical_data = []
-            if os.path.exists(summary_file):
-                with open(summary_file, 'r', newline='', encoding='utf-8') as f:
-                    reader = csv.reader(f)
-                    headers = next(reader, None)  # Pular cabeçalho
-                    historical_data = list(reader)
-            
-            # Verificar se já existe um registro para a data atual
-            date_exists = False
-            for i, row in enumerate(historical_data):
-                if row[0] == date_str:
-                    # Atualizar registro existente
-                    historical_data[i] = [date_str, str(total_members), str(total_visitors), str(total_attendance)]
-                    date_exists = True
-                    break
-            
-            # Adicionar novo registro se não existir
-            if not date_exists:
-                historical_data.append([date_str, str(total_members), str(total_visitors), str(total_attendance)])
-            
-            # Salvar dados resumidos
-            with open(summary_file, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                writer.writerow(['Data', 'Membros', 'Visitantes', 'Total Presenças'])
-                writer.writerows(historical_data)
-            
-            print(f"Resumo de frequência salvo em {summary_file}")
+
+            # Dados detalhados
+            self.history.write_snapshot(
+                f'frequency_{date_str}.csv',
+                ['nome', 'frequencia', 'status', 'sala'],
+                [[row.nome, row.frequencia, row.status, row.sala] for row in table_data])
+
+            # Resumo para o gráfico de tendência
+            total_members = sum(1 for item in table_data if item.status == "Membro")
+            total_visitors = sum(1 for item in table_data if item.status == "Visitante")
+            total_attendance = sum(item.frequencia for item in table_data)
+            self.history.upsert('frequency_summary.csv', ['Data', 'Membros', 'Visitantes', 'Total Presenças'],
+                                date_str, [total_members, total_visitors, total_attendance])
         except Exception as e:
-            print(f"Erro ao salvar dados históricos de frequência: {e}")
-    
-    def loadVisitorsReport(self):
+            logger.error("Erro ao salvar dados históricos de frequência: %s", e)
+
+    def loadVisitorsReport(self, data):
         """Carrega o relatório de visitantes"""
-        print("Carregando relatório de visitantes...")
-        
-        # Obter todas as crianças cadastradas
-        all_children = self.db.get_all_children()
-        print(f"Total de crianças cadastradas: {len(all_children)}")
-        
-        # Imprimir estrutura dos dados para debug
-        if all_children:
-            print("Estrutura dos dados das crianças:")
-            for key in all_children[0].keys():
-                print(f"  - {key}")
-        
-        # Filtrar apenas visitantes
-        visitors = []
-        for child in all_children:
-            is_visitor = child.get('visitante', '').lower() == 'sim' or child.get('visitante') is True
-            
-            if is_visitor:
-                # Imprimir dados completos do visitante para debug
-                print(f"\nDados completos do visitante: {child.get('nome', 'Sem nome')}")
-                for key, value in child.items():
-                    print(f"  {key}: {value}")
-                
-                # Verificar todos os campos possíveis para o telefone
-                telefone = child.get('telefone', '')
-                
-                # Verificar se o telefone está em um campo None
-                for key, value in child.items():
-                    if key is None and value:
-                        print(f"  Encontrado valor em campo None: {value}")
-                        if isinstance(value, list) and value:
-                            telefone = value[0]
-                        elif isinstance(value, str) and value:
-                            telefone = value
-                
-                # Determinar o responsável
-                responsavel = child.get('responsavel', '')
-                if not responsavel:
-                    mae = child.get('mae', '')
-                    pai = child.get('pai', '')
-                    outro_responsavel = child.get('outro_responsavel', '')
-                    responsavel = outro_responsavel or mae or pai or 'Não informado'
-                
-                # Obter data de cadastro
-                data_cadastro = child.get('data_cadastro', 'Não informada')
-                
-                # Adicionar à lista de visitantes
-                visitors.append({
-                    'nome': child.get('nome', 'Sem nome'),
-                    'idade': child.get('idade', 'Não informada'),
-                    'responsavel': responsavel,
-                    'telefone': telefone or 'Não informado',
-                    'data_cadastro': data_cadastro,
-                    'observacoes': child.get('observacoes', '')
-                })
-        
-        print(f"Total de visitantes encontrados: {len(visitors)}")
-        
-        # Imprimir detalhes dos visitantes para debug
-        for visitor in visitors:
-            print(f"Visitante: {visitor['nome']} - Telefone: {visitor['telefone']} - Data: {visitor['data_cadastro']}")
-        
+        logger.debug("Carregando relatório de visitantes...")
+
+        visitors = data.visitors
+
         # Configurar tabela
         self.table.setRowCount(len(visitors))
         self.table.setColumnCount(5)
@@ -1286,11 +1225,11 @@ class RelatoriosWindow(QMainWindow):
         
         # Adicionar dados à tabela
         for i, visitor in enumerate(visitors):
-            name_item = QTableWidgetItem(visitor['nome'])
-            age_item = QTableWidgetItem(visitor['idade'])
-            resp_item = QTableWidgetItem(visitor['responsavel'])
-            phone_item = QTableWidgetItem(visitor['telefone'])
-            date_item = QTableWidgetItem(visitor['data_cadastro'])
+            name_item = QTableWidgetItem(visitor.nome)
+            age_item = QTableWidgetItem(visitor.idade)
+            resp_item = QTableWidgetItem(visitor.responsavel)
+            phone_item = QTableWidgetItem(visitor.telefone)
+            date_item = QTableWidgetItem(visitor.data_cadastro)
             
             # Alinhar ao centro
             age_item.setTextAlignment(Qt.AlignCenter)
@@ -1298,8 +1237,8 @@ class RelatoriosWindow(QMainWindow):
             date_item.setTextAlignment(Qt.AlignCenter)
             
             # Definir tooltip para mostrar observações se houver
-            if visitor['observacoes']:
-                name_item.setToolTip(visitor['observacoes'])
+            if visitor.observacoes:
+                name_item.setToolTip(visitor.observacoes)
             
             self.table.setItem(i, 0, name_item)
             self.table.setItem(i, 1, age_item)
@@ -1307,247 +1246,138 @@ class RelatoriosWindow(QMainWindow):
             self.table.setItem(i, 3, phone_item)
             self.table.setItem(i, 4, date_item)
         
-            # Ajustar colunas
+        # Ajustar colunas
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+
+        # Se não houver visitantes, mostrar mensagem na tabela
+        if not visitors:
+            self.table.setRowCount(1)
+            self.table.setColumnCount(1)
+            self.table.setHorizontalHeaderLabels(["Mensagem"])
+            
+            message_item = QTableWidgetItem("Não há visitantes cadastrados")
+            message_item.setTextAlignment(Qt.AlignCenter)
+            self.table.setItem(0, 0, message_item)
             self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
 
-            # Se não houver visitantes, mostrar mensagem na tabela
-            if not visitors:
-                self.table.setRowCount(1)
-                self.table.setColumnCount(1)
-                self.table.setHorizontalHeaderLabels(["Mensagem"])
-                
-                message_item = QTableWidgetItem("Não há visitantes cadastrados")
-                message_item.setTextAlignment(Qt.AlignCenter)
-                self.table.setItem(0, 0, message_item)
-                self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-
-            # Criar gráfico
-            chart = QChart()
-            chart.setTitle("Visitantes vs. Membros")
-            chart.setAnimationOptions(QChart.SeriesAnimations)
-            chart.setAnimationDuration(1500)  # Duração da animação em milissegundos
-
-            # Definir estilo do título
-            title_font = QFont("Arial", 12, QFont.Bold)
-            chart.setTitleFont(title_font)
-            chart.setTitleBrush(QBrush(QColor("#5D9B7C")))  # Verde escuro
-
-            # Definir fundo do gráfico com gradiente
-            background_gradient = QLinearGradient()
-            background_gradient.setStart(0, 0)
-            background_gradient.setFinalStop(0, 1)
-            background_gradient.setColorAt(0.0, QColor(255, 255, 255))
-            background_gradient.setColorAt(1.0, QColor(240, 249, 245))
-            chart.setBackgroundBrush(QBrush(background_gradient))
-
-            # Adicionar borda ao gráfico
-            chart.setBackgroundPen(QPen(QColor("#D5E8D4"), 2))
-
-            # Contar visitantes e membros
-            total_children = len(all_children)
-            visitor_count = len(visitors)
-            member_count = total_children - visitor_count
-
-            # Verificar se há dados para exibir
-            if total_children > 0:
-                # Gráfico de pizza
-                pie_series = QPieSeries()
-                
-                if member_count > 0:
-                    member_slice = pie_series.append(f"Membros ({member_count})", member_count)
-                    member_slice.setLabelVisible(True)
-                    member_slice.setLabelColor(QColor("#333333"))
-                    member_slice.setLabelFont(QFont("Arial", 10, QFont.Bold))
-                    member_slice.setBrush(QBrush(QColor("#A8D5BA")))  # Verde claro
-                    member_slice.setPen(QPen(Qt.white, 2))  # Borda branca
-                    
-                    # Adicionar efeito de explosão
-                    member_slice.setExploded(True)
-                    member_slice.setExplodeDistanceFactor(0.05)
-                
-                if visitor_count > 0:
-                    visitor_slice = pie_series.append(f"Visitantes ({visitor_count})", visitor_count)
-                    visitor_slice.setLabelVisible(True)
-                    visitor_slice.setLabelColor(QColor("#333333"))
-                    visitor_slice.setLabelFont(QFont("Arial", 10, QFont.Bold))
-                    visitor_slice.setBrush(QBrush(QColor("#FFB7B2")))  # Rosa salmão
-                    visitor_slice.setPen(QPen(Qt.white, 2))  # Borda branca
-                    
-                    # Adicionar efeito de explosão
-                    visitor_slice.setExploded(True)
-                    visitor_slice.setExplodeDistanceFactor(0.1)  # Destacar mais os visitantes
-                
-                chart.addSeries(pie_series)
-                
-                # Adicionar legenda
-                chart.legend().setVisible(True)
-                chart.legend().setAlignment(Qt.AlignBottom)
-                chart.legend().setFont(QFont("Arial", 10))
-                chart.legend().setLabelColor(QColor("#333333"))
-                
-                # Adicionar interatividade - conectar sinais para quando o mouse passar sobre os slices
-                for slice in pie_series.slices():
-                    slice.hovered.connect(lambda state, slice=slice: self.highlightPieSlice(state, slice))
-                
-                # Adicionar texto com percentual
-                percentual_visitantes = (visitor_count / total_children) * 100 if total_children > 0 else 0
-                
-                # Adicionar informações adicionais ao título
-                chart.setTitle(f"Visitantes vs. Membros - Total: {total_children} crianças")
-            else:
-                # Se não houver dados, mostrar mensagem no gráfico
-                no_data_series = QPieSeries()
-                slice = no_data_series.append("Sem dados", 1)
-                slice.setLabelVisible(True)
-                slice.setLabelColor(QColor("#333333"))
-                slice.setBrush(QBrush(QColor("#E0E0E0")))  # Cinza claro
-                chart.addSeries(no_data_series)
-                
-                # Atualizar título
-                chart.setTitle("Não há dados de visitantes disponíveis")
+        # Criar gráfico
+        chart = QChart()
+        chart.setTitle("Visitantes vs. Membros")
+        chart.setAnimationOptions(QChart.SeriesAnimations)
+        chart.setAnimationDuration(1500)  # Duração da animação em milissegundos
 
-            # Definir o gráfico no QChartView
-            self.chart_view.setChart(chart)
+        # Definir estilo do título
+        title_font = QFont("Arial", 12, QFont.Bold)
+        chart.setTitleFont(title_font)
+        chart.setTitleBrush(QBrush(QColor("#5D9B7C")))  # Verde escuro
 
-            # Salvar dados históricos
-            self.saveVisitorsHistoricalData(visitors, member_count)
+        # Definir fundo do gráfico com gradiente
+        background_gradient = QLinearGradient()
+        background_gradient.setStart(0, 0)
+        background_gradient.setFinalStop(0, 1)
+        background_gradient.setColorAt(0.0, QColor(255, 255, 255))
+        background_gradient.setColorAt(1.0, QColor(240, 249, 245))
+        chart.setBackgroundBrush(QBrush(background_gradient))
 
-    def saveVisitorsHistoricalData(self, visitors, member_count):
-        """Salva dados históricos de visitantes"""
-        try:
-            # Criar diretório para relatórios detalhados
-            detailed_reports_dir = os.path.join(self.reports_dir, 'detailed')
-            os.makedirs(detailed_reports_dir, exist_ok=True)
+        # Adicionar borda ao gráfico
+        chart.setBackgroundPen(QPen(QColor("#D5E8D4"), 2))
+
+        # Contar visitantes e membros
+        total_children = data.total_children
+        visitor_count = len(visitors)
+        member_count = data.member_count
+
+        # Verificar se há dados para exibir
+        if total_children > 0:
+            # Gráfico de pizza
+            pie_series = QPieSeries()
             
-            # Nome do arquivo baseado na data atual
-            date_str = self.selected_date.strftime("%Y-%m-%d")
-            report_file = os.path.join(detailed_reports_dir, f'visitors_{date_str}.csv')
+            if member_count > 0:
+                member_slice = pie_series.append(f"Membros ({member_count})", member_count)
+                member_slice.setLabelVisible(True)
+                member_slice.setLabelColor(QColor("#333333"))
+                member_slice.setLabelFont(QFont("Arial", 10, QFont.Bold))
+                member_slice.setBrush(QBrush(QColor("#A8D5BA")))  # Verde claro
+                member_slice.setPen(QPen(Qt.white, 2))  # Borda branca
+                
+                # Adicionar efeito de explosão
+                member_slice.setExploded(True)
+                member_slice.setExplodeDistanceFactor(0.05)
+            
+            if visitor_count > 0:
+                visitor_slice = pie_series.append(f"Visitantes ({visitor_count})", visitor_count)
+                visitor_slice.setLabelVisible(True)
+                visitor_slice.setLabelColor(QColor("#333333"))
+                visitor_slice.setLabelFont(QFont("Arial", 10, QFont.Bold))
+                visitor_slice.setBrush(QBrush(QColor("#FFB7B2")))  # Rosa salmão
+                visitor_slice.setPen(QPen(Qt.white, 2))  # Borda branca
+                
+                # Adicionar efeito de explosão
+                visitor_slice.setExploded(True)
+                visitor_slice.setExplodeDistanceFactor(0.1)  # Destacar mais os visitantes
             
-            # Salvar dados detalhados
-            with open(report_file, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                writer.writerow(['Nome', 'Idade', 'Responsável', 'Telefone', 'Data de Cadastro', 'Observações'])
-                for visitor in visitors:
-                    writer.writerow([
-                        visitor['nome'],
-                        visitor['idade'],
-                        visitor['responsavel'],
-                        visitor['telefone'],
-                        visitor['data_cadastro'],
-                        visitor['observacoes']
-                    ])
-            
-            print(f"Dados de visitantes salvos em {report_file}")
-            
-            # Também salvar um resumo para o gráfico de tendência
-            summary_file = os.path.join(self.reports_dir, 'visitors_summary.csv')
-            
-            # Carregar dados históricos existentes
-            historical_data = []
-            if os.path.exists(summary_file):
-                with open(summary_file, 'r', newline='', encoding='utf-8') as f:
-                    reader = csv.reader(f)
-                    headers = next(reader, None)  # Pular cabeçalho
-                    historical_data = list(reader)
-            
-            # Verificar se já existe um registro para a data atual
-            date_exists = False
-            for i, row in enumerate(historical_data):
-                if row[0] == date_str:
-                    # Atualizar registro existente
-                    historical_data[i] = [date_str, str(len(visitors)), str(member_count)]
-                    date_exists = True
-                    break
-            
-            # Adicionar novo registro se não existir
-            if not date_exists:
-                historical_data.append([date_str, str(len(visitors)), str(member_count)])
-            
-            # Salvar dados resumidos
-            with open(summary_file, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                writer.writerow(['Data', 'Visitantes', 'Membros'])
-                writer.writerows(historical_data)
+            chart.addSeries(pie_series)
+            
+            # Adicionar legenda
+            chart.legend().setVisible(True)
+            chart.legend().setAlignment(Qt.AlignBottom)
+            chart.legend().setFont(QFont("Arial", 10))
+            chart.legend().setLabelColor(QColor("#333333"))
+            
+            # Adicionar interatividade - conectar sinais para quando o mouse passar sobre os slices
+            for slice in pie_series.slices():
+                slice.hovered.connect(lambda state, slice=slice: self.highlightPieSlice(state, slice))
+            
+            # Adicionar texto com percentual
+            percentual_visitantes = (visitor_count / total_children) * 100 if total_children > 0 else 0
+            
+            # Adicionar informações adicionais ao título
+            chart.setTitle(f"Visitantes vs. Membros - Total: {total_children} crianças")
+        else:
+            # Se não houver dados, mostrar mensagem no gráfico
+            no_data_series = QPieSeries()
+            slice = no_data_series.append("Sem dados", 1)
+            slice.setLabelVisible(True)
+            slice.setLabelColor(QColor("#333333"))
+            slice.setBrush(QBrush(QColor("#E0E0E0")))  # Cinza claro
+            chart.addSeries(no_data_series)
             
-            print(f"Resumo de visitantes salvo em {summary_file}")
+            # Atualizar título
+            chart.setTitle("Não há dados de visitantes disponíveis")
+
+        # Definir o gráfico no QChartView
+        self.chart_view.setChart(chart)
+
+    def saveVisitorsHistoricalData(self, visitors, member_count, date_str):
+        """Salva dados históricos de visitantes"""
+        try:
+            # Dados detalhados
+            self.history.write_snapshot(
+                f'visitors_{date_str}.csv',
+                ['Nome', 'Idade', 'Responsável', 'Telefone', 'Data de Cadastro', 'Observações'],
+                [[visitor.nome, visitor.idade, visitor.responsavel, visitor.telefone,
+                  visitor.data_cadastro, visitor.observacoes] for visitor in visitors])
+
+            # Resumo para o gráfico de tendência
+            self.history.upsert('visitors_summary.csv', ['Data', 'Visitantes', 'Membros'],
+                                date_str, [len(visitors), member_count])
         except Exception as e:
-            print(f"Erro ao salvar dados históricos de visitantes: {e}")
+            logger.error("Erro ao salvar dados históricos de visitantes: %s", e)
 
-    def loadBirthdayReport(self):
+    def loadBirthdayReport(self, data):
         """Carrega o relatório de aniversariantes do mês"""
-        print("Carregando relatório de aniversariantes do mês...")
+        logger.debug("Carregando relatório de aniversariantes do mês...")
         
         # Obter o mês atual a partir da data selecionada
         current_month = self.selected_date.month
         current_month_name = self.selected_date.strftime("%B")  # Nome do mês
         
-        print(f"Buscando aniversariantes do mês {current_month} ({current_month_name})")
-        
-        # Obter todas as crianças cadastradas
-        all_children = self.db.get_all_children()
-        print(f"Total de crianças cadastradas: {len(all_children)}")
-        
-        # Lista para armazenar aniversariantes
-        birthdays = []
-        
-        # Formatos de data possíveis
-        date_formats = [
-            "%d/%m/%Y",  # 25/12/2010
-            "%Y-%m-%d",  # 2010-12-25
-            "%d-%m-%Y",  # 25-12-2010
-            "%m/%d/%Y",  # 12/25/2010
-            "%d.%m.%Y",  # 25.12.2010
-        ]
-        
-        # Processar cada criança
-        for child in all_children:
-            birth_date_str = child.get('data_nascimento', '')
-            
-            # Pular se não tiver data de nascimento
-            if not birth_date_str or birth_date_str.strip() == '':
-                continue
-            
-            print(f"Processando data de nascimento: {birth_date_str} para {child.get('nome', 'Sem nome')}")
-            
-            # Tentar diferentes formatos de data
-            birth_date = None
-            for date_format in date_formats:
-                try:
-                    birth_date = datetime.datetime.strptime(birth_date_str, date_format)
-                    print(f"Data convertida com sucesso usando formato {date_format}: {birth_date}")
-                    break
-                except ValueError:
-                    continue
-            
-            # Se não conseguiu converter a data, pular esta criança
-            if birth_date is None:
-                print(f"Não foi possível converter a data: {birth_date_str}")
-                continue
-            
-            # Verificar se o mês de nascimento corresponde ao mês selecionado
-            if birth_date.month == current_month:
-                # Calcular idade atual
-                today = datetime.datetime.now()
-                age = today.year - birth_date.year
-                # Ajustar idade se ainda não fez aniversário este ano
-                if (today.month, today.day) < (birth_date.month, birth_date.day):
-                    age -= 1
-                
-                birthdays.append({
-                    'nome': child.get('nome', 'Sem nome'),
-                    'data': birth_date_str,
-                    'data_obj': birth_date,
-                    'idade': child.get('idade', str(age)),
-                    'dia': birth_date.day
-                })
-                
-                print(f"Aniversariante encontrado: {child.get('nome', 'Sem nome')} - {birth_date.day}/{birth_date.month}")
-        
-        # Ordenar por dia do mês
-        birthdays.sort(key=lambda x: x['dia'])
-        
-        print(f"Total de aniversariantes encontrados: {len(birthdays)}")
+        logger.debug("Buscando aniversariantes do mês %s (%s)", current_month, current_month_name)
         
+        # Aniversariantes do mês, já ordenados pelo dia
+        birthdays = data.birthdays_in(current_month)
+        logger.debug("Total de aniversariantes encontrados: %s", len(birthdays))
+
         # Configurar tabela
         self.table.setRowCount(len(birthdays))
         self.table.setColumnCount(4)
@@ -1555,10 +1385,10 @@ class RelatoriosWindow(QMainWindow):
         
         # Adicionar dados à tabela
         for i, birthday in enumerate(birthdays):
-            name_item = QTableWidgetItem(birthday['nome'])
-            date_item = QTableWidgetItem(birthday['data'])
-            age_item = QTableWidgetItem(str(birthday['idade']))
-            day_item = QTableWidgetItem(f"{birthday['dia']} de {current_month_name}")
+            name_item = QTableWidgetItem(birthday.nome)
+            date_item = QTableWidgetItem(birthday.data)
+            age_item = QTableWidgetItem(str(birthday.idade))
+            day_item = QTableWidgetItem(f"{birthday.dia} de {current_month_name}")
             
             # Alinhar ao centro
             date_item.setTextAlignment(Qt.AlignCenter)
@@ -1567,7 +1397,7 @@ class RelatoriosWindow(QMainWindow):
             
             # Destacar aniversariantes do dia atual
             today = datetime.datetime.now()
-            if birthday['dia'] == today.day and current_month == today.month:
+            if birthday.dia == today.day and current_month == today.month:
                 name_item.setBackground(QBrush(QColor("#FFD8B1")))
                 date_item.setBackground(QBrush(QColor("#FFD8B1")))
                 age_item.setBackground(QBrush(QColor("#FFD8B1")))
@@ -1578,217 +1408,159 @@ class RelatoriosWindow(QMainWindow):
             self.table.setItem(i, 2, age_item)
             self.table.setItem(i, 3, day_item)
         
-            # Ajustar colunas
+        # Ajustar colunas
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+
+        # Se não houver aniversariantes, mostrar mensagem na tabela
+        if not birthdays:
+            self.table.setRowCount(1)
+            self.table.setColumnCount(1)
+            self.table.setHorizontalHeaderLabels(["Mensagem"])
+            
+            message_item = QTableWidgetItem(f"Não há aniversariantes no mês de {current_month_name}")
+            message_item.setTextAlignment(Qt.AlignCenter)
+            self.table.setItem(0, 0, message_item)
             self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
 
-            # Se não houver aniversariantes, mostrar mensagem na tabela
-            if not birthdays:
-                self.table.setRowCount(1)
-                self.table.setColumnCount(1)
-                self.table.setHorizontalHeaderLabels(["Mensagem"])
-                
-                message_item = QTableWidgetItem(f"Não há aniversariantes no mês de {current_month_name}")
-                message_item.setTextAlignment(Qt.AlignCenter)
-                self.table.setItem(0, 0, message_item)
-                self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-
-            # Criar gráfico
-            chart = QChart()
-            chart.setTitle(f"Aniversariantes do Mês {current_month_name}")
-            chart.setAnimationOptions(QChart.SeriesAnimations)
-            chart.setAnimationDuration(1200)  # Duração da animação em milissegundos
-
-            # Definir estilo do título
-            title_font = QFont("Arial", 12, QFont.Bold)
-            chart.setTitleFont(title_font)
-            chart.setTitleBrush(QBrush(QColor("#5D9B7C")))  # Verde escuro
-
-            # Definir fundo do gráfico com gradiente festivo (cores de festa de aniversário)
-            background_gradient = QLinearGradient()
-            background_gradient.setStart(0, 0)
-            background_gradient.setFinalStop(0, 1)
-            background_gradient.setColorAt(0.0, QColor(255, 255, 255))
-            background_gradient.setColorAt(1.0, QColor(255, 245, 250))  # Rosa muito claro
-            chart.setBackgroundBrush(QBrush(background_gradient))
-
-            # Adicionar borda ao gráfico
-            chart.setBackgroundPen(QPen(QColor("#FFD8E4"), 2))  # Rosa claro para a borda
-
-            # Verificar se há aniversariantes para exibir
-            if birthdays:
-                # Agrupar por semana do mês
-                weeks = {
-                    "Semana 1 (1-7)": 0,
-                    "Semana 2 (8-14)": 0,
-                    "Semana 3 (15-21)": 0,
-                    "Semana 4 (22-31)": 0
-                }
-                
-                for birthday in birthdays:
-                    day = birthday['dia']
-                    if day <= 7:
-                        weeks["Semana 1 (1-7)"] += 1
-                    elif day <= 14:
-                        weeks["Semana 2 (8-14)"] += 1
-                    elif day <= 21:
-                        weeks["Semana 3 (15-21)"] += 1
-                    else:
-                        weeks["Semana 4 (22-31)"] += 1
-                
-                # Definir cores festivas para o gráfico de barras
-                bar_colors = [
-                    QColor("#FF9AA2"),  # Rosa
-                    QColor("#FFDAC1"),  # Pêssego
-                    QColor("#B5EAD7"),  # Menta
-                    QColor("#C7CEEA")   # Lavanda
-                ]
-                
-                # Criar múltiplos barsets para usar cores diferentes
-                bar_series = QBarSeries()
-                categories = []
-                
-                # Contador para cores
-                color_index = 0
-                
-                for week, count in weeks.items():
-                    # Criar um barset individual para cada semana
-                    bar_set = QBarSet(week)
-                    bar_set.append(count)
-                    
-                    # Definir cor personalizada
-                    bar_set.setColor(bar_colors[color_index % len(bar_colors)])
-                    bar_set.setBorderColor(Qt.white)  # Borda branca para destacar
-                    
-                    bar_series.append(bar_set)
-                    categories.append(week)
-                    color_index += 1
-                
-                # Configurar a série
-                bar_series.setLabelsVisible(True)  # Mostrar rótulos
-                bar_series.setLabelsPosition(QAbstractBarSeries.LabelsOutsideEnd)  # Posição dos rótulos
-                bar_series.setLabelsFormat("@value")  # Formato dos rótulos
-                
-                chart.addSeries(bar_series)
-                
-                # Configurar eixos
-                axis_x = QBarCategoryAxis()
-                axis_x.append(categories)
-                axis_x.setLabelsColor(QColor("#333333"))  # Cor do texto
-                axis_x.setGridLineVisible(False)  # Remover linhas de grade
-                chart.addAxis(axis_x, Qt.AlignBottom)
-                bar_series.attachAxis(axis_x)
-                
-                axis_y = QValueAxis()
-                max_value = max(weeks.values()) if weeks.values() else 1
-                axis_y.setRange(0, max_value + 1)
-                axis_y.setTickCount(max_value + 2)
-                axis_y.setLabelFormat("%d")  # Formato dos números
-                axis_y.setLabelsColor(QColor("#333333"))  # Cor do texto
-                axis_y.setTitleText("Número de Aniversariantes")  # Título do eixo
-                axis_y.setTitleFont(QFont("Arial", 10, QFont.Bold))
-                axis_y.setTitleBrush(QBrush(QColor("#5D9B7C")))  # Verde escuro
-                chart.addAxis(axis_y, Qt.AlignLeft)
-                bar_series.attachAxis(axis_y)
+        # Criar gráfico
+        chart = QChart()
+        chart.setTitle(f"Aniversariantes do Mês {current_month_name}")
+        chart.setAnimationOptions(QChart.SeriesAnimations)
+        chart.setAnimationDuration(1200)  # Duração da animação em milissegundos
+
+        # Definir estilo do título
+        title_font = QFont("Arial", 12, QFont.Bold)
+        chart.setTitleFont(title_font)
+        chart.setTitleBrush(QBrush(QColor("#5D9B7C")))  # Verde escuro
+
+        # Definir fundo do gráfico com gradiente festivo (cores de festa de aniversário)
+        background_gradient = QLinearGradient()
+        background_gradient.setStart(0, 0)
+        background_gradient.setFinalStop(0, 1)
+        background_gradient.setColorAt(0.0, QColor(255, 255, 255))
+        background_gradient.setColorAt(1.0, QColor(255, 245, 250))  # Rosa muito claro
+        chart.setBackgroundBrush(QBrush(background_gradient))
+
+        # Adicionar borda ao gráfico
+        chart.setBackgroundPen(QPen(QColor("#FFD8E4"), 2))  # Rosa claro para a borda
+
+        # Verificar se há aniversariantes para exibir
+        if birthdays:
+            # Agrupar por semana do mês
+            weeks = {
+                "Semana 1 (1-7)": 0,
+                "Semana 2 (8-14)": 0,
+                "Semana 3 (15-21)": 0,
+                "Semana 4 (22-31)": 0
+            }
+            
+            for birthday in birthdays:
+                day = birthday.dia
+                if day <= 7:
+                    weeks["Semana 1 (1-7)"] += 1
+                elif day <= 14:
+                    weeks["Semana 2 (8-14)"] += 1
+                elif day <= 21:
+                    weeks["Semana 3 (15-21)"] += 1
+                else:
+                    weeks["Semana 4 (22-31)"] += 1
+            
+            # Definir cores festivas para o gráfico de barras
+            bar_colors = [
+                QColor("#FF9AA2"),  # Rosa
+                QColor("#FFDAC1"),  # Pêssego
+                QColor("#B5EAD7"),  # Menta
+                QColor("#C7CEEA")   # Lavanda
+            ]
+            
+            # Criar múltiplos barsets para usar cores diferentes
+            bar_series = QBarSeries()
+            categories = []
+            
+            # Contador para cores
+            color_index = 0
+            
+            for week, count in weeks.items():
+                # Criar um barset individual para cada semana
+                bar_set = QBarSet(week)
+                bar_set.append(count)
                 
-                # Configurar legenda
-                chart.legend().setVisible(True)
-                chart.legend().setAlignment(Qt.AlignBottom)
-                chart.legend().setFont(QFont("Arial", 9))
-                chart.legend().setLabelColor(QColor("#333333"))
+                # Definir cor personalizada
+                bar_set.setColor(bar_colors[color_index % len(bar_colors)])
+                bar_set.setBorderColor(Qt.white)  # Borda branca para destacar
                 
-                # Adicionar texto com total de aniversariantes
-                total_birthdays = sum(weeks.values())
-                chart.setTitle(f"Aniversariantes do Mês {current_month_name} - Total: {total_birthdays}")
-            else:
-                # Se não houver aniversariantes, mostrar mensagem no gráfico com estilo festivo
-                no_data_series = QPieSeries()
-                slice = no_data_series.append(f"Sem aniversariantes em {current_month_name}", 1)
-                slice.setLabelVisible(True)
-                slice.setLabelColor(QColor("#333333"))
-                slice.setBrush(QBrush(QColor("#FFE6EA")))  # Rosa muito claro
-                slice.setPen(QPen(QColor("#FFB7C5"), 2))  # Rosa para a borda
-                chart.addSeries(no_data_series)
-
-            # Definir o gráfico no QChartView
-            self.chart_view.setChart(chart)
+                bar_series.append(bar_set)
+                categories.append(week)
+                color_index += 1
+            
+            # Configurar a série
+            bar_series.setLabelsVisible(True)  # Mostrar rótulos
+            bar_series.setLabelsPosition(QAbstractBarSeries.LabelsOutsideEnd)  # Posição dos rótulos
+            bar_series.setLabelsFormat("@value")  # Formato dos rótulos
+            
+            chart.addSeries(bar_series)
+            
+            # Configurar eixos
+            axis_x = QBarCategoryAxis()
+            axis_x.append(categories)
+            axis_x.setLabelsColor(QColor("#333333"))  # Cor do texto
+            axis_x.setGridLineVisible(False)  # Remover linhas de grade
+            chart.addAxis(axis_x, Qt.AlignBottom)
+            bar_series.attachAxis(axis_x)
+            
+            axis_y = QValueAxis()
+            max_value = max(weeks.values()) if weeks.values() else 1
+            axis_y.setRange(0, max_value + 1)
+            axis_y.setTickCount(max_value + 2)
+            axis_y.setLabelFormat("%d")  # Formato dos números
+            axis_y.setLabelsColor(QColor("#333333"))  # Cor do texto
+            axis_y.setTitleText("Número de Aniversariantes")  # Título do eixo
+            axis_y.setTitleFont(QFont("Arial", 10, QFont.Bold))
+            axis_y.setTitleBrush(QBrush(QColor("#5D9B7C")))  # Verde escuro
+            chart.addAxis(axis_y, Qt.AlignLeft)
+            bar_series.attachAxis(axis_y)
+            
+            # Configurar legenda
+            chart.legend().setVisible(True)
+            chart.legend().setAlignment(Qt.AlignBottom)
+            chart.legend().setFont(QFont("Arial", 9))
+            chart.legend().setLabelColor(QColor("#333333"))
+            
+            # Adicionar texto com total de aniversariantes
+            total_birthdays = sum(weeks.values())
+            chart.setTitle(f"Aniversariantes do Mês {current_month_name} - Total: {total_birthdays}")
+        else:
+            # Se não houver aniversariantes, mostrar mensagem no gráfico com estilo festivo
+            no_data_series = QPieSeries()
+            slice = no_data_series.append(f"Sem aniversariantes em {current_month_name}", 1)
+            slice.setLabelVisible(True)
+            slice.setLabelColor(QColor("#333333"))
+            slice.setBrush(QBrush(QColor("#FFE6EA")))  # Rosa muito claro
+            slice.setPen(QPen(QColor("#FFB7C5"), 2))  # Rosa para a borda
+            chart.addSeries(no_data_series)
 
-            # Salvar dados históricos
-            self.saveBirthdayHistoricalData(birthdays, current_month, current_month_name)
+        # Definir o gráfico no QChartView
+        self.chart_view.setChart(chart)
 
     def saveBirthdayHistoricalData(self, birthdays, current_month, month_name):
         """Salva dados históricos de aniversariantes"""
         try:
-            # Criar diretório para relatórios detalhados
-            detailed_reports_dir = os.path.join(self.reports_dir, 'detailed')
-            os.makedirs(detailed_reports_dir, exist_ok=True)
-            
-            # Nome do arquivo baseado no mês
-            report_file = os.path.join(detailed_reports_dir, f'birthdays_{current_month}.csv')
-            
-            # Salvar dados detalhados
-            with open(report_file, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                writer.writerow(['Nome', 'Data de Nascimento', 'Idade', 'Dia'])
-                for birthday in birthdays:
-                    writer.writerow([
-                        birthday['nome'],
-                        birthday['data'],
-                        birthday['idade'],
-                        birthday['dia']
-                    ])
-            
-            print(f"Dados de aniversariantes salvos em {report_file}")
-            
-            # Também salvar um resumo para o gráfico de tendência
-            summary_file = os.path.join(self.reports_dir, 'birthdays_summary.csv')
-            
-            # Carregar dados históricos existentes
-            historical_data = []
-            if os.path.exists(summary_file):
-                with open(summary_file, 'r', newline='', encoding='utf-8') as f:
-                    reader = csv.reader(f)
-                    headers = next(reader, None)  # Pular cabeçalho
-                    historical_data = list(reader)
-            
-            # Verificar se já existe um registro para o mês atual
-            month_exists = False
-            for i, row in enumerate(historical_data):
-                if row[0] == str(current_month):
-                    # Atualizar registro existente
-                    historical_data[i] = [str(current_month), month_name, str(len(birthdays))]
-                    month_exists = True
-                    break
-            
-            # Adicionar novo registro se não existir
-            if not month_exists:
-                historical_data.append([str(current_month), month_name, str(len(birthdays))])
-            
-            # Salvar dados resumidos
-            with open(summary_file, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                writer.writerow(['Mês', 'Nome do Mês', 'Total de Aniversariantes'])
-                writer.writerows(historical_data)
-            
-            print(f"Resumo de aniversariantes salvo em {summary_file}")
+            # Dados detalhados
+            self.history.write_snapshot(
+                f'birthdays_{current_month}.csv',
+                ['Nome', 'Data de Nascimento', 'Idade', 'Dia'],
+                [[birthday.nome, birthday.data, birthday.idade, birthday.dia] for birthday in birthdays])
+
+            # Resumo para o gráfico de tendência
+            self.history.upsert('birthdays_summary.csv', ['Mês', 'Nome do Mês', 'Total de Aniversariantes'],
+                                current_month, [month_name, len(birthdays)])
         except Exception as e:
-            print(f"Erro ao salvar dados históricos de aniversariantes: {e}")
-    
-    def loadAllergiesReport(self):
-        # Obter crianças com alergias ou doenças crônicas
-        allergies = []
-        
-        for child in self.db.get_all_children():
-            has_allergy = child.get('alergia') and child.get('alergia') != 'Não'
-            has_disease = child.get('doenca_cronica') and child.get('doenca_cronica') != 'Não'
-            
-            if has_allergy or has_disease:
-                allergies.append({
-                    'nome': child['nome'],
-                    'idade': child['idade'],
-                    'alergia': child.get('alergia', 'Não') if has_allergy else 'Não',
-                    'doenca': child.get('doenca_cronica', 'Não') if has_disease else 'Não'
-                })
-        
+            logger.error("Erro ao salvar dados históricos de aniversariantes: %s", e)
+
+    def loadAllergiesReport(self, data):
+        # Crianças com alergias ou doenças crônicas
+        allergies = data.health
+
         # Configurar tabela
         self.table.setRowCount(len(allergies))
         self.table.setColumnCount(4)
@@ -1796,10 +1568,10 @@ class RelatoriosWindow(QMainWindow):
         
         # Adicionar dados à tabela
         for i, child in enumerate(allergies):
-            name_item = QTableWidgetItem(child['nome'])
-            age_item = QTableWidgetItem(child['idade'])
-            allergy_item = QTableWidgetItem(child['alergia'])
-            disease_item = QTableWidgetItem(child['doenca'])
+            name_item = QTableWidgetItem(child.nome)
+            age_item = QTableWidgetItem(child.idade)
+            allergy_item = QTableWidgetItem(child.alergia)
+            disease_item = QTableWidgetItem(child.doenca)
             
             self.table.setItem(i, 0, name_item)
             self.table.setItem(i, 1, age_item)
@@ -1832,23 +1604,12 @@ class RelatoriosWindow(QMainWindow):
         chart.setBackgroundPen(QPen(QColor("#D4E1F5"), 2))  # Azul claro para a borda
 
         # Contar tipos de restrições
-        only_allergy = 0
-        only_disease = 0
-        both = 0
-
-        for child in allergies:
-            has_allergy = child['alergia'] != 'Não'
-            has_disease = child['doenca'] != 'Não'
-            
-            if has_allergy and has_disease:
-                both += 1
-            elif has_allergy:
-                only_allergy += 1
-            elif has_disease:
-                only_disease += 1
+        only_allergy = data.health_counts.only_first
+        only_disease = data.health_counts.only_second
+        both = data.health_counts.both
 
         # Total de crianças com restrições
-        total_restrictions = only_allergy + only_disease + both
+        total_restrictions = data.health_counts.total
 
         # Verificar se há dados para exibir
         if total_restrictions > 0:
@@ -1917,100 +1678,19 @@ class RelatoriosWindow(QMainWindow):
 
         self.chart_view.setChart(chart)
 
-        # Salvar dados históricos
-        report_file = os.path.join(self.reports_dir, 'allergies.csv')
-        date_str = self.selected_date.strftime("%Y-%m-%d")
+    def saveAllergiesHistoricalData(self, counts, date_str):
+        """Salva a contagem de restrições de saúde da data no histórico (se ainda não houver)"""
+        self.history.add('allergies.csv', ["Data", "Apenas Alergia", "Apenas Doença Crônica", "Ambos"],
+                         date_str, [counts.only_first, counts.only_second, counts.both])
 
-        # Verificar se já existe um relatório para esta data
-        historical_data = self.loadHistoricalData(report_file)
-
-        # Procurar por dados da data selecionada
-        data_exists = False
-        for row in historical_data:
-            if row[0] == date_str:
-                data_exists = True
-                break
-
-        # Se não existir, adicionar os dados atuais
-        if not data_exists:
-            historical_data.append([date_str, str(only_allergy), str(only_disease), str(both)])
-            self.saveHistoricalData(report_file, historical_data, 
-                                headers=["Data", "Apenas Alergia", "Apenas Doença Crônica", "Ambos"])
-    
-    def loadRegisteredChildrenReport(self):
+    def loadRegisteredChildrenReport(self, data):
         """Carrega o relatório de crianças cadastradas (não visitantes)"""
-        print("Carregando relatório de crianças cadastradas...")
-        
-        # Obter todas as crianças cadastradas
-        all_children = self.db.get_all_children()
-        print(f"Total de crianças cadastradas: {len(all_children)}")
-        
-        # Filtrar apenas crianças que não são visitantes
-        registered_children = []
-        for child in all_children:
-            is_visitor = child.get('visitante', '').lower() == 'sim' or child.get('visitante') is True
-            
-            if not is_visitor:
-                # Imprimir dados completos da criança para debug
-                print(f"\nDados completos da criança: {child.get('nome', 'Sem nome')}")
-                
-                # Determinar a sala com base na idade
-                sala = ""
-                try:
-                    idade = int(child.get('idade', 0))
-                    if idade <= 2:
-                        sala = "Berçário"
-                    elif idade == 3:
-                        sala = "Infantil 1"
-                    elif idade <= 5:
-                        sala = "Infantil 2"
-                    elif idade <= 7:
-                        sala = "Infantil 3"
-                    elif idade <= 10:
-                        sala = "Infantil 4"
-                    else:
-                        sala = "Juniores"
-                except:
-                    sala = "Não definida"
-                
-                # Verificar os campos de telefone disponíveis
-                telefone = child.get('telefone', '')
-                
-                # Verificar se o telefone está em um campo None
-                for key, value in child.items():
-                    if key is None and value:
-                        print(f"  Encontrado valor em campo None: {value}")
-                        if isinstance(value, list) and value:
-                            telefone = value[0]
-                        elif isinstance(value, str) and value:
-                            telefone = value
-                
-                # Determinar o responsável principal
-                mae = child.get('mae', '')
-                pai = child.get('pai', '')
-                outro_responsavel = child.get('outro_responsavel', '')
-                responsavel = mae or pai or outro_responsavel or 'Não informado'
-                
-                # Obter data de cadastro
-                data_cadastro = child.get('data_cadastro', 'Não informada')
-                
-                # Adicionar à lista de crianças cadastradas
-                registered_children.append({
-                    'nome': child.get('nome', 'Sem nome'),
-                    'idade': child.get('idade', 'Não informada'),
-                    'data_nascimento': child.get('data_nascimento', 'Não informada'),
-                    'responsavel': responsavel,
-                    'telefone': telefone or 'Não informado',
-                    'sala': sala,
-                    'data_cadastro': data_cadastro,
-                    'observacoes': child.get('observacoes', '')
-                })
-        
-        print(f"Total de crianças membros encontradas: {len(registered_children)}")
-        
-        # Ordenar por nome
-        registered_children.sort(key=lambda x: x['nome'])
+        logger.debug("Carregando relatório de crianças cadastradas...")
         
+        # Crianças que não são visitantes, em ordem alfabética
+        registered_children = data.registered
+        logger.debug("Total de crianças membros encontradas: %s", len(registered_children))
+
         # Configurar tabela
         self.table.setRowCount(len(registered_children))
         self.table.setColumnCount(7)
@@ -2021,13 +1701,13 @@ class RelatoriosWindow(QMainWindow):
         
         # Adicionar dados à tabela
         for i, child in enumerate(registered_children):
-            name_item = QTableWidgetItem(child['nome'])
-            age_item = QTableWidgetItem(child['idade'])
-            birth_item = QTableWidgetItem(child['data_nascimento'])
-            resp_item = QTableWidgetItem(child['responsavel'])
-            phone_item = QTableWidgetItem(child['telefone'])
-            room_item = QTableWidgetItem(child['sala'])
-            date_item = QTableWidgetItem(child['data_cadastro'])
+            name_item = QTableWidgetItem(child.nome)
+            age_item = QTableWidgetItem(child.idade)
+            birth_item = QTableWidgetItem(child.data_nascimento)
+            resp_item = QTableWidgetItem(child.responsavel)
+            phone_item = QTableWidgetItem(child.telefone)
+            room_item = QTableWidgetItem(child.sala)
+            date_item = QTableWidgetItem(child.data_cadastro)
             
             # Alinhar ao centro
             age_item.setTextAlignment(Qt.AlignCenter)
@@ -2037,8 +1717,8 @@ class RelatoriosWindow(QMainWindow):
             date_item.setTextAlignment(Qt.AlignCenter)
             
             # Definir tooltip para mostrar observações se houver
-            if child['observacoes']:
-                name_item.setToolTip(child['observacoes'])
+            if child.observacoes:
+                name_item.setToolTip(child.observacoes)
             
             self.table.setItem(i, 0, name_item)
             self.table.setItem(i, 1, age_item)
@@ -2048,233 +1728,133 @@ class RelatoriosWindow(QMainWindow):
             self.table.setItem(i, 5, room_item)
             self.table.setItem(i, 6, date_item)
         
-             # Ajustar colunas
+        # Ajustar colunas
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+
+        # Se não houver crianças cadastradas, mostrar mensagem na tabela
+        if not registered_children:
+            self.table.setRowCount(1)
+            self.table.setColumnCount(1)
+            self.table.setHorizontalHeaderLabels(["Mensagem"])
+            
+            message_item = QTableWidgetItem("Não há crianças cadastradas como membros")
+            message_item.setTextAlignment(Qt.AlignCenter)
+            self.table.setItem(0, 0, message_item)
             self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
 
-            # Se não houver crianças cadastradas, mostrar mensagem na tabela
-            if not registered_children:
-                self.table.setRowCount(1)
-                self.table.setColumnCount(1)
-                self.table.setHorizontalHeaderLabels(["Mensagem"])
-                
-                message_item = QTableWidgetItem("Não há crianças cadastradas como membros")
-                message_item.setTextAlignment(Qt.AlignCenter)
-                self.table.setItem(0, 0, message_item)
-                self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-
-            # Criar gráfico
-            chart = QChart()
-            chart.setTitle("Distribuição por Sala")
-            chart.setAnimationOptions(QChart.SeriesAnimations)
-            chart.setAnimationDuration(1500)  # Duração da animação em milissegundos
-
-            # Definir estilo do título
-            title_font = QFont("Arial", 12, QFont.Bold)
-            chart.setTitleFont(title_font)
-            chart.setTitleBrush(QBrush(QColor("#5D9B7C")))  # Verde escuro
-
-            # Definir fundo do gráfico com gradiente
-            background_gradient = QLinearGradient()
-            background_gradient.setStart(0, 0)
-            background_gradient.setFinalStop(0, 1)
-            background_gradient.setColorAt(0.0, QColor(255, 255, 255))
-            background_gradient.setColorAt(1.0, QColor(240, 249, 245))
-            chart.setBackgroundBrush(QBrush(background_gradient))
-
-            # Adicionar borda ao gráfico
-            chart.setBackgroundPen(QPen(QColor("#D5E8D4"), 2))
-
-            # Verificar se há dados para exibir
-            if registered_children:
-                # Contar crianças por sala
-                rooms = {
-                    "Berçário": 0,
-                    "Infantil 1": 0,
-                    "Infantil 2": 0,
-                    "Infantil 3": 0,
-                    "Infantil 4": 0,
-                    "Juniores": 0
-                }
-                
-                for child in registered_children:
-                    sala = child['sala']
-                    if sala in rooms:
-                        rooms[sala] += 1
-                    else:
-                        rooms["Não definida"] = rooms.get("Não definida", 0) + 1
-                
-                # Definir cores vibrantes para cada sala
-                room_colors = {
-                    "Berçário": QColor("#FF9AA2"),      # Rosa claro
-                    "Infantil 1": QColor("#FFB7B2"),    # Salmão
-                    "Infantil 2": QColor("#FFDAC1"),    # Pêssego
-                    "Infantil 3": QColor("#E2F0CB"),    # Verde claro
-                    "Infantil 4": QColor("#B5EAD7"),    # Menta
-                    "Juniores": QColor("#C7CEEA"),      # Lavanda
-                    "Não definida": QColor("#F2D5F8")   # Lilás
-                }
-                
-                # Gráfico de pizza
-                pie_series = QPieSeries()
-                
-                # Adicionar apenas salas com crianças
-                for room, count in rooms.items():
-                    if count > 0:
-                        slice = pie_series.append(f"{room} ({count})", count)
-                        slice.setLabelVisible(True)
-                        slice.setLabelColor(QColor("#333333"))
-                        slice.setLabelFont(QFont("Arial", 9, QFont.Bold))
-                        
-                        # Definir cor do slice
-                        if room in room_colors:
-                            slice.setBrush(QBrush(room_colors[room]))
-                        else:
-                            slice.setBrush(QBrush(QColor("#F2D5F8")))  # Lilás para salas não definidas
-                        
-                        slice.setPen(QPen(Qt.white, 2))  # Borda branca
-                        
-                        # Adicionar efeito de explosão
-                        slice.setExploded(True)
-                        slice.setExplodeDistanceFactor(0.08)
-                
-                chart.addSeries(pie_series)
-                
-                # Configurar legenda
-                chart.legend().setVisible(True)
-                chart.legend().setAlignment(Qt.AlignBottom)
-                chart.legend().setFont(QFont("Arial", 9))
-                chart.legend().setLabelColor(QColor("#333333"))
-                
-                # Adicionar interatividade - conectar sinais para quando o mouse passar sobre os slices
-                for slice in pie_series.slices():
-                    slice.hovered.connect(lambda state, slice=slice: self.highlightPieSlice(state, slice))
-                
-                # Adicionar informações adicionais ao título
-                total_children = sum(count for count in rooms.values() if count > 0)
-                chart.setTitle(f"Distribuição por Sala - Total: {total_children} crianças")
-            else:
-                # Se não houver dados, mostrar mensagem no gráfico
-                no_data_series = QPieSeries()
-                slice = no_data_series.append("Sem dados", 1)
-                slice.setLabelVisible(True)
-                slice.setLabelColor(QColor("#333333"))
-                slice.setBrush(QBrush(QColor("#E0E0E0")))  # Cinza claro
-                chart.addSeries(no_data_series)
+        # Criar gráfico
+        chart = QChart()
+        chart.setTitle("Distribuição por Sala")
+        chart.setAnimationOptions(QChart.SeriesAnimations)
+        chart.setAnimationDuration(1500)  # Duração da animação em milissegundos
 
-            # Definir o gráfico no QChartView
-            self.chart_view.setChart(chart)
+        # Definir estilo do título
+        title_font = QFont("Arial", 12, QFont.Bold)
+        chart.setTitleFont(title_font)
+        chart.setTitleBrush(QBrush(QColor("#5D9B7C")))  # Verde escuro
 
-            # Salvar dados históricos
-            self.saveRegisteredChildrenHistoricalData(registered_children)
+        # Definir fundo do gráfico com gradiente
+        background_gradient = QLinearGradient()
+        background_gradient.setStart(0, 0)
+        background_gradient.setFinalStop(0, 1)
+        background_gradient.setColorAt(0.0, QColor(255, 255, 255))
+        background_gradient.setColorAt(1.0, QColor(240, 249, 245))
+        chart.setBackgroundBrush(QBrush(background_gradient))
 
-    def saveRegisteredChildrenHistoricalData(self, registered_children):
-        """Salva dados históricos de crianças cadastradas"""
-        try:
-            # Criar diretório para relatórios detalhados
-            detailed_reports_dir = os.path.join(self.reports_dir, 'detailed')
-            os.makedirs(detailed_reports_dir, exist_ok=True)
+        # Adicionar borda ao gráfico
+        chart.setBackgroundPen(QPen(QColor("#D5E8D4"), 2))
+
+        # Verificar se há dados para exibir
+        if registered_children:
+            # Crianças por sala
+            rooms = data.registered_by_room
+            
+            # Definir cores vibrantes para cada sala
+            room_colors = {
+                "Berçário": QColor("#FF9AA2"),      # Rosa claro
+                "Infantil 1": QColor("#FFB7B2"),    # Salmão
+                "Infantil 2": QColor("#FFDAC1"),    # Pêssego
+                "Infantil 3": QColor("#E2F0CB"),    # Verde claro
+                "Infantil 4": QColor("#B5EAD7"),    # Menta
+                "Juniores": QColor("#C7CEEA"),      # Lavanda
+                "Não definida": QColor("#F2D5F8")   # Lilás
+            }
             
-            # Nome do arquivo baseado na data atual
-            date_str = datetime.datetime.now().strftime("%Y-%m-%d")
-            report_file = os.path.join(detailed_reports_dir, f'registered_children_{date_str}.csv')
+            # Gráfico de pizza
+            pie_series = QPieSeries()
             
-            # Salvar dados detalhados
-            with open(report_file, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                writer.writerow([
-                    'Nome', 'Idade', 'Data de Nascimento', 'Responsável', 
-                    'Telefone', 'Sala', 'Data de Cadastro', 'Observações'
-                ])
-                for child in registered_children:
-                    writer.writerow([
-                        child['nome'],
-                        child['idade'],
-                        child['data_nascimento'],
-                        child['responsavel'],
-                        child['telefone'],
-                        child['sala'],
-                        child['data_cadastro'],
-                        child['observacoes']
-                    ])
-            
-            print(f"Dados de crianças cadastradas salvos em {report_file}")
-            
-            # Também salvar um resumo para o gráfico de tendência
-            summary_file = os.path.join(self.reports_dir, 'registered_children_summary.csv')
-            
-            # Contar crianças por sala
-            rooms = {
-                "Berçário": 0,
-                "Infantil 1": 0,
-                "Infantil 2": 0,
-                "Infantil 3": 0,
-                "Infantil 4": 0,
-                "Juniores": 0,
-                "Não definida": 0
-            }
+            # Adicionar apenas salas com crianças
+            for room, count in rooms.items():
+                if count > 0:
+                    slice = pie_series.append(f"{room} ({count})", count)
+                    slice.setLabelVisible(True)
+                    slice.setLabelColor(QColor("#333333"))
+                    slice.setLabelFont(QFont("Arial", 9, QFont.Bold))
+                    
+                    # Definir cor do slice
+                    if room in room_colors:
+                        slice.setBrush(QBrush(room_colors[room]))
+                    else:
+                        slice.setBrush(QBrush(QColor("#F2D5F8")))  # Lilás para salas não definidas
+                    
+                    slice.setPen(QPen(Qt.white, 2))  # Borda branca
+                    
+                    # Adicionar efeito de explosão
+                    slice.setExploded(True)
+                    slice.setExplodeDistanceFactor(0.08)
             
-            for child in registered_children:
-                sala = child['sala']
-                if sala in rooms:
-                    rooms[sala] += 1
-                else:
-                    rooms["Não definida"] += 1
-            
-            # Carregar dados históricos existentes
-            historical_data = []
-            if os.path.exists(summary_file):
-                with open(summary_file, 'r', newline='', encoding='utf-8') as f:
-                    reader = csv.reader(f)
-                    headers = next(reader, None)  # Pular cabeçalho
-                    historical_data = list(reader)
-            
-            # Verificar se já existe um registro para a data atual
-            date_exists = False
-            for i, row in enumerate(historical_data):
-                if row[0] == date_str:
-                    # Atualizar registro existente
-                    new_row = [date_str]
-                    for room in rooms.keys():
-                        new_row.append(str(rooms[room]))
-                    historical_data[i] = new_row
-                    date_exists = True
-                    break
-            
-            # Adicionar novo registro se não existir
-            if not date_exists:
-                new_row = [date_str]
-                for room in rooms.keys():
-                    new_row.append(str(rooms[room]))
-                historical_data.append(new_row)
-            
-            # Salvar dados resumidos
-            with open(summary_file, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                header = ['Data'] + list(rooms.keys())
-                writer.writerow(header)
-                writer.writerows(historical_data)
+            chart.addSeries(pie_series)
             
-            print(f"Resumo de crianças cadastradas salvo em {summary_file}")
-        except Exception as e:
-            print(f"Erro ao salvar dados históricos de crianças cadastradas: {e}")
+            # Configurar legenda
+            chart.legend().setVisible(True)
+            chart.legend().setAlignment(Qt.AlignBottom)
+            chart.legend().setFont(QFont("Arial", 9))
+            chart.legend().setLabelColor(QColor("#333333"))
             
-    def loadVisitRequestsReport(self):
-        # Obter famílias que pediram visitas ou conversas
-        requests = []
-        
-        for child in self.db.get_all_children():
-            wants_visit = child.get('visita') == 'Sim'
-            wants_talk = child.get('conversa_monitor') and child.get('conversa_monitor') != 'Não'
+            # Adicionar interatividade - conectar sinais para quando o mouse passar sobre os slices
+            for slice in pie_series.slices():
+                slice.hovered.connect(lambda state, slice=slice: self.highlightPieSlice(state, slice))
             
-            if wants_visit or wants_talk:
-                requests.append({
-                    'nome': child['nome'],
-                    'idade': child['idade'],
-                    'responsavel': child.get('mae', '') or child.get('pai', '') or child.get('outro_responsavel', ''),
-                    'visita': 'Sim' if wants_visit else 'Não',
-                    'conversa': child.get('conversa_monitor', 'Não')
-                })
-        
+            # Adicionar informações adicionais ao título
+            total_children = sum(count for count in rooms.values() if count > 0)
+            chart.setTitle(f"Distribuição por Sala - Total: {total_children} crianças")
+        else:
+            # Se não houver dados, mostrar mensagem no gráfico
+            no_data_series = QPieSeries()
+            slice = no_data_series.append("Sem dados", 1)
+            slice.setLabelVisible(True)
+            slice.setLabelColor(QColor("#333333"))
+            slice.setBrush(QBrush(QColor("#E0E0E0")))  # Cinza claro
+            chart.addSeries(no_data_series)
+
+        # Definir o gráfico no QChartView
+        self.chart_view.setChart(chart)
+
+    def saveRegisteredChildrenHistoricalData(self, registered_children, rooms_count):
+        """Salva dados históricos de crianças cadastradas"""
+        try:
+            date_str = datetime.datetime.now().strftime("%Y-%m-%d")
+
+            # Dados detalhados
+            self.history.write_snapshot(
+                f'registered_children_{date_str}.csv',
+                ['Nome', 'Idade', 'Data de Nascimento', 'Responsável',
+                 'Telefone', 'Sala', 'Data de Cadastro', 'Observações'],
+                [[child.nome, child.idade, child.data_nascimento, child.responsavel,
+                  child.telefone, child.sala, child.data_cadastro, child.observacoes]
+                 for child in registered_children])
+
+            # Resumo para o gráfico de tendência (sempre as mesmas colunas de sala)
+            rooms = get_room_rules().names + [UNDEFINED_ROOM]
+            self.history.upsert('registered_children_summary.csv', ['Data'] + rooms,
+                                date_str, [rooms_count.get(room, 0) for room in rooms])
+        except Exception as e:
+            logger.error("Erro ao salvar dados históricos de crianças cadastradas: %s", e)
+
+    def loadVisitRequestsReport(self, data):
+        # Famílias que pediram visitas ou conversas
+        requests = data.visit_requests
+
         # Configurar tabela
         self.table.setRowCount(len(requests))
         self.table.setColumnCount(5)
@@ -2282,11 +1862,11 @@ class RelatoriosWindow(QMainWindow):
         
         # Adicionar dados à tabela
         for i, request in enumerate(requests):
-            name_item = QTableWidgetItem(request['nome'])
-            age_item = QTableWidgetItem(request['idade'])
-            resp_item = QTableWidgetItem(request['responsavel'])
-            visit_item = QTableWidgetItem(request['visita'])
-            talk_item = QTableWidgetItem(request['conversa'])
+            name_item = QTableWidgetItem(request.nome)
+            age_item = QTableWidgetItem(request.idade)
+            resp_item = QTableWidgetItem(request.responsavel)
+            visit_item = QTableWidgetItem(request.visita)
+            talk_item = QTableWidgetItem(request.conversa)
             
             self.table.setItem(i, 0, name_item)
             self.table.setItem(i, 1, age_item)
@@ -2320,23 +1900,12 @@ class RelatoriosWindow(QMainWindow):
         chart.setBackgroundPen(QPen(QColor("#D5D5E8"), 2))  # Azul claro para a borda
 
         # Contar tipos de solicitações
-        only_visit = 0
-        only_talk = 0
-        both = 0
-
-        for request in requests:
-            wants_visit = request['visita'] == 'Sim'
-            wants_talk = request['conversa'] != 'Não'
-            
-            if wants_visit and wants_talk:
-                both += 1
-            elif wants_visit:
-                only_visit += 1
-            elif wants_talk:
-                only_talk += 1
+        only_visit = data.visit_request_counts.only_first
+        only_talk = data.visit_request_counts.only_second
+        both = data.visit_request_counts.both
 
         # Total de solicitações
-        total_requests = only_visit + only_talk + both
+        total_requests = data.visit_request_counts.total
 
         # Definir cores vibrantes para cada tipo de solicitação
         colors = [
@@ -2398,55 +1967,12 @@ class RelatoriosWindow(QMainWindow):
 
         self.chart_view.setChart(chart)
 
-        # Salvar dados históricos
-        report_file = os.path.join(self.reports_dir, 'visit_requests.csv')
-        date_str = self.selected_date.strftime("%Y-%m-%d")
+    def saveVisitRequestsHistoricalData(self, counts, date_str):
+        """Salva a contagem de pedidos de visita/conversa da data no histórico (se ainda não houver)"""
+        self.history.add('visit_requests.csv', ["Data", "Apenas Visita", "Apenas Conversa", "Ambos"],
+                         date_str, [counts.only_first, counts.only_second, counts.both])
+
 
-        # Verificar se já existe um relatório para esta data
-        historical_data = self.loadHistoricalData(report_file)
-
-        # Procurar por dados da data selecionada
-        data_exists = False
-        for row in historical_data:
-            if row[0] == date_str:
-                data_exists = True
-                break
-
-        # Se não existir, adicionar os dados atuais
-        if not data_exists:
-            historical_data.append([date_str, str(only_visit), str(only_talk), str(both)])
-            self.saveHistoricalData(report_file, historical_data, 
-                                headers=["Data", "Apenas Visita", "Apenas Conversa", "Ambos"])
-    
-    def loadHistoricalData(self, file_path, default_headers=None):
-        """Carrega dados históricos de um arquivo CSV"""
-        if not os.path.exists(file_path):
-            # Se o arquivo não existir, retornar uma lista vazia
-            return []
-        
-        try:
-            with open(file_path, 'r', newline='', encoding='utf-8') as f:
-                reader = csv.reader(f)
-                # Pular cabeçalho
-                next(reader, None)
-                return list(reader)
-        except Exception as e:
-            print(f"Erro ao carregar dados históricos: {e}")
-            return []
-    
-    def saveHistoricalData(self, file_path, data, headers=None):
-        """Salva dados históricos em um arquivo CSV"""
-        try:
-            with open(file_path, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                # Escrever cabeçalho se fornecido
-                if headers:
-                    writer.writerow(headers)
-                # Escrever dados
-                writer.writerows(data)
-        except Exception as e:
-            print(f"Erro ao salvar dados históricos: {e}")
-    
     def exportToCSV(self):
         """Exporta os dados da tabela atual para um arquivo CSV"""
         # Verificar se há dados para exportar
@@ -2523,13 +2049,11 @@ class RelatoriosWindow(QMainWindow):
         
         if reply == QMessageBox.Yes:
             try:
-                # Verificar se o diretório existe
-                if os.path.exists(self.reports_dir):
-                    # Remover todos os arquivos CSV no diretório
-                    for file_name in os.listdir(self.reports_dir):
-                        if file_name.endswith('.csv'):
-                            file_path = os.path.join(self.reports_dir, file_name)
-                            os.remove(file_path)
+                # Descartar gravações pendentes antes de remover os arquivos CSV
+                self.history_generation += 1
+                self.history_timer.stop()
+                self.history_pool.waitForDone()
+                self.history.clear()
                 
                 # Recarregar o relatório atual
                 self.loadReport(self.report_combo.currentIndex())
@@ -0,0 +1,8 @@
+from src.reports.engine import ReportData, build_report_data, room_for_age
+from src.database.room_rules import UNDEFINED_ROOM
+from src.reports.attendance import AttendanceAggregates
+from src.reports.history import HistoryStore, HistorySeries
+from src.reports.cache import ReportCache
+
+__all__ = ['ReportData', 'build_report_data', 'room_for_age', 'UNDEFINED_ROOM',
+           'AttendanceAggregates', 'HistoryStore', 'HistorySeries', 'ReportCache']
@@ -0,0 +1,171 @@
+# src/reports/attendance.py
+
+import os
+import json
+import datetime
+import threading
+from typing import Dict, Any
+
+from src.utils.logger import get_logger
+
+logger = get_logger('reports.attendance')
+
+# Muda quando o formato do arquivo muda (o conteúdo antigo é recalculado)
+FORMAT_VERSION = 1
+
+
+def parse_checkin_day(value: str) -> str:
+    """Dia (AAAA-MM-DD) de uma data de check-in; '' se a data for inválida"""
+    day = (value or '')[:10]
+    try:
+        datetime.date(int(day[0:4]), int(day[5:7]), int(day[8:10]))
+    except ValueError:
+        return ''
+    return day
+
+
+class AttendanceAggregates:
+    """Presenças por dia, por sala e por criança, materializadas em disco.
+
+    O arquivo (JSON) guarda, além dos totais, até onde o histórico de
+    check-ins já foi processado (offset em bytes no CSV ou id do último
+    check-in no SQLite). ``sync`` lê apenas os check-ins novos e soma aos
+    totais, então as consultas não dependem do tamanho do histórico. Se o
+    histórico for reescrito (exclusão de uma criança), tudo é recalculado.
+
+    A frequência de uma criança conta dias diferentes: cada criança guarda o
+    conjunto dos dias em que veio, então a ordem das linhas no histórico
+    (importações, edições manuais) não altera o resultado.
+    """
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self._lock = threading.RLock()
+        self._dates = None
+        # id da criança -> conjunto dos dias de 'por_crianca' (montado sob demanda)
+        self._child_days = {}
+        self._data = self._load()
+
+    @staticmethod
+    def _empty(source: str = '') -> Dict[str, Any]:
+        return {
+            'versao': FORMAT_VERSION,
+            'origem': source,
+            'posicao': 0,
+            'controle': '',
+            # dia -> total de check-ins
+            'por_dia': {},
+            # dia -> sala -> total de check-ins
+            'por_dia_sala': {},
+            # id da criança -> {'dias': [dias com presença], 'ultimo_dia': dia,
+            #                   'sala': sala do check-in mais recente}
+            'por_crianca': {},
+        }
+
+    def _load(self) -> Dict[str, Any]:
+        if os.path.exists(self.file_path):
+            try:
+                with open(self.file_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get('versao') == FORMAT_VERSION:
+                    return data
+            except (OSError, ValueError) as e:
+                logger.error("Erro ao ler %s, recalculando: %s", self.file_path, e)
+        return self._empty()
+
+    def _save(self) -> None:
+        try:
+            os.makedirs(os.path.dirname(self.file_path), exist_ok=True)
+            tmp_path = self.file_path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._data, f, ensure_ascii=False, separators=(',', ':'))
+            os.replace(tmp_path, self.file_path)
+        except OSError as e:
+            logger.error("Erro ao salvar %s: %s", self.file_path, e)
+
+    def reset(self) -> None:
+        """Descarta os totais; o próximo ``sync`` relê o histórico do início"""
+        with self._lock:
+            self._data = self._empty(self._data.get('origem', ''))
+            self._dates = None
+            self._child_days = {}
+
+    def sync(self, db) -> int:
+        """Incorpora os check-ins novos do gerenciador de dados. Retorna quantos foram lidos"""
+        with self._lock:
+            source = getattr(db, 'CHECKIN_LOG_SOURCE', '')
+            if self._data['origem'] != source:
+                # Outro mecanismo de dados: posições não são comparáveis
+                self._data = self._empty(source)
+                self._child_days = {}
+
+            result = db.read_checkin_log(self._data['posicao'], self._data['controle'])
+            if result is None:
+                logger.info("Histórico de check-ins reescrito; recalculando as presenças")
+                self._data = self._empty(source)
+                self._child_days = {}
+                result = db.read_checkin_log(0, '')
+                if result is None:
+                    return 0
+
+            rows, position, check = result
+            if position == self._data['posicao'] and check == self._data['controle']:
+                return 0
+            for row in rows:
+                self._add(row)
+            self._data['posicao'] = position
+            self._data['controle'] = check
+            if rows:
+                self._dates = None
+            self._save()
+            return len(rows)
+
+    def _add(self, row: Dict[str, Any]) -> None:
+        day = parse_checkin_day(row.get('data_checkin', ''))
+        if not day:
+            logger.warning("Data de check-in inválida: %s", row.get('data_checkin'))
+            return
+        sala = row.get('sala', '') or ''
+        by_day = self._data['por_dia']
+        by_day[day] = by_day.get(day, 0) + 1
+        rooms = self._data['por_dia_sala'].setdefault(day, {})
+        rooms[sala] = rooms.get(sala, 0) + 1
+
+        child_id = row.get('crianca_id')
+        if child_id is None:
+            return
+        key = str(child_id)
+        child = self._data['por_crianca'].setdefault(key, {'dias': [], 'ultimo_dia': '', 'sala': ''})
+        days = self._child_days.get(key)
+        if days is None:
+            days = self._child_days[key] = set(child['dias'])
+        if day not in days:
+            days.add(day)
+            child['dias'].append(day)
+        if day >= child['ultimo_dia']:
+            child['ultimo_dia'] = day
+            child['sala'] = sala
+
+    def total_on(self, date: datetime.date) -> int:
+        with self._lock:
+            return self._data['por_dia'].get(date.isoformat(), 0)
+
+    def rooms_on(self, date: datetime.date) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._data['por_dia_sala'].get(date.isoformat(), {}))
+
+    def totals_by_date(self) -> Dict[datetime.date, int]:
+        """Total de check-ins de cada dia com presença, em ordem cronológica"""
+        with self._lock:
+            if self._dates is None:
+                self._dates = {datetime.date.fromisoformat(day): count
+                               for day, count in sorted(self._data['por_dia'].items())}
+            return dict(self._dates)
+
+    def days_attended(self, child_id: int) -> int:
+        with self._lock:
+            return len(self._data['por_crianca'].get(str(child_id), {}).get('dias', []))
+
+    def last_room(self, child_id: int) -> str:
+        with self._lock:
+            return self._data['por_crianca'].get(str(child_id), {}).get('sala', '')
@@ -0,0 +1,102 @@
+# src/reports/cache.py
+
+import os
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from src.utils.logger import get_logger
+
+logger = get_logger('reports.cache')
+
+# Muda quando o formato dos resultados guardados muda (o arquivo antigo é ignorado)
+FORMAT_VERSION = 1
+
+
+class ReportCache:
+    """Resultados de relatórios já calculados, do mais ao menos usado (LRU).
+
+    A chave (tupla de textos) inclui a versão dos dados (``data_version`` do
+    gerenciador de dados), então uma alteração nos dados nunca devolve um
+    resultado velho: as chaves antigas só deixam de ser encontradas e saem
+    pelo limite de tamanho. Com ``file_path`` o conteúdo é reaproveitado na
+    próxima execução: ``save`` grava o arquivo em JSON (só se algo mudou
+    desde a última gravação), e quem usa o cache decide quando chamá-lo.
+    ``encode``/``decode`` convertem os resultados de e para tipos do JSON.
+    """
+
+    def __init__(self, max_entries: int = 32, file_path: str = None,
+                 encode: Callable[[Any], Any] = None, decode: Callable[[Any], Any] = None):
+        self.max_entries = max(1, int(max_entries))
+        self.file_path = file_path
+        self.encode = encode or (lambda value: value)
+        self.decode = decode or (lambda value: value)
+        self._entries: Dict[Tuple[str, ...], Any] = OrderedDict()
+        self._lock = threading.RLock()
+        self._dirty = False
+        if file_path:
+            self._load()
+
+    def get(self, key: Tuple[str, ...]) -> Optional[Any]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: Tuple[str, ...], value: Any) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._dirty = True
+
+    def invalidate(self) -> None:
+        with self._lock:
+            if self._entries:
+                self._entries.clear()
+                self._dirty = True
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _load(self) -> None:
+        if not os.path.exists(self.file_path):
+            return
+        try:
+            with open(self.file_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('versao') != FORMAT_VERSION:
+                raise ValueError(f"versão {data.get('versao')!r}")
+            self._entries = OrderedDict((tuple(key), self.decode(value))
+                                        for key, value in data['resultados'])
+        except Exception as e:
+            # Arquivo corrompido ou de outra versão do aplicativo: descartar e começar vazio
+            logger.warning("Cache de relatórios descartado (%s): %s", self.file_path, e)
+            self._entries = OrderedDict()
+            try:
+                os.remove(self.file_path)
+            except OSError:
+                pass
+
+    def save(self) -> bool:
+        """Grava o conteúdo em disco, se houver alterações. Retorna se gravou"""
+        with self._lock:
+            if not self.file_path or not self._dirty:
+                return False
+            try:
+                os.makedirs(os.path.dirname(self.file_path), exist_ok=True)
+                tmp_path = self.file_path + '.tmp'
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump({'versao': FORMAT_VERSION,
+                               'resultados': [[list(key), self.encode(value)]
+                                              for key, value in self._entries.items()]},
+                              f, ensure_ascii=False, separators=(',', ':'))
+                os.replace(tmp_path, self.file_path)
+            except Exception as e:
+                logger.error("Erro ao salvar %s: %s", self.file_path, e)
+                return False
+            self._dirty = False
+            return True
@@ -0,0 +1,280 @@
+# src/reports/engine.py
+
+import datetime
+from dataclasses import dataclass, field, asdict
+from typing import List, Dict, Any, Iterable, Optional, Callable
+
+from src.database.child_record import as_child
+from src.database.room_rules import RoomRules, get_room_rules
+from src.reports.attendance import AttendanceAggregates
+from src.utils.dates import format_birth_date, DISPLAY_DATE_FORMAT
+from src.utils.logger import get_logger
+
+logger = get_logger('reports')
+
+def room_for_age(age: Any) -> str:
+    """Sala da idade nos relatórios (UNDEFINED_ROOM se a idade não for um número)"""
+    rules = get_room_rules()
+    return rules.report_room(rules.index_for_age(age))
+
+
+def _phone(child: Dict[str, Any]) -> str:
+    telefone = child.get('telefone', '')
+    # Linhas com colunas a mais (csv.DictReader guarda o excedente na chave None)
+    extra = child.get(None)
+    if isinstance(extra, list) and extra:
+        telefone = extra[0]
+    elif isinstance(extra, str) and extra:
+        telefone = extra
+    return telefone
+
+
+@dataclass
+class FrequencyRow:
+    nome: str
+    frequencia: int
+    status: str
+    sala: str
+
+
+@dataclass
+class VisitorRow:
+    nome: str
+    idade: str
+    responsavel: str
+    telefone: str
+    data_cadastro: str
+    observacoes: str
+
+
+@dataclass
+class BirthdayRow:
+    nome: str
+    data: str
+    idade: str
+    dia: int
+
+
+@dataclass
+class HealthRow:
+    nome: str
+    idade: str
+    alergia: str
+    doenca: str
+
+
+@dataclass
+class RegisteredRow:
+    nome: str
+    idade: str
+    data_nascimento: str
+    responsavel: str
+    telefone: str
+    sala: str
+    data_cadastro: str
+    observacoes: str
+
+
+@dataclass
+class VisitRequestRow:
+    nome: str
+    idade: str
+    responsavel: str
+    visita: str
+    conversa: str
+
+
+@dataclass
+class PairCounts:
+    """Contagem de duas marcações não exclusivas (ex.: alergia e doença crônica)"""
+    only_first: int = 0
+    only_second: int = 0
+    both: int = 0
+
+    def add(self, first: bool, second: bool) -> None:
+        if first and second:
+            self.both += 1
+        elif first:
+            self.only_first += 1
+        elif second:
+            self.only_second += 1
+
+    @property
+    def total(self) -> int:
+        return self.only_first + self.only_second + self.both
+
+
+@dataclass
+class ReportData:
+    """Resultado de todos os relatórios, calculado em uma passada pelos dados"""
+    total_children: int = 0
+    # Quantidade de check-ins por dia com presença
+    checkins_by_date: Dict[datetime.date, int] = field(default_factory=dict)
+    # Crianças em check-in por faixa etária (todas as cadastradas, se ninguém estiver em check-in)
+    age_groups: Dict[str, int] = field(default_factory=dict)
+    frequency: List[FrequencyRow] = field(default_factory=list)
+    visitors: List[VisitorRow] = field(default_factory=list)
+    member_count: int = 0
+    birthdays_by_month: Dict[int, List[BirthdayRow]] = field(default_factory=dict)
+    health: List[HealthRow] = field(default_factory=list)
+    health_counts: PairCounts = field(default_factory=PairCounts)
+    registered: List[RegisteredRow] = field(default_factory=list)
+    registered_by_room: Dict[str, int] = field(default_factory=dict)
+    visit_requests: List[VisitRequestRow] = field(default_factory=list)
+    visit_request_counts: PairCounts = field(default_factory=PairCounts)
+
+    def checkins_on(self, date: datetime.date) -> int:
+        return self.checkins_by_date.get(date, 0)
+
+    def birthdays_in(self, month: int) -> List[BirthdayRow]:
+        return self.birthdays_by_month.get(month, [])
+
+    def to_json(self) -> Dict[str, Any]:
+        """Converte para tipos do JSON (datas em ISO), para o cache em disco"""
+        data = asdict(self)
+        data['checkins_by_date'] = {day.isoformat(): count for day, count in self.checkins_by_date.items()}
+        data['birthdays_by_month'] = {str(month): rows for month, rows in data['birthdays_by_month'].items()}
+        return data
+
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> 'ReportData':
+        """Inverso de ``to_json``; dados incompletos levantam KeyError/TypeError/ValueError"""
+        return cls(
+            total_children=data['total_children'],
+            checkins_by_date={datetime.date.fromisoformat(day): count
+                              for day, count in data['checkins_by_date'].items()},
+            age_groups=dict(data['age_groups']),
+            frequency=[FrequencyRow(**row) for row in data['frequency']],
+            visitors=[VisitorRow(**row) for row in data['visitors']],
+            member_count=data['member_count'],
+            birthdays_by_month={int(month): [BirthdayRow(**row) for row in rows]
+                                for month, rows in data['birthdays_by_month'].items()},
+            health=[HealthRow(**row) for row in data['health']],
+            health_counts=PairCounts(**data['health_counts']),
+            registered=[RegisteredRow(**row) for row in data['registered']],
+            registered_by_room=dict(data['registered_by_room']),
+            visit_requests=[VisitRequestRow(**row) for row in data['visit_requests']],
+            visit_request_counts=PairCounts(**data['visit_request_counts']),
+        )
+
+
+def build_report_data(children: Iterable[Dict[str, Any]],
+                      attendance: AttendanceAggregates,
+                      checked_in: Iterable[Dict[str, Any]] = (),
+                      today: datetime.date = None,
+                      is_cancelled: Callable[[], bool] = None,
+                      rules: RoomRules = None) -> Optional[ReportData]:
+    """Calcula os dados de todos os relatórios.
+
+    Percorre o cadastro uma única vez; as presenças vêm dos totais já
+    materializados (``attendance``, sincronizado antes da chamada) e
+    ``checked_in`` são as crianças em check-in agora. As telas apenas
+    exibem o resultado. Se ``is_cancelled()`` ficar verdadeiro durante o
+    cálculo, retorna None. As salas seguem ``rules`` (as configuradas, se
+    omitido).
+    """
+    today = today or datetime.date.today()
+    rules = rules or get_room_rules()
+    data = ReportData()
+    age_groups_all = [0] * len(rules.names)
+    data.registered_by_room = {room: 0 for room in rules.names}
+
+    # Registros Child trazem idade, data de nascimento e visitante já convertidos;
+    # as salas saem da tabela de regras para todas as crianças de uma vez
+    all_children = [as_child(child) for child in children]
+    room_indexes = rules.indexes_for_children(all_children)
+
+    # 1. Cadastro
+    for child, index in zip(all_children, room_indexes):
+        # Verificação periódica: um cadastro grande leva algum tempo
+        if is_cancelled and data.total_children % 200 == 0 and is_cancelled():
+            return None
+        data.total_children += 1
+        nome = child.get('nome', 'Sem nome')
+        idade = child.get('idade', 'Não informada')
+        if index is not None:
+            age_groups_all[index] += 1
+        sala = rules.report_room(index)
+        if child.is_visitor:
+            data.visitors.append(VisitorRow(
+                nome=nome,
+                idade=idade,
+                responsavel=(child.get('responsavel') or child.get('outro_responsavel')
+                             or child.responsible or 'Não informado'),
+                telefone=_phone(child) or 'Não informado',
+                data_cadastro=child.get('data_cadastro', 'Não informada'),
+                observacoes=child.get('observacoes', '')))
+        else:
+            data.registered.append(RegisteredRow(
+                nome=nome,
+                idade=idade,
+                data_nascimento=format_birth_date(child.get('data_nascimento')) or 'Não informada',
+                responsavel=child.responsible or 'Não informado',
+                telefone=_phone(child) or 'Não informado',
+                sala=sala,
+                data_cadastro=child.get('data_cadastro', 'Não informada'),
+                observacoes=child.get('observacoes', '')))
+            data.registered_by_room[sala] = data.registered_by_room.get(sala, 0) + 1
+
+        birth_date = child.birth_date
+        if birth_date:
+            age = today.year - birth_date.year
+            if (today.month, today.day) < (birth_date.month, birth_date.day):
+                age -= 1
+            data.birthdays_by_month.setdefault(birth_date.month, []).append(BirthdayRow(
+                nome=nome,
+                data=birth_date.strftime(DISPLAY_DATE_FORMAT),
+                idade=child.get('idade') or str(age),
+                dia=birth_date.day))
+
+        alergia = child.get('alergia')
+        doenca = child.get('doenca_cronica')
+        has_allergy = bool(alergia) and alergia != 'Não'
+        has_disease = bool(doenca) and doenca != 'Não'
+        if has_allergy or has_disease:
+            data.health.append(HealthRow(
+                nome=nome,
+                idade=idade,
+                alergia=alergia if has_allergy else 'Não',
+                doenca=doenca if has_disease else 'Não'))
+            data.health_counts.add(has_allergy, has_disease)
+
+        conversa = child.get('conversa_monitor')
+        wants_visit = child.get('visita') == 'Sim'
+        wants_talk = bool(conversa) and conversa != 'Não'
+        if wants_visit or wants_talk:
+            data.visit_requests.append(VisitRequestRow(
+                nome=nome,
+                idade=idade,
+                responsavel=child.responsible,
+                visita='Sim' if wants_visit else 'Não',
+                conversa=conversa or 'Não'))
+            data.visit_request_counts.add(wants_visit, wants_talk)
+
+    data.member_count = data.total_children - len(data.visitors)
+    if is_cancelled and is_cancelled():
+        return None
+
+    # 2. Presenças
+    data.checkins_by_date = attendance.totals_by_date()
+
+    counts = [0] * len(rules.names)
+    open_indexes = rules.indexes_for_children([as_child(child) for child in checked_in])
+    for index in open_indexes:
+        if index is not None:
+            counts[index] += 1
+    data.age_groups = dict(zip(rules.labels, counts if open_indexes else age_groups_all))
+
+    for child, index in zip(all_children, room_indexes):
+        child_id = child.get('id')
+        data.frequency.append(FrequencyRow(
+            nome=child.get('nome', ''),
+            frequencia=attendance.days_attended(child_id),
+            status="Visitante" if child.is_visitor else "Membro",
+            sala=attendance.last_room(child_id) or rules.report_room(index)))
+
+    data.frequency.sort(key=lambda row: (-row.frequencia, row.nome))
+    data.registered.sort(key=lambda row: row.nome)
+    for rows in data.birthdays_by_month.values():
+        rows.sort(key=lambda row: row.dia)
+    return data
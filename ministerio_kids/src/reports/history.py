@@ -0,0 +1,176 @@
+# src/reports/history.py
+
+import os
+import csv
+import hashlib
+import threading
+from typing import List, Dict, Optional
+
+from src.utils.logger import get_logger
+
+logger = get_logger('reports.history')
+
+# Linhas substituídas toleradas no arquivo antes de reescrevê-lo sem elas
+COMPACT_SLACK = 32
+
+
+class HistorySeries:
+    """Série temporal de um resumo (uma linha por data ou mês) em um CSV.
+
+    O arquivo é lido uma única vez e mantido em memória. Gravar uma linha
+    nova ou alterada acrescenta apenas essa linha ao final do arquivo; ao
+    ler, a última linha de cada chave vale. Linhas iguais às já gravadas
+    não escrevem nada. Quando as linhas substituídas se acumulam, o
+    arquivo é reescrito uma vez sem elas.
+    """
+
+    def __init__(self, file_path: str, headers: List[str]):
+        self.file_path = file_path
+        self.headers = list(headers)
+        self._rows = None       # chave -> linha (ordem da primeira gravação)
+        self._file_lines = 0    # linhas de dados no arquivo (com as substituídas)
+
+    def _load(self) -> Dict[str, List[str]]:
+        if self._rows is None:
+            self._rows = {}
+            self._file_lines = 0
+            if os.path.exists(self.file_path):
+                try:
+                    with open(self.file_path, 'r', newline='', encoding='utf-8') as f:
+                        reader = csv.reader(f)
+                        next(reader, None)  # Pular cabeçalho
+                        for row in reader:
+                            if row:
+                                self._rows[row[0]] = row
+                                self._file_lines += 1
+                except (OSError, csv.Error) as e:
+                    logger.error("Erro ao carregar dados históricos de %s: %s", self.file_path, e)
+        return self._rows
+
+    def rows(self) -> List[List[str]]:
+        return [list(row) for row in self._load().values()]
+
+    def get(self, key: str) -> Optional[List[str]]:
+        row = self._load().get(str(key))
+        return list(row) if row is not None else None
+
+    def upsert(self, key: str, values: List) -> bool:
+        """Grava a linha da chave (substituindo a anterior). Retorna se algo foi escrito"""
+        rows = self._load()
+        key = str(key)
+        row = [key] + [str(value) for value in values]
+        if rows.get(key) == row:
+            return False
+        rows[key] = row
+        if self._file_lines - len(rows) >= COMPACT_SLACK:
+            self._rewrite()
+        else:
+            self._append(row)
+        return True
+
+    def add(self, key: str, values: List) -> bool:
+        """Grava a linha apenas se a chave ainda não existir"""
+        if str(key) in self._load():
+            return False
+        return self.upsert(key, values)
+
+    def _append(self, row: List[str]) -> None:
+        try:
+            os.makedirs(os.path.dirname(self.file_path), exist_ok=True)
+            new_file = not os.path.exists(self.file_path) or os.path.getsize(self.file_path) == 0
+            with open(self.file_path, 'a', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f)
+                if new_file:
+                    writer.writerow(self.headers)
+                    self._file_lines = 0
+                writer.writerow(row)
+            self._file_lines += 1
+        except OSError as e:
+            logger.error("Erro ao salvar dados históricos em %s: %s", self.file_path, e)
+
+    def _rewrite(self) -> None:
+        try:
+            tmp_path = self.file_path + '.tmp'
+            with open(tmp_path, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f)
+                writer.writerow(self.headers)
+                writer.writerows(self._rows.values())
+            os.replace(tmp_path, self.file_path)
+            self._file_lines = len(self._rows)
+        except OSError as e:
+            logger.error("Erro ao salvar dados históricos em %s: %s", self.file_path, e)
+
+
+class HistoryStore:
+    """Resumos históricos e relatórios detalhados da pasta de relatórios.
+
+    Os resumos são ``HistorySeries``; os relatórios detalhados (uma foto da
+    tabela por data) só são regravados quando o conteúdo muda. Assim, abrir
+    um relatório sem alterações nos dados não escreve nada em disco.
+    """
+
+    def __init__(self, reports_dir: str):
+        self.reports_dir = reports_dir
+        self._series = {}
+        self._snapshots = {}  # caminho -> hash do conteúdo gravado
+        self._lock = threading.RLock()
+
+    def series(self, name: str, headers: List[str]) -> HistorySeries:
+        with self._lock:
+            series = self._series.get(name)
+            if series is None or series.headers != list(headers):
+                series = HistorySeries(os.path.join(self.reports_dir, name), headers)
+                self._series[name] = series
+            return series
+
+    def upsert(self, name: str, headers: List[str], key: str, values: List) -> bool:
+        with self._lock:
+            return self.series(name, headers).upsert(key, values)
+
+    def add(self, name: str, headers: List[str], key: str, values: List) -> bool:
+        with self._lock:
+            return self.series(name, headers).add(key, values)
+
+    def write_snapshot(self, name: str, headers: List[str], rows: List[List]) -> bool:
+        """Grava um relatório detalhado (subpasta ``detailed``) se ele mudou"""
+        file_path = os.path.join(self.reports_dir, 'detailed', name)
+        rows = [[str(value) for value in row] for row in rows]
+        digest = hashlib.sha1(repr((headers, rows)).encode('utf-8')).hexdigest()
+        with self._lock:
+            if self._snapshots.get(file_path) == digest and os.path.exists(file_path):
+                return False
+            if file_path not in self._snapshots and self._read_snapshot(file_path) == [list(headers)] + rows:
+                self._snapshots[file_path] = digest
+                return False
+            try:
+                os.makedirs(os.path.dirname(file_path), exist_ok=True)
+                with open(file_path, 'w', newline='', encoding='utf-8') as f:
+                    writer = csv.writer(f)
+                    writer.writerow(headers)
+                    writer.writerows(rows)
+                self._snapshots[file_path] = digest
+            except OSError as e:
+                logger.error("Erro ao salvar %s: %s", file_path, e)
+                return False
+            logger.debug("Relatório detalhado salvo em %s", file_path)
+            return True
+
+    @staticmethod
+    def _read_snapshot(file_path: str) -> Optional[List[List[str]]]:
+        if not os.path.exists(file_path):
+            return None
+        try:
+            with open(file_path, 'r', newline='', encoding='utf-8') as f:
+                return list(csv.reader(f))
+        except (OSError, csv.Error):
+            return None
+
+    def clear(self) -> None:
+        """Apaga os resumos (*.csv da pasta de relatórios) e esquece o que está em memória"""
+        with self._lock:
+            if os.path.exists(self.reports_dir):
+                for file_name in os.listdir(self.reports_dir):
+                    if file_name.endswith('.csv'):
+                        os.remove(os.path.join(self.reports_dir, file_name))
+            self._series.clear()
+            self._snapshots.clear()
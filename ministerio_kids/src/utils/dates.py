@@ -0,0 +1,59 @@
+# src/utils/dates.py
+
+import datetime
+from typing import Optional
+
+from src.utils.logger import get_logger
+
+logger = get_logger('dates')
+
+# Formato gravado no cadastro (ISO); os demais aparecem em cadastros antigos
+BIRTH_DATE_FORMAT = "%Y-%m-%d"
+LEGACY_BIRTH_DATE_FORMATS = [
+    "%d/%m/%Y",  # 25/12/2010
+    "%d-%m-%Y",  # 25-12-2010
+    "%m/%d/%Y",  # 12/25/2010
+    "%d.%m.%Y",  # 25.12.2010
+]
+
+# Formato de exibição
+DISPLAY_DATE_FORMAT = "%d/%m/%Y"
+
+
+def parse_birth_date(value: str) -> Optional[datetime.date]:
+    """Converte uma data de nascimento (ISO ou formatos antigos); None se vazia ou inválida"""
+    value = (value or '').strip()
+    if not value:
+        return None
+    # Caso comum: já normalizada
+    try:
+        return datetime.date.fromisoformat(value)
+    except ValueError:
+        pass
+    for date_format in LEGACY_BIRTH_DATE_FORMATS:
+        try:
+            return datetime.datetime.strptime(value, date_format).date()
+        except ValueError:
+            continue
+    return None
+
+
+def normalize_birth_date(value: str) -> str:
+    """Data de nascimento no formato gravado (AAAA-MM-DD).
+
+    Valores que não são datas reconhecidas são mantidos como estão, para
+    não perder o que foi digitado.
+    """
+    value = (value or '').strip()
+    birth_date = parse_birth_date(value)
+    if birth_date is None:
+        if value:
+            logger.warning("Data de nascimento não reconhecida: %s", value)
+        return value
+    return birth_date.strftime(BIRTH_DATE_FORMAT)
+
+
+def format_birth_date(value: str) -> str:
+    """Data de nascimento para exibição (DD/MM/AAAA)"""
+    birth_date = parse_birth_date(value)
+    return birth_date.strftime(DISPLAY_DATE_FORMAT) if birth_date else (value or '')
@@ -0,0 +1,132 @@
+# src/utils/image_info.py
+
+import struct
+import datetime
+from typing import Dict, Any, Optional
+
+from src.utils.logger import get_logger
+
+logger = get_logger('image_info')
+
+# Tags EXIF usadas
+_TAG_ORIENTATION = 0x0112
+_TAG_DATETIME = 0x0132
+_TAG_EXIF_IFD = 0x8769
+_TAG_DATETIME_ORIGINAL = 0x9003
+
+# Marcadores SOF do JPEG que trazem as dimensões (C4, C8 e CC não são SOF)
+_JPEG_SOF = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+
+def read_image_info(path: str) -> Dict[str, Any]:
+    """Dimensões e data de captura lidas só do cabeçalho do arquivo.
+
+    Não decodifica a imagem. Suporta JPEG (com EXIF), PNG, GIF e BMP.
+    Retorna ``{'largura': int|None, 'altura': int|None, 'data_captura': str|None}``,
+    com a data no formato ISO (``2025-04-13T10:30:00``).
+    """
+    info = {'largura': None, 'altura': None, 'data_captura': None}
+    try:
+        with open(path, 'rb') as f:
+            head = f.read(32)
+            if head[:2] == b'\xff\xd8':
+                f.seek(2)
+                _read_jpeg(f, info)
+            elif head[:8] == b'\x89PNG\r\n\x1a\n' and head[12:16] == b'IHDR':
+                info['largura'], info['altura'] = struct.unpack('>II', head[16:24])
+            elif head[:4] == b'GIF8':
+                info['largura'], info['altura'] = struct.unpack('<HH', head[6:10])
+            elif head[:2] == b'BM' and len(head) >= 26:
+                width, height = struct.unpack('<ii', head[18:26])
+                info['largura'], info['altura'] = width, abs(height)
+    except (OSError, struct.error, ValueError) as e:
+        logger.warning("Não foi possível ler o cabeçalho de %s: %s", path, e)
+    return info
+
+
+def _read_jpeg(f, info: Dict[str, Any]) -> None:
+    orientation = 1
+    while True:
+        byte = f.read(1)
+        while byte == b'\xff':
+            byte = f.read(1)
+        if not byte:
+            break
+        marker = byte[0]
+        if marker in (0xD8, 0x01) or 0xD0 <= marker <= 0xD7:
+            continue
+        if marker in (0xD9, 0xDA):  # fim da imagem / início dos dados
+            break
+        length = struct.unpack('>H', f.read(2))[0]
+        if marker == 0xE1 and info['data_captura'] is None:
+            segment = f.read(length - 2)
+            if segment[:6] == b'Exif\x00\x00':
+                orientation, info['data_captura'] = _parse_exif(segment[6:])
+            continue
+        if marker in _JPEG_SOF:
+            segment = f.read(5)
+            height, width = struct.unpack('>HH', segment[1:5])
+            # Orientações 5 a 8: a foto aparece girada 90°
+            if orientation in (5, 6, 7, 8):
+                width, height = height, width
+            info['largura'], info['altura'] = width, height
+            break
+        f.seek(length - 2, 1)
+
+
+def _parse_exif(tiff: bytes):
+    """Retorna (orientação, data de captura ISO) de um bloco TIFF/EXIF"""
+    if tiff[:2] == b'II':
+        endian = '<'
+    elif tiff[:2] == b'MM':
+        endian = '>'
+    else:
+        return 1, None
+
+    def ifd_entries(offset):
+        if offset + 2 > len(tiff):
+            return {}
+        count = struct.unpack(endian + 'H', tiff[offset:offset + 2])[0]
+        entries = {}
+        for i in range(count):
+            start = offset + 2 + i * 12
+            if start + 12 > len(tiff):
+                break
+            tag, type_, num = struct.unpack(endian + 'HHI', tiff[start:start + 8])
+            entries[tag] = (type_, num, tiff[start + 8:start + 12])
+        return entries
+
+    def ascii_value(entry):
+        type_, num, raw = entry
+        if type_ != 2:
+            return None
+        if num <= 4:
+            data = raw[:num]
+        else:
+            offset = struct.unpack(endian + 'I', raw)[0]
+            data = tiff[offset:offset + num]
+        return data.split(b'\x00')[0].decode('ascii', 'ignore').strip()
+
+    ifd0 = ifd_entries(struct.unpack(endian + 'I', tiff[4:8])[0])
+    orientation = 1
+    if _TAG_ORIENTATION in ifd0:
+        orientation = struct.unpack(endian + 'H', ifd0[_TAG_ORIENTATION][2][:2])[0]
+
+    raw_date = None
+    if _TAG_EXIF_IFD in ifd0:
+        exif = ifd_entries(struct.unpack(endian + 'I', ifd0[_TAG_EXIF_IFD][2])[0])
+        if _TAG_DATETIME_ORIGINAL in exif:
+            raw_date = ascii_value(exif[_TAG_DATETIME_ORIGINAL])
+    if not raw_date and _TAG_DATETIME in ifd0:
+        raw_date = ascii_value(ifd0[_TAG_DATETIME])
+    return orientation, _exif_date_to_iso(raw_date)
+
+
+def _exif_date_to_iso(value: Optional[str]) -> Optional[str]:
+    # EXIF usa "AAAA:MM:DD HH:MM:SS"; câmeras sem relógio gravam zeros
+    if not value:
+        return None
+    try:
+        return datetime.datetime.strptime(value[:19], "%Y:%m:%d %H:%M:%S").isoformat()
+    except ValueError:
+        return None
@@ -0,0 +1,68 @@
+# src/utils/logger.py
+
+import os
+import sys
+import logging
+from logging.handlers import RotatingFileHandler
+
+# Todos os loggers do aplicativo ficam abaixo deste nome (ex.: missao_kids.database)
+ROOT_LOGGER = 'missao_kids'
+
+DEFAULT_LEVEL = logging.WARNING
+LOG_FORMAT = "%(asctime)s %(levelname)s [%(name)s] %(message)s"
+
+# Sem configuração, o aplicativo não escreve nada (ver setup_logging)
+logging.getLogger(ROOT_LOGGER).addHandler(logging.NullHandler())
+
+
+def get_logger(subsystem: str) -> logging.Logger:
+    """Retorna o logger de um subsistema (database, checkin, relatorios, ...).
+
+    Use formatação preguiçosa: ``logger.debug("Lidas %d crianças", total)``,
+    assim a mensagem só é montada se o nível estiver habilitado.
+    """
+    return logging.getLogger(f"{ROOT_LOGGER}.{subsystem}")
+
+
+def setup_logging(level=None, log_file: str = None, max_bytes: int = 1024 * 1024,
+                  backup_count: int = 3) -> logging.Logger:
+    """Configura os logs do aplicativo.
+
+    O nível vem do argumento ou da variável ``MISSAO_KIDS_LOG_LEVEL``
+    (padrão WARNING). Se ``log_file`` (ou ``MISSAO_KIDS_LOG_FILE``) for
+    informado, os logs também vão para um arquivo com rotação.
+    """
+    level = level or os.environ.get('MISSAO_KIDS_LOG_LEVEL') or DEFAULT_LEVEL
+    if isinstance(level, str):
+        level = logging.getLevelName(level.strip().upper())
+        if not isinstance(level, int):
+            level = DEFAULT_LEVEL
+    log_file = log_file or os.environ.get('MISSAO_KIDS_LOG_FILE')
+
+    root = logging.getLogger(ROOT_LOGGER)
+    root.setLevel(level)
+    root.propagate = False
+
+    # Permitir chamar mais de uma vez sem duplicar as saídas
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+        handler.close()
+
+    formatter = logging.Formatter(LOG_FORMAT)
+
+    # No executável sem console (PyInstaller, console=False) não há stderr
+    if sys.stderr is not None:
+        stream_handler = logging.StreamHandler(sys.stderr)
+        stream_handler.setFormatter(formatter)
+        root.addHandler(stream_handler)
+
+    if log_file:
+        os.makedirs(os.path.dirname(os.path.abspath(log_file)), exist_ok=True)
+        file_handler = RotatingFileHandler(log_file, maxBytes=max_bytes,
+                                           backupCount=backup_count, encoding='utf-8')
+        file_handler.setFormatter(formatter)
+        root.addHandler(file_handler)
+
+    if not root.handlers:
+        root.addHandler(logging.NullHandler())
+    return root
@@ -0,0 +1,179 @@
+# src/utils/photo_import.py
+
+import os
+import shutil
+import hashlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import List, Dict, Any, Callable
+
+from src.utils.logger import get_logger
+
+logger = get_logger('photo_import')
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp', '.gif')
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def file_hash(path: str) -> str:
+    """SHA-256 do conteúdo, lido em blocos (não carrega a foto inteira na memória)"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def downscale_photo(source: str, destination_base: str, max_edge: int, quality: int):
+    """Grava uma cópia com o maior lado limitado a ``max_edge`` pixels.
+
+    Roda em um processo separado (ProcessPoolExecutor): só usa QImage, que
+    não precisa de QApplication. A extensão (.jpg, ou .png se houver
+    transparência) é acrescentada a ``destination_base``. Retorna o caminho
+    gravado, ou None se a foto não puder ser lida.
+    """
+    from PyQt5.QtCore import Qt
+    from PyQt5.QtGui import QImageReader
+
+    reader = QImageReader(source)
+    reader.setAutoTransform(True)
+    size = reader.size()
+    if size.isValid() and max(size.width(), size.height()) > max_edge:
+        # JPEG: a redução acontece já na decodificação
+        reader.setScaledSize(size.scaled(max_edge, max_edge, Qt.KeepAspectRatio))
+    image = reader.read()
+    if image.isNull():
+        return None
+    if max(image.width(), image.height()) > max_edge:
+        image = image.scaled(max_edge, max_edge, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+
+    if image.hasAlphaChannel():
+        destination, fmt, save_quality = destination_base + '.png', 'PNG', -1
+    else:
+        destination, fmt, save_quality = destination_base + '.jpg', 'JPG', quality
+    if not image.save(destination, fmt, save_quality):
+        return None
+    return destination
+
+
+def _archive_original(source: str, content_hash: str, archive_folder: str) -> None:
+    # Originais também pelo conteúdo: reimportar não duplica o arquivo
+    destination = os.path.join(archive_folder, content_hash[:2],
+                               content_hash + os.path.splitext(source)[1].lower())
+    if not os.path.exists(destination):
+        os.makedirs(os.path.dirname(destination), exist_ok=True)
+        shutil.copyfile(source, destination)
+
+
+def import_photos(files: List[str], store,
+                  progress: Callable[[int, int], None] = None,
+                  is_cancelled: Callable[[], bool] = None,
+                  options: Dict[str, Any] = None) -> Dict[str, Any]:
+    """Guarda fotos no acervo (PhotoStore), pulando as que já existem.
+
+    Cada arquivo é lido uma vez para o hash (em blocos). Como o acervo é
+    endereçado pelo conteúdo, repetidas são detectadas por uma consulta ao
+    índice. As novas são copiadas com ``shutil.copyfile`` ou, com
+    ``options['reduzir']``, recomprimidas em um pool de processos (todos os
+    núcleos) com o maior lado limitado a ``options['lado_maximo']``.
+    ``progress(feitos, total)`` é chamado a cada arquivo e
+    ``is_cancelled()`` interrompe a importação.
+
+    Retorna ``{'importadas': [registros], 'duplicadas': [arquivos],
+    'erros': [(arquivo, mensagem)], 'cancelado': bool}``.
+    """
+    options = options or {}
+    result = {'importadas': [], 'duplicadas': [], 'erros': [], 'cancelado': False}
+    total = len(files)
+    done = 0
+
+    def step():
+        nonlocal done
+        done += 1
+        if progress:
+            progress(done, total)
+
+    def cancelled():
+        if is_cancelled and is_cancelled():
+            result['cancelado'] = True
+        return result['cancelado']
+
+    # 1. Hash de cada arquivo e separação das repetidas (também dentro do lote)
+    new_files = []
+    seen = set()
+    for source in files:
+        if cancelled():
+            break
+        try:
+            content_hash = file_hash(source)
+        except OSError as e:
+            logger.error("Erro ao ler %s: %s", source, e)
+            result['erros'].append((source, str(e)))
+            step()
+            continue
+        if content_hash in seen or store.contains(content_hash):
+            result['duplicadas'].append(source)
+            step()
+            continue
+        seen.add(content_hash)
+        if not options.get('reduzir'):
+            # Cópia direta, na sequência
+            try:
+                record, _ = store.add_file(source, content_hash)
+                result['importadas'].append(record)
+            except OSError as e:
+                logger.error("Erro ao importar %s: %s", source, e)
+                result['erros'].append((source, str(e)))
+            step()
+        else:
+            new_files.append((source, content_hash))
+
+    # 2. Cópias reduzidas, recomprimidas em paralelo
+    if new_files and not result['cancelado']:
+        _import_downscaled(new_files, store, options, result, step, cancelled)
+
+    if progress:
+        progress(done, total)
+    logger.info("Importação: %d novas, %d repetidas, %d erros",
+                len(result['importadas']), len(result['duplicadas']), len(result['erros']))
+    return result
+
+
+def _import_downscaled(new_files, store, options, result, step, cancelled) -> None:
+    max_edge = int(options.get('lado_maximo') or 2048)
+    quality = int(options.get('qualidade') or 85)
+    archive_folder = options.get('pasta_originais') or ''
+    work_dir = os.path.join(store.store_dir, 'tmp')
+    os.makedirs(work_dir, exist_ok=True)
+
+    with ProcessPoolExecutor() as pool:
+        futures = {pool.submit(downscale_photo, source, os.path.join(work_dir, content_hash),
+                               max_edge, quality): (source, content_hash)
+                   for source, content_hash in new_files}
+        for future in as_completed(futures):
+            source, content_hash = futures[future]
+            if cancelled():
+                for pending in futures:
+                    pending.cancel()
+            if future.cancelled():
+                continue
+            try:
+                reduced = future.result()
+                if reduced is None:
+                    raise OSError("não foi possível ler a imagem")
+                if archive_folder:
+                    _archive_original(source, content_hash, archive_folder)
+                record, _ = store.add_file(reduced, move=True, original_name=os.path.basename(source),
+                                           original_hash=content_hash)
+                result['importadas'].append(record)
+            except Exception as e:
+                logger.error("Erro ao importar %s: %s", source, e)
+                result['erros'].append((source, str(e)))
+            step()
+
+    # Sobras de tarefas canceladas
+    for name in os.listdir(work_dir):
+        try:
+            os.remove(os.path.join(work_dir, name))
+        except OSError:
+            pass
@@ -0,0 +1,66 @@
+# src/utils/profiling.py
+
+import time
+from typing import List, Tuple
+
+from src.utils.logger import get_logger
+
+logger = get_logger('startup')
+
+# Referência para os tempos de inicialização: o primeiro import deste módulo
+# (main.py o importa antes de tudo)
+_T0 = time.perf_counter()
+
+
+class StartupTimer:
+    """Registra marcos da inicialização e os tempos de carga das telas.
+
+    O relatório sai no log em nível INFO; para vê-lo no executável use
+    ``MISSAO_KIDS_LOG_LEVEL=INFO`` e ``MISSAO_KIDS_LOG_FILE=...``.
+    """
+
+    def __init__(self, t0: float = _T0):
+        self.t0 = t0
+        self.marks: List[Tuple[str, float]] = []
+        self.reported = False
+
+    def mark(self, label: str) -> float:
+        """Registra um marco; retorna os milissegundos desde o início"""
+        elapsed = (time.perf_counter() - self.t0) * 1000
+        self.marks.append((label, elapsed))
+        logger.debug("%8.1f ms  %s", elapsed, label)
+        return elapsed
+
+    def report(self) -> None:
+        """Escreve no log a lista de marcos e o intervalo entre eles"""
+        self.reported = True
+        previous = 0.0
+        lines = []
+        for label, elapsed in self.marks:
+            lines.append(f"  {elapsed:8.1f} ms  (+{elapsed - previous:7.1f})  {label}")
+            previous = elapsed
+        logger.info("Tempos de inicialização:\n%s", "\n".join(lines))
+
+
+class timed:
+    """Mede um trecho e registra o tempo como marco.
+
+    Ex.: ``with timed('Importar relatórios'): importlib.import_module(...)``
+    """
+
+    def __init__(self, label: str, timer: StartupTimer = None):
+        self.label = label
+        self.timer = timer or startup_timer
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        duration = (time.perf_counter() - self.start) * 1000
+        self.timer.mark(f"{self.label} ({duration:.1f} ms)")
+        return False
+
+
+# Instância usada pelo aplicativo
+startup_timer = StartupTimer()
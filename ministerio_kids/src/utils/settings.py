@@ -0,0 +1,101 @@
+# src/utils/settings.py
+
+import os
+import json
+import copy
+from typing import Dict, Any
+
+from src.utils.logger import get_logger
+
+logger = get_logger('settings')
+
+# Valores usados quando data/settings.json não existe ou não traz a chave
+DEFAULT_SETTINGS: Dict[str, Any] = {
+    'importacao_fotos': {
+        # Guardar uma cópia reduzida no lugar da foto original
+        'reduzir': False,
+        # Maior lado da cópia, em pixels
+        'lado_maximo': 2048,
+        # Qualidade JPEG da cópia (1 a 100)
+        'qualidade': 85,
+        # Pasta onde guardar os originais ao reduzir ('' = não guardar)
+        'pasta_originais': '',
+    },
+    # Salas do ministério por faixa etária (idade_max vazia = sem limite;
+    # capacidade 0 = sem limite). data_corte 'MM-DD': a sala segue a idade
+    # que a criança tem nessa data do ano, pela data de nascimento.
+    'salas': {
+        'faixas': [
+            {'nome': "Berçário", 'idade_min': 0, 'idade_max': 2, 'capacidade': 0},
+            {'nome': "Infantil 1", 'idade_min': 3, 'idade_max': 3, 'capacidade': 0},
+            {'nome': "Infantil 2", 'idade_min': 4, 'idade_max': 5, 'capacidade': 0},
+            {'nome': "Infantil 3", 'idade_min': 6, 'idade_max': 7, 'capacidade': 0},
+            {'nome': "Infantil 4", 'idade_min': 8, 'idade_max': 10, 'capacidade': 0},
+            {'nome': "Juniores", 'idade_min': 11, 'idade_max': None, 'capacidade': 0},
+        ],
+        # Sala do check-in quando a idade cadastrada não é um número
+        'sala_padrao': "Infantil 1",
+        'data_corte': '',
+    },
+    'relatorios': {
+        # Quantos relatórios calculados manter em memória
+        'cache_resultados': 32,
+        # Gravar os relatórios calculados em disco e reaproveitá-los ao abrir o aplicativo
+        'cache_persistente': False,
+    },
+}
+
+_settings = None
+
+
+def settings_file() -> str:
+    base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    return os.path.join(base_dir, 'data', 'settings.json')
+
+
+def _merge(defaults: Dict[str, Any], values: Dict[str, Any]) -> Dict[str, Any]:
+    merged = copy.deepcopy(defaults)
+    for key, value in values.items():
+        if isinstance(merged.get(key), dict) and isinstance(value, dict):
+            merged[key] = _merge(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def load_settings(path: str = None) -> Dict[str, Any]:
+    """Lê as configurações (padrões + o que estiver no arquivo)"""
+    path = path or settings_file()
+    values = {}
+    if os.path.exists(path):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                values = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.error("Erro ao ler %s, usando os valores padrão: %s", path, e)
+    return _merge(DEFAULT_SETTINGS, values)
+
+
+def get_settings() -> Dict[str, Any]:
+    """Configurações do aplicativo (lidas do disco na primeira chamada)"""
+    global _settings
+    if _settings is None:
+        _settings = load_settings()
+    return _settings
+
+
+def save_settings(settings: Dict[str, Any], path: str = None) -> bool:
+    global _settings
+    path = path or settings_file()
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(settings, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.error("Erro ao salvar %s: %s", path, e)
+        return False
+    if path == settings_file():
+        _settings = settings
+    return True
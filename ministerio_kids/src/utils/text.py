@@ -0,0 +1,13 @@
+# src/utils/text.py
+
+import unicodedata
+
+
+def normalize_text(text: str) -> str:
+    """Normaliza um texto para busca: sem acentos, sem caixa e sem espaços extras.
+
+    Ex.: "  João  da Conceição" -> "joao da conceicao"
+    """
+    decomposed = unicodedata.normalize('NFKD', text or '')
+    without_accents = ''.join(char for char in decomposed if not unicodedata.combining(char))
+    return ' '.join(without_accents.casefold().split())
@@ -0,0 +1,241 @@
+# src/utils/thumbnails.py
+
+import os
+import hashlib
+import threading
+from collections import deque
+from typing import Iterable, Optional
+
+from PyQt5.QtCore import Qt, QObject, QThreadPool, pyqtSignal
+from PyQt5.QtGui import QImage, QImageReader
+
+from src.utils.logger import get_logger
+from src.utils.workers import Worker
+
+logger = get_logger('thumbnails')
+
+THUMB_WIDTH = 200
+THUMB_HEIGHT = 150
+JPEG_QUALITY = 85
+
+# Formatos que podem ter transparência são guardados em PNG; o resto em JPEG
+_ALPHA_EXTENSIONS = ('.png', '.gif')
+
+
+def default_cache_dir() -> str:
+    """Pasta padrão das miniaturas: data/thumbnails na raiz do projeto"""
+    base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    return os.path.join(base_dir, 'data', 'thumbnails')
+
+
+class ThumbnailCache:
+    """Cache em disco de miniaturas das fotos da galeria.
+
+    A chave é o caminho absoluto + data de modificação + tamanho do arquivo:
+    se a foto for trocada ou editada a chave muda e a miniatura é refeita,
+    sem precisar apagar nada à mão. ``key_func`` pode fornecer a chave (ex.:
+    o hash de uma foto do acervo); quando retorna None vale a chave padrão.
+    As miniaturas ficam em subpastas pelos dois primeiros caracteres da
+    chave, para não acumular milhares de arquivos numa pasta só. Pode ser
+    usado por várias threads ao mesmo tempo (só usa QImage, nunca QPixmap).
+    """
+
+    def __init__(self, cache_dir: str = None, width: int = THUMB_WIDTH, height: int = THUMB_HEIGHT,
+                 key_func=None):
+        self.cache_dir = cache_dir or default_cache_dir()
+        self.key_func = key_func
+        self.width = width
+        self.height = height
+        self._lock = threading.Lock()
+        self._tmp_counter = 0
+
+    def key(self, image_path: str) -> Optional[str]:
+        """Chave da miniatura, ou None se o arquivo não existir"""
+        if self.key_func is not None:
+            key = self.key_func(image_path)
+            if key:
+                return f"{key}-{self.width}x{self.height}"
+        try:
+            stat = os.stat(image_path)
+        except OSError:
+            return None
+        raw = f"{os.path.abspath(image_path)}|{stat.st_mtime_ns}|{stat.st_size}|{self.width}x{self.height}"
+        return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+    def thumbnail_path(self, image_path: str, key: str = None) -> Optional[str]:
+        key = key or self.key(image_path)
+        if key is None:
+            return None
+        ext = '.png' if image_path.lower().endswith(_ALPHA_EXTENSIONS) else '.jpg'
+        return os.path.join(self.cache_dir, key[:2], key + ext)
+
+    def get(self, image_path: str) -> QImage:
+        """Retorna a miniatura (do cache ou gerada agora); imagem nula se não der para ler"""
+        thumb_path = self.thumbnail_path(image_path)
+        if thumb_path is None:
+            return QImage()
+
+        if os.path.exists(thumb_path):
+            image = QImage(thumb_path)
+            if not image.isNull():
+                return image
+            logger.warning("Miniatura corrompida, refazendo: %s", thumb_path)
+
+        image = self.create(image_path)
+        if not image.isNull():
+            self._save(image, thumb_path)
+        return image
+
+    def create(self, image_path: str) -> QImage:
+        """Decodifica a foto já no tamanho da miniatura.
+
+        Com ``setScaledSize`` o leitor de JPEG reduz durante a decodificação,
+        sem montar a foto inteira (12 MP) na memória.
+        """
+        reader = QImageReader(image_path)
+        reader.setAutoTransform(True)
+        size = reader.size()
+        if size.isValid():
+            reader.setScaledSize(size.scaled(self.width, self.height, Qt.KeepAspectRatio))
+        image = reader.read()
+        if image.isNull():
+            logger.warning("Não foi possível ler a imagem %s: %s", image_path, reader.errorString())
+            return image
+        if image.width() > self.width or image.height() > self.height:
+            # Formato sem tamanho conhecido antes da leitura: reduz depois
+            image = image.scaled(self.width, self.height, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        return image
+
+    def _save(self, image: QImage, thumb_path: str) -> None:
+        # Grava em um temporário e renomeia: uma leitura concorrente nunca vê o arquivo pela metade
+        with self._lock:
+            self._tmp_counter += 1
+            tmp_path = f"{thumb_path}.{os.getpid()}.{self._tmp_counter}.tmp"
+        try:
+            os.makedirs(os.path.dirname(thumb_path), exist_ok=True)
+            fmt = 'PNG' if thumb_path.endswith('.png') else 'JPG'
+            quality = -1 if fmt == 'PNG' else JPEG_QUALITY
+            if not image.save(tmp_path, fmt, quality):
+                raise OSError(f"falha ao gravar {tmp_path}")
+            os.replace(tmp_path, thumb_path)
+        except OSError as e:
+            logger.error("Erro ao salvar miniatura %s: %s", thumb_path, e)
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def discard(self, image_path: str) -> None:
+        """Remove a miniatura de uma foto (chamar antes de apagar a foto)"""
+        thumb_path = self.thumbnail_path(image_path)
+        if thumb_path and os.path.exists(thumb_path):
+            try:
+                os.remove(thumb_path)
+            except OSError as e:
+                logger.error("Erro ao remover miniatura %s: %s", thumb_path, e)
+
+    def prune(self, image_paths: Iterable[str]) -> int:
+        """Apaga miniaturas que não pertencem a nenhuma das fotos atuais.
+
+        Retorna quantas foram removidas.
+        """
+        valid = set()
+        for image_path in image_paths:
+            thumb_path = self.thumbnail_path(image_path)
+            if thumb_path:
+                valid.add(os.path.normcase(thumb_path))
+
+        if not os.path.isdir(self.cache_dir):
+            return 0
+
+        removed = 0
+        for entry in os.scandir(self.cache_dir):
+            if not entry.is_dir():
+                continue
+            for thumb in os.scandir(entry.path):
+                # .tmp: gravação em andamento em outra thread
+                if thumb.name.endswith('.tmp') or os.path.normcase(thumb.path) in valid:
+                    continue
+                try:
+                    os.remove(thumb.path)
+                    removed += 1
+                except OSError as e:
+                    logger.error("Erro ao remover miniatura %s: %s", thumb.path, e)
+        if removed:
+            logger.debug("Miniaturas antigas removidas: %d", removed)
+        return removed
+
+
+class ThumbnailLoader(QObject):
+    """Carrega miniaturas em segundo plano, em um pool de threads próprio.
+
+    ``request`` enfileira as fotos na ordem de exibição; ``prioritize``
+    passa as que estão visíveis na frente da fila. Cada miniatura pronta
+    sai pelo sinal ``thumbnailReady`` (na thread da interface).
+    """
+
+    # (caminho da foto, miniatura)
+    thumbnailReady = pyqtSignal(str, QImage)
+
+    def __init__(self, cache: ThumbnailCache, max_threads: int = None, parent=None):
+        super(ThumbnailLoader, self).__init__(parent)
+        self.cache = cache
+        self.pool = QThreadPool(self)
+        if max_threads:
+            self.pool.setMaxThreadCount(max_threads)
+        self._queue = deque()
+        self._urgent = deque()
+        self._pending = set()
+        self._running = 0
+        # Resultados de pedidos anteriores a um clear() são descartados
+        self._generation = 0
+
+    def request(self, image_paths: Iterable[str]) -> None:
+        """Enfileira fotos (as já pendentes são ignoradas)"""
+        for image_path in image_paths:
+            if image_path not in self._pending:
+                self._pending.add(image_path)
+                self._queue.append(image_path)
+        self._startNext()
+
+    def prioritize(self, image_paths: Iterable[str]) -> None:
+        """Carrega estas fotos antes das demais (ex.: as visíveis na tela)"""
+        self._urgent.clear()
+        self._urgent.extend(p for p in image_paths if p in self._pending)
+        self._startNext()
+
+    def clear(self) -> None:
+        """Esquece os pedidos pendentes; tarefas em andamento terminam, mas são ignoradas"""
+        self._generation += 1
+        self._queue.clear()
+        self._urgent.clear()
+        self._pending.clear()
+
+    def _nextPath(self):
+        for queue in (self._urgent, self._queue):
+            while queue:
+                image_path = queue.popleft()
+                if image_path in self._pending:
+                    return image_path
+        return None
+
+    def _startNext(self) -> None:
+        while self._running < self.pool.maxThreadCount():
+            image_path = self._nextPath()
+            if image_path is None:
+                return
+            self._pending.discard(image_path)
+            self._running += 1
+            worker = Worker(self.cache.get, image_path, tag=(self._generation, image_path))
+            worker.signals.result.connect(self._onResult)
+            worker.signals.error.connect(self._onError)
+            self.pool.start(worker)
+
+    def _onResult(self, tag, image):
+        self._running -= 1
+        generation, image_path = tag
+        if generation == self._generation:
+            self.thumbnailReady.emit(image_path, image)
+        self._startNext()
+
+    def _onError(self, tag, message):
+        self._running -= 1
+        self._startNext()
@@ -0,0 +1,50 @@
+# src/utils/workers.py
+
+from PyQt5.QtCore import QObject, QRunnable, pyqtSignal
+
+from src.utils.logger import get_logger
+
+logger = get_logger('workers')
+
+
+class WorkerSignals(QObject):
+    """Sinais emitidos por um Worker (entregues na thread da interface)"""
+
+    # (etiqueta, resultado)
+    result = pyqtSignal(object, object)
+    # (etiqueta, mensagem de erro)
+    error = pyqtSignal(object, str)
+    # (etiqueta, feitos, total)
+    progress = pyqtSignal(object, int, int)
+
+
+class Worker(QRunnable):
+    """Executa uma função em uma thread do QThreadPool.
+
+    A etiqueta (``tag``) volta junto com o resultado, para que quem disparou
+    o trabalho possa descartar respostas de pedidos já substituídos.
+    Com ``with_progress=True`` a função recebe ``progress(feitos, total)``,
+    que emite o sinal ``progress``.
+    """
+
+    def __init__(self, fn, *args, tag=None, with_progress=False, **kwargs):
+        super(Worker, self).__init__()
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.tag = tag
+        self.signals = WorkerSignals()
+        if with_progress:
+            self.kwargs['progress'] = self.reportProgress
+
+    def reportProgress(self, done, total):
+        self.signals.progress.emit(self.tag, done, total)
+
+    def run(self):
+        try:
+            result = self.fn(*self.args, **self.kwargs)
+        except Exception as e:
+            logger.exception("Erro em tarefa de segundo plano")
+            self.signals.error.emit(self.tag, str(e))
+        else:
+            self.signals.result.emit(self.tag, result)
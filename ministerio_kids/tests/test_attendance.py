@@ -0,0 +1,99 @@
+# tests/test_attendance.py
+
+import datetime
+
+import pytest
+
+from src.database.checkin_index import OpenCheckinIndex, read_log_since
+from src.database.child_registry import parse_id
+from src.reports.attendance import AttendanceAggregates, parse_checkin_day
+
+
+class CheckinLog:
+    """Só a parte do gerenciador de dados CSV usada por ``AttendanceAggregates.sync``"""
+
+    CHECKIN_LOG_SOURCE = 'csv'
+
+    def __init__(self, tmp_path):
+        self.index = OpenCheckinIndex(str(tmp_path / 'checkins.csv'), str(tmp_path / 'checkouts.csv'))
+
+    def read_checkin_log(self, position, check):
+        result = read_log_since(self.index.checkins_file, position, check)
+        if result is not None:
+            for row in result[0]:
+                row['crianca_id'] = parse_id(row.get('crianca_id'))
+        return result
+
+
+@pytest.fixture
+def log(tmp_path):
+    return CheckinLog(tmp_path)
+
+
+def test_parse_checkin_day():
+    assert parse_checkin_day("2026-01-04 09:00:00") == "2026-01-04"
+    assert parse_checkin_day("04/01/2026") == ""
+    assert parse_checkin_day("") == ""
+
+
+def test_totals_are_updated_incrementally(log, tmp_path):
+    attendance = AttendanceAggregates(str(tmp_path / 'attendance.json'))
+    log.index.start(1, "Ana", "Infantil 2", "2026-01-04 09:00:00")
+    log.index.start(2, "Bia", "Infantil 1", "2026-01-04 09:05:00")
+    assert attendance.sync(log) == 2
+    assert attendance.sync(log) == 0
+
+    log.index.start(1, "Ana", "Infantil 3", "2026-01-11 09:00:00")
+    log.index.start(1, "Ana", "Infantil 3", "2026-01-11 10:00:00")
+    assert attendance.sync(log) == 2
+
+    sunday = datetime.date(2026, 1, 4)
+    assert attendance.total_on(sunday) == 2
+    assert attendance.rooms_on(sunday) == {"Infantil 2": 1, "Infantil 1": 1}
+    assert attendance.totals_by_date() == {sunday: 2, datetime.date(2026, 1, 11): 2}
+    # Dias diferentes, não check-ins
+    assert attendance.days_attended(1) == 2
+    assert attendance.last_room(1) == "Infantil 3"
+
+
+def test_totals_survive_a_restart(log, tmp_path):
+    path = str(tmp_path / 'attendance.json')
+    log.index.start(1, "Ana", "Infantil 2", "2026-01-04 09:00:00")
+    AttendanceAggregates(path).sync(log)
+
+    attendance = AttendanceAggregates(path)
+    assert attendance.sync(log) == 0
+    assert attendance.days_attended(1) == 1
+
+
+def test_rewritten_history_is_recounted(log, tmp_path):
+    attendance = AttendanceAggregates(str(tmp_path / 'attendance.json'))
+    log.index.start(1, "Ana", "Infantil 2", "2026-01-04 09:00:00")
+    log.index.start(2, "Bia", "Infantil 1", "2026-01-04 09:05:00")
+    attendance.sync(log)
+
+    # Exclusão de uma criança reescreve o histórico sem as linhas dela
+    with open(log.index.checkins_file, encoding='utf-8') as f:
+        lines = f.readlines()
+    with open(log.index.checkins_file, 'w', encoding='utf-8') as f:
+        f.writelines(lines[:1] + lines[2:])
+
+    attendance.sync(log)
+    assert attendance.total_on(datetime.date(2026, 1, 4)) == 1
+    assert attendance.days_attended(1) == 0
+
+
+def test_out_of_order_rows(log, tmp_path):
+    attendance = AttendanceAggregates(str(tmp_path / 'attendance.json'))
+    # Histórico fora da ordem cronológica (ex.: linhas importadas depois)
+    log.index.start(1, "Ana", "Infantil 3", "2026-01-11 09:00:00")
+    log.index.start(1, "Ana", "Infantil 2", "2026-01-04 09:00:00")
+    log.index.start(1, "Ana", "Infantil 3", "2026-01-11 10:00:00")
+    attendance.sync(log)
+    log.index.start(1, "Ana", "Infantil 2", "2026-01-04 10:00:00")
+    attendance.sync(log)
+
+    assert attendance.days_attended(1) == 2
+    # A sala é a do check-in mais recente, não a da última linha
+    assert attendance.last_room(1) == "Infantil 3"
+    assert AttendanceAggregates(attendance.file_path).days_attended(1) == 2
@@ -0,0 +1,71 @@
+# tests/test_checkin_index.py
+
+import pytest
+
+from src.database.checkin_index import OpenCheckinIndex, read_log_since
+
+
+@pytest.fixture
+def index(tmp_path):
+    return OpenCheckinIndex(str(tmp_path / 'checkins.csv'), str(tmp_path / 'checkouts.csv'))
+
+
+def test_checkin_and_checkout(index):
+    first = index.start(1, "Ana", "Infantil 2", "2026-01-04 09:00:00")
+    second = index.start(2, "Bia", "Infantil 1", "2026-01-04 09:05:00")
+    assert (first, second) == (1, 2)
+    assert index.is_open(1) and index.is_open(2)
+
+    assert index.close(1, "2026-01-04 11:00:00") == 1
+    assert not index.is_open(1)
+    assert [session['crianca_id'] for session in index.all_open()] == [2]
+    assert index.checkout_dates() == {1: "2026-01-04 11:00:00"}
+    # Nada em aberto: nenhuma linha nova
+    assert index.close(1, "2026-01-04 12:00:00") == 0
+
+
+def test_index_is_rebuilt_from_the_files(index, tmp_path):
+    index.start(1, "Ana", "Infantil 2", "2026-01-04 09:00:00")
+    index.start(2, "Bia", "Infantil 1", "2026-01-04 09:05:00")
+    index.close(2, "2026-01-04 11:00:00")
+
+    other = OpenCheckinIndex(index.checkins_file, index.checkouts_file)
+    assert [session['crianca_id'] for session in other.all_open()] == [1]
+    assert other.next_checkin_id() == 3
+
+
+def test_names_with_line_breaks(index):
+    index.start(1, "Ana\nMaria", "Infantil 2", "2026-01-04 09:00:00")
+    index.start(2, "Bia", "Infantil 1", "2026-01-04 09:05:00")
+    assert [session['nome'] for session in index.all_open()] == ["Ana\nMaria", "Bia"]
+
+    rows, _, _ = read_log_since(index.checkins_file)
+    assert [row['nome'] for row in rows] == ["Ana\nMaria", "Bia"]
+
+
+def test_incomplete_record_is_read_later(index):
+    index.start(1, "Ana", "Infantil 2", "2026-01-04 09:00:00")
+    with open(index.checkins_file, 'a', encoding='utf-8', newline='') as f:
+        f.write('2,2,"Bia\n')
+    assert len(index.all_open()) == 1
+
+    with open(index.checkins_file, 'a', encoding='utf-8', newline='') as f:
+        f.write('Souza",2026-01-04 09:05:00,,Infantil 1\n')
+    assert [session['nome'] for session in index.all_open()] == ["Ana", "Bia\nSouza"]
+
+
+def test_read_log_since_is_incremental(index):
+    index.start(1, "Ana", "Infantil 2", "2026-01-04 09:00:00")
+    rows, position, check = read_log_since(index.checkins_file)
+    assert len(rows) == 1
+
+    index.start(2, "Bia", "Infantil 1", "2026-01-04 09:05:00")
+    rows, position, check = read_log_since(index.checkins_file, position, check)
+    assert [row['nome'] for row in rows] == ["Bia"]
+    assert read_log_since(index.checkins_file, position, check)[0] == []
+
+
+def test_rewritten_log_is_detected(index):
+    index.start(1, "Ana", "Infantil 2", "2026-01-04 09:00:00")
+    _, position, check = read_log_since(index.checkins_file)
+    assert read_log_since(index.checkins_file, position, "outra linha\n") is None
@@ -0,0 +1,72 @@
+# tests/test_child_record.py
+
+import datetime
+import pickle
+
+from src.database.child_record import Child, as_child, CHILD_FILE_FIELDS
+
+
+def make_child(**fields):
+    data = {'id': 7, 'nome': "Ana", 'idade': "4", 'data_nascimento': "2021-05-02",
+            'mae': "", 'pai': "Carlos", 'visitante': "Não"}
+    data.update(fields)
+    return Child(data)
+
+
+def test_behaves_like_a_dict():
+    child = make_child()
+    assert child['nome'] == "Ana"
+    assert child.get('telefone') is None
+    assert child.get('telefone', '') == ''
+    assert 'pai' in child and 'telefone' not in child
+    assert dict(child) == {'id': 7, 'nome': "Ana", 'idade': "4", 'data_nascimento': "2021-05-02",
+                           'pai': "Carlos", 'mae': "", 'visitante': "Não"}
+    assert list(child) == [field for field in CHILD_FILE_FIELDS if field in child]
+
+
+def test_extra_keys_are_kept_apart():
+    child = make_child()
+    child['sala'] = "Infantil 2"
+    assert child['sala'] == "Infantil 2"
+    assert len(child) == 8
+    assert 'sala' in dict(child)
+
+
+def test_parsed_values():
+    child = make_child()
+    assert child.age == 4
+    assert child.birth_date == datetime.date(2021, 5, 2)
+    assert not child.is_visitor
+    assert child.responsible == "Carlos"
+    assert child.room == "Infantil 2"
+    assert make_child(idade="", visitante="Sim").age is None
+    assert make_child(visitante="sim").is_visitor
+
+
+def test_parsed_values_follow_changes():
+    child = make_child()
+    assert child.room == "Infantil 2"
+    child['idade'] = "11"
+    assert child.age == 11
+    assert child.room == "Juniores"
+
+
+def test_copy_is_independent():
+    child = make_child()
+    child['sala'] = "X"
+    clone = child.copy()
+    clone['nome'] = "Bia"
+    clone['sala'] = "Y"
+    assert child['nome'] == "Ana" and child['sala'] == "X"
+    assert clone.age == 4
+
+
+def test_pickle_round_trip():
+    child = make_child()
+    assert dict(pickle.loads(pickle.dumps(child))) == dict(child)
+
+
+def test_as_child_reuses_records():
+    child = make_child()
+    assert as_child(child) is child
+    assert isinstance(as_child({'nome': "Bia"}), Child)
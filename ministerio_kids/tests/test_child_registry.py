@@ -0,0 +1,87 @@
+# tests/test_child_registry.py
+
+import csv
+import os
+
+import pytest
+
+from src.database import child_registry
+from src.database.child_record import CHILD_FILE_FIELDS
+from src.database.child_registry import ChildRegistry, merge_child_edits
+
+
+@pytest.fixture
+def criancas(tmp_path):
+    path = tmp_path / 'criancas.csv'
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        csv.writer(f).writerow(CHILD_FILE_FIELDS)
+    return str(path)
+
+
+def add(registry, nome, idade="4"):
+    return registry.append({'nome': nome, 'idade': idade})
+
+
+def test_append_assigns_ids(criancas):
+    registry = ChildRegistry(criancas)
+    assert [add(registry, name)['id'] for name in ("Ana", "Bia", "Caio")] == [1, 2, 3]
+    assert len(ChildRegistry(criancas)) == 3
+
+
+def test_rename_appends_to_the_log_only(criancas):
+    registry = ChildRegistry(criancas)
+    ana = add(registry, "Ana")
+    add(registry, "Bia")
+    before = open(criancas, 'rb').read()
+
+    assert registry.update(ana['id'], {'nome': "Ana Clara"})
+    assert open(criancas, 'rb').read() == before
+    assert registry.get("Ana") is None
+    assert registry.get("Ana Clara")['id'] == ana['id']
+    assert registry.find("  ana   CLARA")['id'] == ana['id']
+    assert [child['id'] for child in registry.search("clara")] == [ana['id']]
+
+    # Outro leitor vê a alteração (arquivo + log)
+    assert ChildRegistry(criancas).get_by_id(ana['id'])['nome'] == "Ana Clara"
+
+
+def test_remove_is_logged(criancas):
+    registry = ChildRegistry(criancas)
+    ana = add(registry, "Ana")
+    add(registry, "Bia")
+    assert registry.remove(ana['id'])
+    assert not registry.remove(ana['id'])
+    assert registry.search("ana") == []
+    assert [child['nome'] for child in ChildRegistry(criancas).all()] == ["Bia"]
+
+
+def test_repeated_names_keep_the_first_record(criancas):
+    registry = ChildRegistry(criancas)
+    first = add(registry, "Ana")
+    add(registry, "Ana")
+    registry.update(first['id'], {'nome': "Outra"})
+    registry.update(first['id'], {'nome': "Ana"})
+    assert registry.get("Ana")['id'] == first['id']
+
+
+def test_log_is_merged_after_the_slack(criancas, monkeypatch):
+    monkeypatch.setattr(child_registry, 'EDITS_SLACK', 3)
+    registry = ChildRegistry(criancas)
+    ana = add(registry, "Ana")
+    for i in range(3):
+        registry.update(ana['id'], {'observacoes': str(i)})
+    assert not os.path.exists(registry.edits_file)
+    assert ChildRegistry(criancas).get_by_id(ana['id'])['observacoes'] == "2"
+
+
+def test_merge_child_edits(criancas):
+    registry = ChildRegistry(criancas)
+    ana = add(registry, "Ana")
+    bia = add(registry, "Bia")
+    registry.update(ana['id'], {'nome': "Ana Clara"})
+    registry.remove(bia['id'])
+
+    merge_child_edits(criancas)
+    assert not os.path.exists(registry.edits_file)
+    with open(criancas, 'r', newline='', encoding='utf-8') as f:
+        assert [(row['id'], row['nome']) for row in csv.DictReader(f)] == [('1', "Ana Clara")]
@@ -0,0 +1,33 @@
+# tests/test_dates.py
+
+import datetime
+
+from src.utils.dates import parse_birth_date, normalize_birth_date, format_birth_date
+
+
+def test_parse_iso_and_legacy_formats():
+    expected = datetime.date(2010, 12, 25)
+    for value in ("2010-12-25", "25/12/2010", "25-12-2010", "12/25/2010", "25.12.2010", " 25/12/2010 "):
+        assert parse_birth_date(value) == expected
+
+
+def test_day_first_wins_when_ambiguous():
+    assert parse_birth_date("03/04/2015") == datetime.date(2015, 4, 3)
+
+
+def test_invalid_dates():
+    for value in ("", None, "31/02/2015", "ontem"):
+        assert parse_birth_date(value) is None
+
+
+def test_normalize_keeps_unrecognized_values():
+    assert normalize_birth_date("25/12/2010") == "2010-12-25"
+    assert normalize_birth_date("2010-12-25") == "2010-12-25"
+    assert normalize_birth_date(" ontem ") == "ontem"
+    assert normalize_birth_date("") == ""
+
+
+def test_format_for_display():
+    assert format_birth_date("2010-12-25") == "25/12/2010"
+    assert format_birth_date("ontem") == "ontem"
+    assert format_birth_date(None) == ""
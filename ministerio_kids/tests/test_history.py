@@ -0,0 +1,72 @@
+# tests/test_history.py
+
+import pytest
+
+from src.reports import history
+from src.reports.history import HistorySeries, HistoryStore
+
+HEADERS = ['data', 'total']
+
+
+def data_lines(path):
+    with open(path, encoding='utf-8') as f:
+        return f.read().splitlines()[1:]
+
+
+def test_upsert_appends_only_changes(tmp_path):
+    path = str(tmp_path / 'total.csv')
+    series = HistorySeries(path, HEADERS)
+    assert series.upsert('2026-01-04', [10])
+    assert not series.upsert('2026-01-04', [10])
+    assert series.upsert('2026-01-04', [12])
+    assert series.upsert('2026-01-11', [8])
+    assert data_lines(path) == ['2026-01-04,10', '2026-01-04,12', '2026-01-11,8']
+
+    # Ao ler de novo, vale a última linha de cada data
+    assert HistorySeries(path, HEADERS).rows() == [['2026-01-04', '12'], ['2026-01-11', '8']]
+
+
+def test_add_keeps_existing_rows(tmp_path):
+    series = HistorySeries(str(tmp_path / 'total.csv'), HEADERS)
+    series.add('2026-01', [1])
+    assert not series.add('2026-01', [2])
+    assert series.get('2026-01') == ['2026-01', '1']
+
+
+def test_superseded_lines_are_compacted(tmp_path, monkeypatch):
+    monkeypatch.setattr(history, 'COMPACT_SLACK', 3)
+    path = str(tmp_path / 'total.csv')
+    series = HistorySeries(path, HEADERS)
+    for total in range(5):
+        series.upsert('2026-01-04', [total])
+    assert len(data_lines(path)) < 5
+    assert HistorySeries(path, HEADERS).rows() == [['2026-01-04', '4']]
+
+
+def test_snapshot_is_written_only_when_changed(tmp_path):
+    store = HistoryStore(str(tmp_path))
+    rows = [["Ana", 4], ["Bia", 5]]
+    assert store.write_snapshot('frequency.csv', ['nome', 'idade'], rows)
+    assert not store.write_snapshot('frequency.csv', ['nome', 'idade'], rows)
+    # Outra instância compara com o arquivo já gravado
+    assert not HistoryStore(str(tmp_path)).write_snapshot('frequency.csv', ['nome', 'idade'], rows)
+    assert store.write_snapshot('frequency.csv', ['nome', 'idade'], rows[:1])
+
+
+def test_clear_removes_summaries(tmp_path):
+    store = HistoryStore(str(tmp_path))
+    store.upsert('total.csv', HEADERS, '2026-01-04', [10])
+    store.clear()
+    assert not (tmp_path / 'total.csv').exists()
+    assert store.series('total.csv', HEADERS).rows() == []
+
+
+@pytest.mark.parametrize('slack', [1, 2])
+def test_small_slack_keeps_latest_rows(tmp_path, monkeypatch, slack):
+    monkeypatch.setattr(history, 'COMPACT_SLACK', slack)
+    path = str(tmp_path / 'total.csv')
+    series = HistorySeries(path, HEADERS)
+    for day in range(1, 4):
+        for total in range(3):
+            series.upsert(f'2026-01-0{day}', [total])
+    assert HistorySeries(path, HEADERS).rows() == [[f'2026-01-0{day}', '2'] for day in range(1, 4)]
@@ -0,0 +1,102 @@
+# tests/test_migrations.py
+
+import csv
+
+from src.database.child_record import CHILD_FIELDS, CHILD_FILE_FIELDS
+from src.database.checkin_index import CHECKIN_FIELDS, CHECKOUT_FIELDS
+from src.database.db_manager import migrate_csv_to_ids, migrate_birth_dates
+
+
+def write_csv(path, header, rows):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(rows)
+
+
+def read_csv(path):
+    with open(path, 'r', newline='', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        return reader.fieldnames, list(reader)
+
+
+def child_row(nome, **fields):
+    return [fields.get(field, nome if field == 'nome' else '') for field in CHILD_FIELDS]
+
+
+def legacy_files(tmp_path):
+    """Arquivos no formato antigo: crianças sem id, check-ins e check-outs ligados pelo nome"""
+    criancas = tmp_path / 'criancas.csv'
+    checkins = tmp_path / 'checkins.csv'
+    checkouts = tmp_path / 'checkouts.csv'
+    write_csv(criancas, CHILD_FIELDS, [child_row("Ana", data_nascimento="25/12/2019"),
+                                       child_row("Bia"),
+                                       child_row("Ana")])
+    write_csv(checkins, ['nome', 'data_checkin', 'data_checkout', 'sala'], [
+        ["Ana", "2026-01-04 09:00:00", "2026-01-04 11:00:00", "Infantil 2"],
+        ["Bia", "2026-01-04 09:05:00", "", "Infantil 1"],
+        ["Ana", "2026-01-11 09:00:00", "", "Infantil 2"],
+        ["Bia", "2026-01-11 09:10:00", "", "Infantil 1"],
+    ])
+    write_csv(checkouts, ['nome', 'data_checkin', 'data_checkout'], [
+        ["Bia", "2026-01-04 09:05:00", "2026-01-04 11:00:00"],
+        ["Ana", "", "2026-01-11 11:00:00"],
+    ])
+    return str(criancas), str(checkins), str(checkouts)
+
+
+def test_ids_are_assigned_in_file_order(tmp_path):
+    criancas, checkins, checkouts = legacy_files(tmp_path)
+    migrate_csv_to_ids(criancas, checkins, checkouts)
+
+    header, children = read_csv(criancas)
+    assert header == CHILD_FILE_FIELDS
+    assert [(child['id'], child['nome']) for child in children] == [('1', "Ana"), ('2', "Bia"), ('3', "Ana")]
+
+
+def test_checkins_point_to_the_first_child_with_the_name(tmp_path):
+    criancas, checkins, checkouts = legacy_files(tmp_path)
+    migrate_csv_to_ids(criancas, checkins, checkouts)
+
+    header, rows = read_csv(checkins)
+    assert header == CHECKIN_FIELDS
+    assert [(row['id'], row['crianca_id'], row['nome']) for row in rows] == [
+        ('1', '1', "Ana"), ('2', '2', "Bia"), ('3', '1', "Ana"), ('4', '2', "Bia")]
+
+
+def test_checkouts_close_sessions_by_id(tmp_path):
+    criancas, checkins, checkouts = legacy_files(tmp_path)
+    migrate_csv_to_ids(criancas, checkins, checkouts)
+
+    header, rows = read_csv(checkouts)
+    assert header == CHECKOUT_FIELDS
+    # Bia: a sessão com a mesma data de check-in; Ana (sem data): todas as abertas
+    assert [(row['checkin_id'], row['data_checkout']) for row in rows] == [
+        ('2', "2026-01-04 11:00:00"), ('3', "2026-01-11 11:00:00")]
+
+
+def test_migration_runs_once(tmp_path):
+    criancas, checkins, checkouts = legacy_files(tmp_path)
+    migrate_csv_to_ids(criancas, checkins, checkouts)
+    contents = [open(path, 'rb').read() for path in (criancas, checkins, checkouts)]
+    migrate_csv_to_ids(criancas, checkins, checkouts)
+    assert [open(path, 'rb').read() for path in (criancas, checkins, checkouts)] == contents
+
+
+def test_missing_ids_continue_after_the_highest(tmp_path):
+    criancas = tmp_path / 'criancas.csv'
+    write_csv(criancas, CHILD_FILE_FIELDS, [['5'] + child_row("Ana"), [''] + child_row("Bia")])
+    migrate_csv_to_ids(str(criancas), str(tmp_path / 'checkins.csv'), str(tmp_path / 'checkouts.csv'))
+    _, children = read_csv(criancas)
+    assert [child['id'] for child in children] == ['5', '6']
+
+
+def test_birth_dates_become_iso(tmp_path):
+    criancas, checkins, checkouts = legacy_files(tmp_path)
+    migrate_csv_to_ids(criancas, checkins, checkouts)
+
+    assert migrate_birth_dates(criancas) == 1
+    _, children = read_csv(criancas)
+    assert children[0]['data_nascimento'] == "2019-12-25"
+    # Já convertidas: o arquivo não é reescrito
+    assert migrate_birth_dates(criancas) == 0
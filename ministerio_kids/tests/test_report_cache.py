@@ -0,0 +1,53 @@
+# tests/test_report_cache.py
+
+import datetime
+import os
+
+from src.reports.cache import ReportCache
+from src.reports.engine import ReportData, FrequencyRow, BirthdayRow, PairCounts
+
+
+def sample_data():
+    return ReportData(
+        total_children=2,
+        checkins_by_date={datetime.date(2026, 1, 4): 2},
+        age_groups={"0-3 anos": 1, "4-6 anos": 1},
+        frequency=[FrequencyRow("Ana", 3, "Membro", "Infantil 2")],
+        member_count=2,
+        birthdays_by_month={12: [BirthdayRow("Ana", "25/12/2019", "6", 25)]},
+        health_counts=PairCounts(1, 0, 1),
+    )
+
+
+def make_cache(tmp_path):
+    return ReportCache(4, str(tmp_path / 'report_cache.json'),
+                       encode=ReportData.to_json, decode=ReportData.from_json)
+
+
+def test_results_survive_a_restart(tmp_path):
+    key = ("Frequência", "2026-01-04", "csv:1")
+    cache = make_cache(tmp_path)
+    cache.put(key, sample_data())
+    assert cache.save()
+    assert not cache.save()  # Nada mudou desde a última gravação
+
+    assert make_cache(tmp_path).get(key) == sample_data()
+
+
+def test_lru_limit(tmp_path):
+    cache = make_cache(tmp_path)
+    for i in range(6):
+        cache.put(("Frequência", str(i), "v"), sample_data())
+    assert len(cache) == 4
+    assert cache.get(("Frequência", "0", "v")) is None
+
+
+def test_invalid_file_is_discarded(tmp_path):
+    path = tmp_path / 'report_cache.json'
+    path.write_bytes(b'\x80\x04 nao e JSON')
+    cache = make_cache(tmp_path)
+    assert len(cache) == 0
+    assert not os.path.exists(path)
+
+    path.write_text('{"versao": 1, "resultados": [[["a"], {"total_children": 1}]]}', encoding='utf-8')
+    assert len(make_cache(tmp_path)) == 0
@@ -0,0 +1,108 @@
+# tests/test_room_rules.py
+
+import datetime
+import logging
+
+import pytest
+
+from src.database.room_rules import Room, RoomRules, load_room_rules, UNDEFINED_ROOM
+from src.utils.logger import get_logger
+from src.utils.settings import DEFAULT_SETTINGS
+
+
+def legacy_room(age):
+    """Regra fixa que existia antes das salas configuráveis"""
+    age = int(age)
+    if age <= 2:
+        return "Berçário"
+    elif age == 3:
+        return "Infantil 1"
+    elif age <= 5:
+        return "Infantil 2"
+    elif age <= 7:
+        return "Infantil 3"
+    elif age <= 10:
+        return "Infantil 4"
+    return "Juniores"
+
+
+@pytest.fixture
+def rules():
+    return load_room_rules(DEFAULT_SETTINGS['salas'])
+
+
+def test_default_table_matches_the_old_rule(rules):
+    for age in range(-2, 40):
+        assert rules.room_for_age(age) == legacy_room(age)
+
+
+def test_ages_as_text(rules):
+    assert rules.room_for_age("4") == "Infantil 2"
+    assert rules.index_for_age(" 11 ") == rules.names.index("Juniores")
+
+
+def test_invalid_age_uses_default_room(rules):
+    assert rules.room_for_age("") == "Infantil 1"
+    assert rules.room_for_age(None) == "Infantil 1"
+    assert rules.room_for_age("dois") == "Infantil 1"
+    assert rules.report_room(rules.index_for_age("dois")) == UNDEFINED_ROOM
+
+
+def test_invalid_age_is_logged_once(rules, caplog):
+    caplog.set_level(logging.DEBUG, logger=get_logger('database.rooms').name)
+    for _ in range(3):
+        rules.room_for_age("dois")
+        rules.room_for_age(-1)
+    messages = [record for record in caplog.records if record.name.endswith('database.rooms')]
+    assert [record.levelno for record in messages] == [logging.DEBUG]
+
+
+def test_batch_lookup_matches_single_lookup(rules):
+    ages = [-1, 0, 3, 10, 11, 99, "5", "", None]
+    assert rules.indexes_for_ages(ages) == [rules.index_for_age(age) for age in ages]
+
+
+def test_gap_between_ranges_has_no_room():
+    rules = RoomRules([Room("Pequenos", 0, 3), Room("Grandes", 6, 9)])
+    assert rules.index_for_age(4) is None
+    assert rules.index_for_age(12) is None
+    assert rules.room_for_age(4) == "Pequenos"
+
+
+def test_overlapping_ranges_prefer_the_first():
+    rules = RoomRules([Room("A", 0, 5), Room("B", 4, None)])
+    assert rules.room_for_age(4) == "A"
+    assert rules.room_for_age(6) == "B"
+    assert rules.room_for_age(50) == "B"
+
+
+def test_labels_and_capacity():
+    rules = RoomRules([Room("A", 0, 2, capacidade=2), Room("B", 3, 3), Room("C", 4, None)])
+    assert rules.labels == ["A (0-2)", "B (3)", "C (4+)"]
+    assert not rules.is_full("A", 1)
+    assert rules.is_full("A", 2)
+    assert not rules.is_full("B", 100)
+
+
+def test_cutoff_date_uses_birth_date():
+    rules = RoomRules([Room("Pequenos", 0, 3), Room("Grandes", 4, None)],
+                      cutoff=(3, 31), today=datetime.date(2026, 1, 10))
+    # Faz 4 anos até 31/03: já vai para a sala dos maiores
+    assert rules.age_for_assignment(3, datetime.date(2022, 3, 31)) == 4
+    assert rules.age_for_assignment(3, datetime.date(2022, 4, 1)) == 3
+    # Sem data de nascimento vale a idade cadastrada
+    assert rules.age_for_assignment(3, None) == 3
+
+
+def test_invalid_entries_are_skipped():
+    rules = load_room_rules({'faixas': [{'nome': "A", 'idade_min': 0, 'idade_max': 5},
+                                        {'idade_min': 6},
+                                        {'nome': "B", 'idade_min': "x"}],
+                             'data_corte': "13-40"})
+    assert rules.names == ["A"]
+    assert rules.cutoff is None
+
+
+def test_no_rooms_is_an_error():
+    with pytest.raises(ValueError):
+        RoomRules([])
@@ -0,0 +1,57 @@
+# tests/test_search_index.py
+
+from src.database.search_index import ChildSearchIndex
+
+
+def make_index():
+    return ChildSearchIndex([
+        (1, "Ana Maria Souza"),
+        (2, "Ana"),
+        (3, "Mariana Lima"),
+        (4, "João Anastácio"),
+        (5, "Luana Ribeiro"),
+    ])
+
+
+def test_ranking_exact_start_token_contains():
+    index = make_index()
+    # Igual, começa com, palavra começa com, trecho no meio (empates pelo nome)
+    assert index.search("ana") == [2, 1, 4, 5, 3]
+
+
+def test_accents_and_case_are_ignored():
+    index = make_index()
+    assert index.search("JOAO anastacio") == [4]
+    assert index.search("joão") == [4]
+
+
+def test_every_query_word_must_match_a_word_prefix():
+    index = make_index()
+    assert index.search("ana souza") == [1]
+    assert index.search("ana costa") == []
+    # A busca inteira no meio do nome também vale
+    assert index.search("ana lima") == [3]
+
+
+def test_short_queries_find_substrings():
+    index = make_index()
+    assert set(index.search("ri")) == {1, 3, 5}
+
+
+def test_limit_keeps_most_relevant():
+    index = make_index()
+    assert index.search("ana", limit=2) == [2, 1]
+
+
+def test_add_replaces_and_remove_forgets():
+    index = make_index()
+    index.add(2, "Beatriz")
+    assert 2 not in index.search("ana")
+    assert index.search("beatriz") == [2]
+    index.remove(2)
+    assert index.search("beatriz") == []
+    assert len(index) == 4
+
+
+def test_empty_query_returns_nothing():
+    assert make_index().search("   ") == []